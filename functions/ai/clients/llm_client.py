@@ -0,0 +1,252 @@
+"""
+LLM client for OpenAI-compatible chat completions (LLM_ENDPOINT / LLM_API_KEY).
+
+Per instance: pooled keep-alive HTTP connections, bounded concurrency, per-call deadlines,
+retries with full-jitter backoff, and token streaming. Built by
+infrastructure.config.factories.get_llm_client(); tests point it at a local fake server.
+"""
+from __future__ import annotations
+
+import http.client
+import json
+import queue
+import random
+import ssl
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+from infrastructure.config.logging import get_logger
+
+_log = get_logger(__name__)
+
+# Retry on throttling and transient upstream failures.
+_RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+Message = dict[str, str]
+
+
+class LLMError(Exception):
+    """LLM call failed (non-retryable status, retries exhausted, or malformed response)."""
+
+
+class LLMTimeoutError(LLMError):
+    """The call's deadline passed (waiting for a slot, connecting, or reading)."""
+
+
+@dataclass(frozen=True)
+class LLMClientConfig:
+    endpoint: str
+    api_key: str | None
+    model: str
+    timeout_seconds: float = 8.0
+    max_concurrency: int = 8
+    max_retries: int = 2
+    pool_size: int = 8
+    backoff_base_seconds: float = 0.2
+    backoff_max_seconds: float = 2.0
+
+
+class _ConnectionPool:
+    """LIFO pool of keep-alive connections to one host (most recently used first)."""
+
+    def __init__(self, scheme: str, host: str, port: int | None, size: int) -> None:
+        self._scheme = scheme
+        self._host = host
+        self._port = port
+        self._idle: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue(maxsize=size)
+        self._ssl_context = ssl.create_default_context() if scheme == "https" else None
+
+    def acquire(self, timeout: float) -> http.client.HTTPConnection:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            if self._scheme == "https":
+                conn = http.client.HTTPSConnection(
+                    self._host, self._port, timeout=timeout, context=self._ssl_context
+                )
+            else:
+                conn = http.client.HTTPConnection(self._host, self._port, timeout=timeout)
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn
+
+    def release(self, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        if reusable:
+            try:
+                self._idle.put_nowait(conn)
+                return
+            except queue.Full:
+                pass
+        conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class LLMClient:
+    """Thread-safe client; share one instance per process."""
+
+    def __init__(
+        self,
+        config: LLMClientConfig,
+        sleep: Callable[[float], None] = time.sleep,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        url = urlsplit(config.endpoint)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError(f"invalid LLM endpoint: {config.endpoint!r}")
+        self._config = config
+        base = url.path.rstrip("/")
+        self._path = base if base.endswith("/chat/completions") else f"{base}/chat/completions"
+        self._pool = _ConnectionPool(url.scheme, url.hostname, url.port, config.pool_size)
+        self._slots = threading.BoundedSemaphore(config.max_concurrency)
+        self._sleep = sleep
+        self._rand = rand
+
+    def complete(self, messages: list[Message], timeout: float | None = None, **params: Any) -> str:
+        """Return the full completion text."""
+        deadline = self._deadline(timeout)
+        self._acquire_slot(deadline)
+        try:
+            body = self._body(messages, stream=False, **params)
+            for attempt in range(self._config.max_retries + 1):
+                conn = self._pool.acquire(self._remaining(deadline))
+                reusable = False
+                try:
+                    resp = self._send(conn, body)
+                    data = resp.read()
+                    reusable = not resp.will_close
+                    if resp.status in _RETRY_STATUSES and attempt < self._config.max_retries:
+                        self._backoff(attempt, deadline)
+                        continue
+                    if resp.status != 200:
+                        raise LLMError(f"LLM returned HTTP {resp.status}")
+                    return _completion_text(data)
+                except (OSError, http.client.HTTPException) as e:
+                    if attempt >= self._config.max_retries:
+                        raise self._transport_error(e, deadline) from e
+                    self._backoff(attempt, deadline)
+                finally:
+                    self._pool.release(conn, reusable)
+            raise LLMError("LLM retries exhausted")
+        finally:
+            self._slots.release()
+
+    def stream(self, messages: list[Message], timeout: float | None = None, **params: Any) -> Iterator[str]:
+        """
+        Yield completion text chunks as they arrive. Retries only happen before the first
+        chunk; the deadline covers the whole stream.
+        """
+        deadline = self._deadline(timeout)
+        self._acquire_slot(deadline)
+        try:
+            body = self._body(messages, stream=True, **params)
+            started = False
+            for attempt in range(self._config.max_retries + 1):
+                conn = self._pool.acquire(self._remaining(deadline))
+                reusable = False
+                try:
+                    resp = self._send(conn, body)
+                    if resp.status != 200:
+                        resp.read()
+                        reusable = not resp.will_close
+                        if resp.status in _RETRY_STATUSES and attempt < self._config.max_retries:
+                            self._backoff(attempt, deadline)
+                            continue
+                        raise LLMError(f"LLM returned HTTP {resp.status}")
+                    for chunk in _sse_chunks(resp, lambda c=conn: self._set_read_timeout(c, deadline)):
+                        started = True
+                        yield chunk
+                    reusable = not resp.will_close
+                    return
+                except (OSError, http.client.HTTPException) as e:
+                    if started or attempt >= self._config.max_retries:
+                        raise self._transport_error(e, deadline) from e
+                    self._backoff(attempt, deadline)
+                finally:
+                    self._pool.release(conn, reusable)
+            raise LLMError("LLM retries exhausted")
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def _body(self, messages: list[Message], stream: bool, **params: Any) -> bytes:
+        payload = {"model": self._config.model, "messages": messages, "stream": stream, **params}
+        return json.dumps(payload).encode("utf-8")
+
+    def _send(self, conn: http.client.HTTPConnection, body: bytes) -> http.client.HTTPResponse:
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        if self._config.api_key:
+            headers["Authorization"] = f"Bearer {self._config.api_key}"
+        conn.request("POST", self._path, body=body, headers=headers)
+        return conn.getresponse()
+
+    def _deadline(self, timeout: float | None) -> float:
+        return time.monotonic() + (self._config.timeout_seconds if timeout is None else timeout)
+
+    def _remaining(self, deadline: float) -> float:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise LLMTimeoutError("LLM call deadline exceeded")
+        return remaining
+
+    def _set_read_timeout(self, conn: http.client.HTTPConnection, deadline: float) -> None:
+        if conn.sock is not None:
+            conn.sock.settimeout(self._remaining(deadline))
+
+    def _acquire_slot(self, deadline: float) -> None:
+        if not self._slots.acquire(timeout=self._remaining(deadline)):
+            raise LLMTimeoutError("timed out waiting for an LLM concurrency slot")
+
+    def _backoff(self, attempt: int, deadline: float) -> None:
+        """Full jitter: sleep uniformly in [0, min(max, base * 2**attempt)], within the deadline."""
+        cap = min(self._config.backoff_max_seconds, self._config.backoff_base_seconds * (2**attempt))
+        delay = min(self._rand() * cap, self._remaining(deadline))
+        _log.info("retrying LLM call in %.3fs (attempt %d)", delay, attempt + 1)
+        self._sleep(delay)
+
+    def _transport_error(self, e: Exception, deadline: float) -> LLMError:
+        if isinstance(e, TimeoutError) or deadline <= time.monotonic():
+            return LLMTimeoutError("LLM call deadline exceeded")
+        return LLMError(f"LLM transport error: {e}")
+
+
+def _completion_text(data: bytes) -> str:
+    try:
+        return json.loads(data)["choices"][0]["message"]["content"] or ""
+    except (ValueError, KeyError, IndexError, TypeError) as e:
+        raise LLMError("malformed LLM response") from e
+
+
+def _sse_chunks(resp: http.client.HTTPResponse, before_read: Callable[[], None]) -> Iterator[str]:
+    """Parse `data: {...}` lines of a streamed chat completion until [DONE]."""
+    while True:
+        before_read()
+        line = resp.readline()
+        if not line:
+            return
+        line = line.strip()
+        if not line.startswith(b"data:"):
+            continue
+        data = line[5:].strip()
+        if data == b"[DONE]":
+            resp.read()  # drain so the connection can be reused
+            return
+        try:
+            delta = json.loads(data)["choices"][0].get("delta", {})
+        except (ValueError, KeyError, IndexError) as e:
+            raise LLMError("malformed LLM stream chunk") from e
+        text = delta.get("content")
+        if text:
+            yield text
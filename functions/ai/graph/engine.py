@@ -0,0 +1,126 @@
+"""
+Minimal compiled state-machine engine for the inspection graph.
+
+Build with StateGraph (nodes + plain or conditional edges), compile() once per instance and
+reuse the CompiledGraph for every request: compilation validates the wiring and precomputes
+the transition table, so a run only walks nodes. Nodes take the state and either return None
+or yield events, which run() re-yields to the caller (e.g. streamed prompt tokens).
+"""
+from __future__ import annotations
+
+import inspect
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+S = TypeVar("S")
+
+END = "__end__"
+
+# Guards against routing loops; one turn of the inspection graph visits a handful of nodes.
+MAX_NODE_VISITS = 32
+
+
+class GraphCompileError(ValueError):
+    """The graph is mis-wired (unknown node, missing edge, duplicate node)."""
+
+
+@dataclass(frozen=True)
+class _Conditional:
+    router: Callable[[Any], str]
+    mapping: dict[str, str]
+
+
+class StateGraph(Generic[S]):
+    """Builder for a CompiledGraph."""
+
+    def __init__(self) -> None:
+        self._nodes: dict[str, Callable[[S], Any]] = {}
+        self._edges: dict[str, str | _Conditional] = {}
+
+    def add_node(self, name: str, fn: Callable[[S], Any]) -> StateGraph[S]:
+        if name in self._nodes or name == END:
+            raise GraphCompileError(f"duplicate node {name!r}")
+        self._nodes[name] = fn
+        return self
+
+    def add_edge(self, source: str, target: str) -> StateGraph[S]:
+        self._set_edge(source, target)
+        return self
+
+    def add_conditional_edges(
+        self, source: str, router: Callable[[S], str], mapping: dict[str, str]
+    ) -> StateGraph[S]:
+        """After source, call router(state) and go to mapping[result]."""
+        self._set_edge(source, _Conditional(router=router, mapping=dict(mapping)))
+        return self
+
+    def compile(self) -> CompiledGraph[S]:
+        for source, edge in self._edges.items():
+            if source not in self._nodes:
+                raise GraphCompileError(f"edge from unknown node {source!r}")
+            targets = edge.mapping.values() if isinstance(edge, _Conditional) else [edge]
+            for target in targets:
+                if target != END and target not in self._nodes:
+                    raise GraphCompileError(f"edge {source!r} -> unknown node {target!r}")
+        missing = sorted(set(self._nodes) - set(self._edges))
+        if missing:
+            raise GraphCompileError(f"nodes without outgoing edge: {missing}")
+        nodes = {
+            name: (fn, inspect.isgeneratorfunction(fn)) for name, fn in self._nodes.items()
+        }
+        return CompiledGraph(nodes, dict(self._edges))
+
+    def _set_edge(self, source: str, edge: str | _Conditional) -> None:
+        if source in self._edges:
+            raise GraphCompileError(f"node {source!r} already has an outgoing edge")
+        self._edges[source] = edge
+
+
+class CompiledGraph(Generic[S]):
+    """Immutable, validated graph; safe to share across requests (state is per run)."""
+
+    def __init__(
+        self,
+        nodes: dict[str, tuple[Callable[[S], Any], bool]],
+        edges: dict[str, str | _Conditional],
+    ) -> None:
+        self._nodes = nodes
+        self._edges = edges
+
+    @property
+    def node_names(self) -> frozenset[str]:
+        return frozenset(self._nodes)
+
+    def run(self, state: S, entry: str) -> Iterator[Any]:
+        """Walk from entry until END, yielding events emitted by generator nodes."""
+        node = entry
+        for _ in range(MAX_NODE_VISITS):
+            if node == END:
+                return
+            try:
+                fn, is_generator = self._nodes[node]
+            except KeyError:
+                raise ValueError(f"unknown entry node {node!r}") from None
+            if is_generator:
+                yield from fn(state)
+            else:
+                fn(state)
+            node = self._next(node, state)
+        raise RuntimeError(f"graph exceeded {MAX_NODE_VISITS} node visits")
+
+    def invoke(self, state: S, entry: str) -> S:
+        """Run to END, discarding events; returns the (mutated) state."""
+        for _ in self.run(state, entry):
+            pass
+        return state
+
+    def _next(self, node: str, state: S) -> str:
+        edge = self._edges[node]
+        if isinstance(edge, str):
+            return edge
+        route = edge.router(state)
+        try:
+            return edge.mapping[route]
+        except KeyError:
+            raise RuntimeError(f"router for {node!r} returned unmapped {route!r}") from None
@@ -1,56 +1,396 @@
 """
-Langgraph workflow for intent → initial steps and first prompt (T025).
-No adaptation yet (US2 extends this).
+Inspection graph (T025, T034): plan → ask for a new session; evaluate → [adapt] → ask | finish
+for each answer. The graph is compiled once per instance (INSPECTION_GRAPH) and every request
+runs it over a small per-request GraphState rehydrated from the session's step window.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
+import re
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from typing import Any
 
-from ai.prompts.inspection_prompts import first_prompt_for_intent
+from ai.clients.llm_client import LLMError
+from ai.graph.engine import END, CompiledGraph, StateGraph
+from ai.graph.plan_cache import get_plan, plan_cache_key, put_plan
+from ai.library.step_library import match_library
+from ai.prompts.inspection_prompts import (
+    first_prompt_for_intent,
+    is_routine_answer,
+    speculative_prompt_messages,
+    stream_first_prompt,
+    stream_next_prompt_text,
+    stream_text,
+)
+from infrastructure.config.factories import get_llm_client
+from infrastructure.config.logging import get_logger
+from infrastructure.config.observability import record_metric
+
+_log = get_logger(__name__)
+
+# Streamed graph output: ("step", step_dict) | ("token", text) | ("completed", step_dict)
+# | ("renumbered", {"fromOrder", "by"}) | ("added", step_dict) | ("ask", step_dict) | ("done", has_next)
+GraphEvent = tuple[str, Any]
+
+# Order spacing for planned steps, leaving room to insert added/branched steps between them.
+ORDER_GAP = 1024
+
+_UNFINISHED = ("pending", "in_progress")
+
+# Words that flag a finding worth documenting before moving on (negated mentions are ignored).
+_ISSUE_TERMS = frozenset({
+    "broken", "crack", "cracked", "cracks", "corroded", "corrosion", "damage", "damaged",
+    "defect", "defective", "fail", "failed", "faulty", "leak", "leaking", "leaks", "loose",
+    "missing", "mold", "mould", "rot", "rotten", "rust", "rusted", "rusty", "stain", "stained",
+    "wet", "worn",
+})
+_NEGATIONS = frozenset({"no", "not", "without", "none", "never"})
+_ALSO_CHECK = re.compile(r"\balso\s+(?:check|inspect|look\s+at)\s+(?:the\s+)?([^.;!?]+)", re.IGNORECASE)
 
 
 @dataclass
 class GraphState:
-    """State for the inspection graph."""
+    """
+    State for one run of the inspection graph. steps is the window the run works on (the
+    whole initial plan, or the current step plus the next unfinished ones for an answer);
+    added_steps lists steps the run created, which the caller persists.
+    """
 
     intent_goal: str
     intent_constraints: dict[str, Any] | None
     steps: list[dict[str, Any]]
     current_prompt: str | None
     done: bool
+    tenant_id: str | None = None
+    libraries: list[str] | None = None
+    current_step_id: str | None = None
+    answer: str | None = None
+    candidate: str | None = None
+    completed_step: dict[str, Any] | None = None
+    adaptation: tuple[str, str] | None = None  # (StepSource value, prompt) chosen by evaluate
+    added_steps: list[dict[str, Any]] = field(default_factory=list)
+    has_next: bool = False
+    cache_key: str | None = None
+    cached_prompt: str | None = None
+    target_type: str | None = None
 
 
-def run_initial_graph(goal: str, constraints: dict | None = None) -> tuple[list[dict[str, Any]], str]:
+# --- nodes ---------------------------------------------------------------------------------
+
+
+def _plan(state: GraphState) -> Iterator[GraphEvent]:
     """
-    From intent, produce initial steps (one for MVP) and first prompt.
-    Returns (steps, prompt_text).
+    Initial plan: a matching step-library template (no LLM call), else the plan cache, else a
+    single check whose prompt the LLM phrases (MVP).
     """
-    prompt_text = first_prompt_for_intent(goal, constraints)
-    # Single initial step for MVP
-    steps = [
-        {
+    match = match_library(state.intent_goal, state.target_type, state.tenant_id, state.libraries)
+    if match is not None:
+        record_metric("step_library.hit", labels={"template": match.template.id})
+        state.steps = [
+            {
+                "id": f"step-{i + 1}",
+                "order": i * ORDER_GAP,
+                "type": step_type,
+                "prompt": prompt,
+                "status": "pending",
+            }
+            for i, (step_type, prompt) in enumerate(match.template.steps)
+        ]
+        state.cached_prompt = state.steps[0]["prompt"]
+    llm = get_llm_client()
+    if not state.steps and state.tenant_id and llm is not None:
+        state.cache_key = plan_cache_key(
+            state.tenant_id, state.intent_goal, state.intent_constraints, state.libraries
+        )
+        cached = get_plan(state.tenant_id, state.cache_key)
+        if cached is not None:
+            state.steps = cached.steps_copy()
+            state.cached_prompt = cached.first_prompt
+    if not state.steps:
+        state.steps = [{
             "id": "step-1",
             "order": 0,
             "type": "check",
-            "prompt": prompt_text,
+            "prompt": None,
             "status": "pending",
-        }
-    ]
+        }]
+    state.current_step_id = state.steps[0]["id"]
+    for step in state.steps:
+        yield "step", {**step, "prompt": None} if step["id"] == state.current_step_id else step
+
+
+def _ask(state: GraphState) -> Iterator[GraphEvent]:
+    """Stream the prompt for the first unfinished step in the window."""
+    step = next((s for s in state.steps if s.get("status") in _UNFINISHED), None)
+    if step is None:
+        return
+    state.has_next = True
+    if state.answer is None:
+        yield from _ask_first(state)
+        return
+    yield "ask", step
+    tokens: list[str] = []
+    if state.candidate is not None and not state.added_steps:
+        use_candidate = is_routine_answer(state.answer)
+        record_metric("prompt_speculation.hit" if use_candidate else "prompt_speculation.discarded")
+        if use_candidate:
+            tokens = list(stream_text(state.candidate))
+    if not tokens:
+        previous = (state.completed_step or {}).get("prompt") or ""
+        tokens = stream_next_prompt_text(previous, state.answer, step["prompt"], llm=get_llm_client())
+    chunks: list[str] = []
+    for token in tokens:
+        chunks.append(token)
+        yield "token", token
+    state.current_prompt = "".join(chunks)
+
+
+def _ask_first(state: GraphState) -> Iterator[GraphEvent]:
+    if state.cached_prompt is not None:
+        tokens = stream_text(state.cached_prompt)
+    else:
+        tokens = stream_first_prompt(state.intent_goal, state.intent_constraints, llm=get_llm_client())
+    chunks: list[str] = []
+    for token in tokens:
+        chunks.append(token)
+        yield "token", token
+    state.current_prompt = "".join(chunks)
+    # Template fallbacks (LLM failed) are not cached so the next session retries the LLM.
+    if (
+        state.cache_key is not None
+        and state.cached_prompt is None
+        and state.current_prompt
+        and state.current_prompt != first_prompt_for_intent(state.intent_goal, state.intent_constraints)
+    ):
+        put_plan(state.tenant_id, state.cache_key, state.steps, state.current_prompt)
+
+
+def _evaluate(state: GraphState) -> Iterator[GraphEvent]:
+    """Complete the current step and decide whether the answer calls for an adaptation."""
+    if not state.steps:
+        yield "completed", None
+        return
+    idx = next((i for i, s in enumerate(state.steps) if s["id"] == state.current_step_id), 0)
+    completed = {**state.steps[idx], "status": "completed"}
+    state.steps[idx] = completed
+    state.completed_step = completed
+    yield "completed", completed
+    state.adaptation = _choose_adaptation(completed, state.answer or "")
+
+
+def _adapt(state: GraphState) -> Iterator[GraphEvent]:
+    """
+    Insert the chosen step directly after the completed one (order between it and the next).
+    When repeated insertions have used up the gap, every step from the next one on moves up
+    by ORDER_GAP first; ("renumbered", {"fromOrder", "by"}) tells callers to apply that shift
+    to the whole plan, not only the window the graph sees.
+    """
+    source, prompt = state.adaptation
+    idx = state.steps.index(state.completed_step)
+    upcoming = next((s for s in state.steps[idx + 1 :] if s.get("status") in _UNFINISHED), None)
+    order = state.completed_step["order"]
+    if upcoming is None:
+        new_order = order + ORDER_GAP
+    else:
+        new_order = (order + upcoming["order"]) // 2
+        if new_order <= order:
+            from_order = upcoming["order"]
+            for s in state.steps[idx + 1 :]:
+                if s["order"] >= from_order:
+                    s["order"] += ORDER_GAP
+            yield "renumbered", {"fromOrder": from_order, "by": ORDER_GAP}
+            new_order = (order + upcoming["order"]) // 2
+    step = {
+        "id": f"step-{uuid.uuid4().hex[:12]}",
+        "order": new_order,
+        "type": "document" if source == "branched" else "check",
+        "prompt": prompt,
+        "status": "pending",
+        "source": source,
+    }
+    state.steps.insert(idx + 1, step)
+    state.added_steps.append(step)
+    record_metric("graph.adapt", labels={"source": source})
+    yield "added", step
+
+
+def _finish(state: GraphState) -> Iterator[GraphEvent]:
+    state.done = True
+    state.has_next = False
+    if state.completed_step is None:
+        yield from (("token", t) for t in stream_text("No more steps."))
+
+
+def _after_evaluate(state: GraphState) -> str:
+    if state.adaptation is not None:
+        return "adapt"
+    if any(s.get("status") in _UNFINISHED for s in state.steps):
+        return "ask"
+    return "finish"
+
+
+def _choose_adaptation(step: dict[str, Any], answer: str) -> tuple[str, str] | None:
+    """
+    ("branched", prompt) to document a finding reported on a planned step, ("added", prompt)
+    when the inspector asks for another check, or None to continue with the plan.
+    """
+    if is_routine_answer(answer):
+        return None
+    # A branched step's answer describes the finding itself; do not branch again from it.
+    if step.get("source") != "branched" and _reports_issue(answer):
+        return "branched", (
+            f"Document the issue you found ({answer.strip()}): "
+            "add a photo or measurement and note where it is."
+        )
+    m = _ALSO_CHECK.search(answer)
+    if m and m.group(1).strip():
+        return "added", f"Check {m.group(1).strip()}."
+    return None
+
+
+def _reports_issue(answer: str) -> bool:
+    words = re.findall(r"[a-z]+", answer.casefold())
+    for i, word in enumerate(words):
+        if word in _ISSUE_TERMS and not _NEGATIONS.intersection(words[max(0, i - 2) : i]):
+            return True
+    return False
+
+
+def _build_graph() -> CompiledGraph[GraphState]:
+    graph: StateGraph[GraphState] = StateGraph()
+    graph.add_node("plan", _plan)
+    graph.add_node("ask", _ask)
+    graph.add_node("evaluate", _evaluate)
+    graph.add_node("adapt", _adapt)
+    graph.add_node("finish", _finish)
+    graph.add_edge("plan", "ask")
+    graph.add_edge("ask", END)
+    graph.add_conditional_edges(
+        "evaluate", _after_evaluate, {"adapt": "adapt", "ask": "ask", "finish": "finish"}
+    )
+    graph.add_edge("adapt", "ask")
+    graph.add_edge("finish", END)
+    return graph.compile()
+
+
+# Compiled once per instance; runs only carry per-request GraphState.
+INSPECTION_GRAPH = _build_graph()
+
+
+# --- entry points --------------------------------------------------------------------------
+
+
+def stream_initial_graph(
+    goal: str,
+    constraints: dict | None = None,
+    tenant_id: str | None = None,
+    libraries: list[str] | None = None,
+    target_type: str | None = None,
+) -> Iterator[GraphEvent]:
+    """
+    From intent, yield initial steps as ("step", dict), then the first prompt as ("token", text)
+    chunks. The step whose prompt is being streamed has prompt=None; callers fill it with the
+    joined tokens. Plans come from the enabled step libraries when a template matches; with
+    tenant_id, LLM-generated plans are served from and stored in the plan cache.
+    """
+    state = GraphState(
+        intent_goal=goal,
+        intent_constraints=constraints,
+        steps=[],
+        current_prompt=None,
+        done=False,
+        tenant_id=tenant_id,
+        libraries=libraries,
+        target_type=target_type,
+    )
+    yield from INSPECTION_GRAPH.run(state, entry="plan")
+
+
+def run_initial_graph(
+    goal: str,
+    constraints: dict | None = None,
+    tenant_id: str | None = None,
+    libraries: list[str] | None = None,
+    target_type: str | None = None,
+) -> tuple[list[dict[str, Any]], str]:
+    """
+    From intent, produce initial steps and first prompt.
+    Returns (steps, prompt_text).
+    """
+    steps: list[dict[str, Any]] = []
+    tokens: list[str] = []
+    for kind, payload in stream_initial_graph(goal, constraints, tenant_id, libraries, target_type):
+        if kind == "step":
+            steps.append(payload)
+        elif kind == "token":
+            tokens.append(payload)
+    prompt_text = "".join(tokens)
+    steps = [{**s, "prompt": s["prompt"] if s["prompt"] is not None else prompt_text} for s in steps]
     return steps, prompt_text
 
 
+def stream_next_prompt(
+    current_step_id: str,
+    answer: str,
+    steps: list[dict[str, Any]],
+    candidate: str | None = None,
+) -> Iterator[GraphEvent]:
+    """
+    Streaming form of run_next_prompt: ("completed", step_dict | None), ("renumbered", shift)
+    if inserting needed room (callers shift the persisted orders), ("added", step_dict) for
+    each step the graph inserted (callers persist these), ("ask", step_dict) for the step
+    being asked, the prompt as ("token", text) chunks, then ("done", has_next).
+    steps is the ordered plan window starting at the current step (dicts with id, order, type,
+    prompt, status, source). candidate is a prompt for the next planned step phrased in advance
+    (speculate_next_prompt); it is used when the answer is routine and the plan was not
+    adapted, and discarded otherwise.
+    """
+    state = GraphState(
+        intent_goal="",
+        intent_constraints=None,
+        steps=[dict(s) for s in steps],
+        current_prompt=None,
+        done=False,
+        current_step_id=current_step_id,
+        answer=answer,
+        candidate=candidate,
+    )
+    yield from INSPECTION_GRAPH.run(state, entry="evaluate")
+    yield "done", state.has_next
+
+
 def run_next_prompt(
     current_step_id: str,
     answer: str,
     steps: list[dict[str, Any]],
+    candidate: str | None = None,
 ) -> tuple[dict[str, Any] | None, str, bool]:
     """
     Given answer for current step, return (completed_step, next_prompt_text, has_next).
-    MVP: one step then done.
     """
-    if not steps:
-        return None, "No more steps.", False
-    # Mark first step completed; no more steps in MVP
-    completed = {**steps[0], "status": "completed"} if steps else None
-    return completed, "", False
+    completed, tokens, has_next = None, [], False
+    for kind, payload in stream_next_prompt(current_step_id, answer, steps, candidate):
+        if kind == "completed":
+            completed = payload
+        elif kind == "token":
+            tokens.append(payload)
+        elif kind == "done":
+            has_next = payload
+    return completed, "".join(tokens), has_next
+
+
+def speculate_next_prompt(step_prompt: str, next_step_prompt: str, timeout: float | None = None) -> str | None:
+    """
+    Phrase the next planned step's prompt before the current step is answered (assuming a
+    routine answer). None when no LLM is configured: the planned prompt is then used as-is.
+    """
+    llm = get_llm_client()
+    if llm is None:
+        return None
+    try:
+        messages = speculative_prompt_messages(step_prompt, next_step_prompt)
+        return llm.complete(messages, timeout=timeout).strip() or None
+    except LLMError:
+        _log.info("prompt speculation failed", exc_info=True)
+        return None
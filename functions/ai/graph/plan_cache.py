@@ -0,0 +1,138 @@
+"""
+Cache of initial plans (steps + first prompt) in front of the initial graph.
+
+Keyed per tenant by the normalized goal, canonical constraints and enabled step libraries.
+Tier 1 is an in-process LRU/TTL cache; tier 2 (PLAN_CACHE_SHARED) is a Firestore document per
+key shared by all instances. Normalization is exact (case, whitespace, punctuation): prompts
+quote the goal, so goals that differ in substance ("unit 12B" vs "unit 14A") never share a plan.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any
+
+from infrastructure.cache.ttl_cache import CacheStats, TTLCache
+from infrastructure.config.logging import get_logger
+from infrastructure.config.observability import record_metric
+
+_log = get_logger(__name__)
+
+# Bump when the graph's plan shape or prompt templates change so old entries are ignored.
+PLAN_CACHE_VERSION = 1
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class CachedPlan:
+    steps: tuple[dict[str, Any], ...]
+    first_prompt: str
+
+    def steps_copy(self) -> list[dict[str, Any]]:
+        return copy.deepcopy(list(self.steps))
+
+
+_cache: TTLCache[str, CachedPlan] | None = None
+
+
+def _get_cache() -> TTLCache[str, CachedPlan]:
+    global _cache
+    if _cache is None:
+        from infrastructure.config.factories import get_config
+
+        config = get_config()
+        _cache = TTLCache(
+            max_entries=config.plan_cache_max_entries,
+            ttl_seconds=config.plan_cache_ttl_seconds,
+        )
+    return _cache
+
+
+def normalize_goal(goal: str) -> str:
+    """'  Roof inspection of Unit 12B!' -> 'roof inspection of unit 12b'."""
+    text = unicodedata.normalize("NFKC", goal or "").casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def plan_cache_key(
+    tenant_id: str,
+    goal: str,
+    constraints: dict | None = None,
+    libraries: list[str] | None = None,
+) -> str:
+    """Stable key; constraints are canonical JSON and library order does not matter."""
+    canonical = json.dumps(
+        {
+            "v": PLAN_CACHE_VERSION,
+            "tenant": tenant_id,
+            "goal": normalize_goal(goal),
+            "constraints": constraints or {},
+            "libraries": sorted(set(libraries or [])),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def get_plan(tenant_id: str, key: str) -> CachedPlan | None:
+    """Look up tier 1, then tier 2 (promoting hits to tier 1)."""
+    plan = _get_cache().get(key)
+    if plan is not None:
+        record_metric("plan_cache.hit", labels={"tier": "memory"})
+        return plan
+    if _shared_enabled():
+        from infrastructure.persistence import plan_cache_repository
+
+        try:
+            d = plan_cache_repository.load_plan(tenant_id, key)
+        except Exception:
+            _log.warning("shared plan cache read failed", exc_info=True)
+            d = None
+        if d is not None and d["steps"]:
+            plan = CachedPlan(steps=tuple(d["steps"]), first_prompt=d["firstPrompt"])
+            _get_cache().set(key, plan)
+            record_metric("plan_cache.hit", labels={"tier": "firestore"})
+            return plan
+    record_metric("plan_cache.miss")
+    return None
+
+
+def put_plan(tenant_id: str, key: str, steps: list[dict[str, Any]], first_prompt: str) -> None:
+    """Store a plan in both tiers; a failed shared write only loses sharing."""
+    plan = CachedPlan(steps=tuple(copy.deepcopy(steps)), first_prompt=first_prompt)
+    _get_cache().set(key, plan)
+    if _shared_enabled():
+        from infrastructure.config.factories import get_config
+        from infrastructure.persistence import plan_cache_repository
+
+        try:
+            plan_cache_repository.save_plan(
+                tenant_id, key, list(plan.steps), first_prompt, get_config().plan_cache_ttl_seconds
+            )
+        except Exception:
+            _log.warning("shared plan cache write failed", exc_info=True)
+
+
+def cache_stats() -> CacheStats:
+    """Hit/miss/eviction counters for the in-process tier on this instance."""
+    return _get_cache().stats()
+
+
+def clear_cache() -> None:
+    """Drop all in-process entries (for tests)."""
+    _get_cache().clear()
+
+
+def _shared_enabled() -> bool:
+    from infrastructure.config.factories import get_config
+
+    return get_config().plan_cache_shared
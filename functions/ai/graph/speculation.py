@@ -0,0 +1,103 @@
+"""
+Speculative prefetch of the next prompt: while a step's prompt is being served, phrase the
+prompt of the step after it and store it on that step as a candidate (Step.prompt_candidate).
+The next /next call uses the candidate instead of an inline LLM call when it is still valid.
+
+Cloud Functions throttles CPU once the response has been sent, so work left running after
+that may stall until the next request or never finish. Speculation never delays a response:
+JSON responses fire and forget, and SSE streams settle() it only after their done event, while
+the connection (and CPU) is still held. Each speculation is bounded by
+speculation_deadline_seconds from when it was scheduled: the LLM call gets that timeout and a
+candidate finished after the deadline (e.g. resumed after throttling) is not written. If no
+candidate is stored, the next /next call phrases the prompt inline as usual.
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from datetime import datetime
+
+from ai.graph.inspection_graph import speculate_next_prompt
+from infrastructure.config.factories import get_config, get_llm_client
+from infrastructure.config.logging import get_logger
+from infrastructure.config.observability import record_metric
+from infrastructure.persistence import step_repository
+from model.entities.step import PromptCandidate, Step
+
+_log = get_logger(__name__)
+
+# Best effort and off the response path; shared by all requests on this instance.
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prompt-speculation")
+
+
+@dataclass(frozen=True)
+class Speculation:
+    """A scheduled candidate generation and the monotonic time its request stops waiting for it."""
+
+    future: Future
+    deadline: float
+
+
+def valid_candidate(served: Step, upcoming: Step | None) -> str | None:
+    """Candidate text for upcoming if it was phrased after served against the current plan."""
+    if upcoming is None or upcoming.prompt_candidate is None:
+        return None
+    if not upcoming.prompt_candidate.matches(served.id, upcoming.prompt):
+        return None
+    return upcoming.prompt_candidate.text
+
+
+def schedule(tenant_id: str, session_id: str, served: Step, upcoming: Step | None) -> Speculation | None:
+    """
+    Start phrasing upcoming's prompt in the background while served's prompt is phrased and
+    sent; the caller settles it before its response completes. No-op without an LLM (planned
+    prompts are used as-is) or if a valid candidate exists.
+    """
+    if upcoming is None or get_llm_client() is None:
+        return None
+    if valid_candidate(served, upcoming) is not None:
+        return None
+    timeout = get_config().speculation_deadline_seconds
+    deadline = time.monotonic() + timeout
+    future = _executor.submit(_generate, tenant_id, session_id, served, upcoming, timeout, deadline)
+    return Speculation(future, deadline)
+
+
+def settle(speculation: Speculation | None) -> bool:
+    """
+    Wait for a scheduled speculation until its deadline. Only for streams that have already
+    sent their done event (CPU is throttled once they close). True if it finished; False if
+    there was none or it timed out.
+    """
+    if speculation is None:
+        return False
+    try:
+        speculation.future.result(timeout=max(0.0, speculation.deadline - time.monotonic()))
+        return True
+    except FutureTimeoutError:
+        record_metric("prompt_speculation.timed_out")
+        return False
+
+
+def _generate(
+    tenant_id: str, session_id: str, served: Step, upcoming: Step, timeout: float, deadline: float
+) -> None:
+    try:
+        text = speculate_next_prompt(served.prompt, upcoming.prompt, timeout=timeout)
+        if not text:
+            return
+        if time.monotonic() > deadline:
+            record_metric("prompt_speculation.expired")
+            return
+        candidate = PromptCandidate(
+            text=text,
+            after_step_id=served.id,
+            base_prompt=upcoming.prompt,
+            created_at=datetime.utcnow(),
+        )
+        step_repository.save_prompt_candidate(tenant_id, session_id, upcoming.id, candidate)
+        record_metric("prompt_speculation.generated")
+    except Exception:
+        _log.warning("storing speculative prompt failed", exc_info=True)
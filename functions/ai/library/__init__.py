@@ -0,0 +1 @@
+# Step libraries (deterministic initial plans)
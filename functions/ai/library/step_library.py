@@ -0,0 +1,239 @@
+"""
+Step libraries: deterministic initial plans from templates, matched without an LLM call.
+
+Library files (JSON, or YAML when PyYAML is installed) live in STEP_LIBRARY_DIR (default:
+functions/step_libraries). Top-level files are global; files under tenants/{tenantId}/ apply
+to that tenant only and win over global templates. Each file is one library:
+
+    {"id": "default", "templates": [
+        {"id": "roof", "targetTypes": ["property"], "keywords": ["roof", "gutter"],
+         "steps": [{"type": "check", "prompt": "..."}, ...]}]}
+
+A library is used when its id is in EnvConfig.step_libraries_enabled. Files are loaded once
+per instance and compiled into an index by target type and keyword; the index is rebuilt
+when the directory's version stamp (file names, sizes and mtimes) changes, checked at most
+every STEP_LIBRARY_RELOAD_SECONDS.
+"""
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from infrastructure.config.logging import get_logger
+
+_log = get_logger(__name__)
+
+DEFAULT_LIBRARY_DIR = Path(__file__).resolve().parents[2] / "step_libraries"
+DEFAULT_RELOAD_SECONDS = 60.0
+
+_SUFFIXES = (".json", ".yaml", ".yml")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class StepLibraryError(ValueError):
+    """A library file is malformed."""
+
+
+@dataclass(frozen=True)
+class StepTemplate:
+    id: str
+    library_id: str
+    tenant_id: str | None  # None for global templates
+    target_types: frozenset[str]
+    keywords: frozenset[str]
+    steps: tuple[tuple[str, str], ...]  # (type, prompt)
+
+
+@dataclass(frozen=True)
+class LibraryMatch:
+    template: StepTemplate
+    score: int
+
+
+def _words(text: str) -> set[str]:
+    return set(_WORD.findall((text or "").casefold()))
+
+
+class CompiledLibraries:
+    """Immutable index over all templates; one instance serves every request until reload."""
+
+    def __init__(self, templates: list[StepTemplate], stamp: tuple) -> None:
+        self.stamp = stamp
+        self.templates = tuple(templates)
+        self._by_keyword: dict[str, list[StepTemplate]] = defaultdict(list)
+        self._by_target: dict[str, list[StepTemplate]] = defaultdict(list)
+        for t in self.templates:
+            for keyword in t.keywords:
+                self._by_keyword[keyword].append(t)
+            for target_type in t.target_types:
+                self._by_target[target_type].append(t)
+
+    def match(
+        self,
+        goal: str,
+        target_type: str | None = None,
+        tenant_id: str | None = None,
+        libraries: list[str] | None = None,
+    ) -> LibraryMatch | None:
+        """
+        Best template for the goal: one point per goal keyword hit, two for a target type
+        match; at least one keyword must hit. Tenant templates beat global ones, then higher
+        scores; remaining ties resolve by library and template id, so the choice is stable.
+        """
+        enabled = set(libraries or [])
+        scores: dict[StepTemplate, int] = defaultdict(int)
+        for word in _words(goal):
+            for t in self._by_keyword.get(word, ()):
+                scores[t] += 1
+        if not scores:
+            return None
+        if target_type:
+            for t in self._by_target.get(target_type.casefold(), ()):
+                if t in scores:
+                    scores[t] += 2
+        candidates = [
+            (t, score)
+            for t, score in scores.items()
+            if t.library_id in enabled and t.tenant_id in (None, tenant_id)
+        ]
+        if not candidates:
+            return None
+        best, score = min(
+            candidates, key=lambda c: (c[0].tenant_id is None, -c[1], c[0].library_id, c[0].id)
+        )
+        return LibraryMatch(template=best, score=score)
+
+
+def _parse_template(d: dict[str, Any], library_id: str, tenant_id: str | None) -> StepTemplate:
+    steps = tuple(
+        (str(s.get("type") or "check"), str(s["prompt"]).strip())
+        for s in d.get("steps") or []
+        if s.get("prompt")
+    )
+    if not d.get("id") or not steps:
+        raise StepLibraryError(f"template in {library_id!r} needs an id and at least one step")
+    return StepTemplate(
+        id=str(d["id"]),
+        library_id=library_id,
+        tenant_id=tenant_id,
+        target_types=frozenset(str(t).casefold() for t in d.get("targetTypes") or []),
+        keywords=frozenset(w for k in d.get("keywords") or [] for w in _words(str(k))),
+        steps=steps,
+    )
+
+
+def _read_file(path: Path) -> dict[str, Any]:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        return json.loads(text)
+    import yaml  # optional: only needed for YAML libraries
+
+    return yaml.safe_load(text) or {}
+
+
+def _library_files(root: Path) -> list[tuple[Path, str | None]]:
+    files: list[tuple[Path, str | None]] = []
+    if not root.is_dir():
+        return files
+    files += [(p, None) for p in sorted(root.iterdir()) if p.suffix in _SUFFIXES and p.is_file()]
+    tenants = root / "tenants"
+    if tenants.is_dir():
+        for tenant_dir in sorted(p for p in tenants.iterdir() if p.is_dir()):
+            files += [
+                (p, tenant_dir.name)
+                for p in sorted(tenant_dir.iterdir())
+                if p.suffix in _SUFFIXES and p.is_file()
+            ]
+    return files
+
+
+def version_stamp(root: Path) -> tuple:
+    """Cheap change detector: one stat per library file, no reads."""
+    stamp = []
+    for path, tenant_id in _library_files(root):
+        st = path.stat()
+        stamp.append((tenant_id, path.name, st.st_size, st.st_mtime_ns))
+    return tuple(stamp)
+
+
+def compile_libraries(root: Path) -> CompiledLibraries:
+    """Load and index every library under root; malformed files are logged and skipped."""
+    stamp = version_stamp(root)
+    templates: list[StepTemplate] = []
+    for path, tenant_id in _library_files(root):
+        try:
+            d = _read_file(path)
+            library_id = str(d.get("id") or path.stem)
+            templates += [_parse_template(t, library_id, tenant_id) for t in d.get("templates") or []]
+        except ImportError:
+            _log.warning("skipping %s: PyYAML is not installed", path)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            _log.warning("skipping malformed step library %s", path, exc_info=True)
+    return CompiledLibraries(templates, stamp)
+
+
+class StepLibraryRegistry:
+    """Per-instance holder of the compiled index with stamp-checked hot reload."""
+
+    def __init__(
+        self,
+        root: Path,
+        reload_seconds: float = DEFAULT_RELOAD_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._root = root
+        self._reload_seconds = reload_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._compiled: CompiledLibraries | None = None
+        self._checked_at = 0.0
+
+    def get(self) -> CompiledLibraries:
+        compiled = self._compiled
+        if compiled is not None and self._clock() - self._checked_at < self._reload_seconds:
+            return compiled
+        with self._lock:
+            now = self._clock()
+            if self._compiled is None:
+                self._compiled = compile_libraries(self._root)
+            elif now - self._checked_at >= self._reload_seconds and version_stamp(self._root) != self._compiled.stamp:
+                self._compiled = compile_libraries(self._root)
+                _log.info("reloaded step libraries from %s", self._root)
+            self._checked_at = now
+            return self._compiled
+
+
+_registry: StepLibraryRegistry | None = None
+
+
+def get_registry() -> StepLibraryRegistry:
+    global _registry
+    if _registry is None:
+        from infrastructure.config.factories import build_config
+
+        config = build_config()
+        root = Path(config.step_library_dir) if config.step_library_dir else DEFAULT_LIBRARY_DIR
+        _registry = StepLibraryRegistry(root, config.step_library_reload_seconds)
+    return _registry
+
+
+def set_registry(registry: StepLibraryRegistry | None) -> None:
+    """Inject a registry (for tests); None resets to the default directory."""
+    global _registry
+    _registry = registry
+
+
+def match_library(
+    goal: str,
+    target_type: str | None = None,
+    tenant_id: str | None = None,
+    libraries: list[str] | None = None,
+) -> LibraryMatch | None:
+    return get_registry().get().match(goal, target_type, tenant_id, libraries)
@@ -1,8 +1,23 @@
 """
 Prompt generation: one question at a time (T026). Wired to graph.
+Uses the LLM client when one is configured; template prompts otherwise (and as fallback).
 """
 from __future__ import annotations
 
+import json
+import re
+from collections.abc import Iterator
+
+from ai.clients.llm_client import LLMClient, LLMError
+from infrastructure.config.logging import get_logger
+
+_log = get_logger(__name__)
+
+SYSTEM_PROMPT = (
+    "You guide a person through an inspection. Ask exactly one short, actionable question "
+    "at a time. Reply with the question only."
+)
+
 
 def first_prompt_for_intent(goal: str, constraints: dict | None = None) -> str:
     """Generate first prompt from intent goal."""
@@ -11,6 +26,97 @@ def first_prompt_for_intent(goal: str, constraints: dict | None = None) -> str:
     return f"Your goal is: {goal}. What is the first thing you want to check?"
 
 
-def next_prompt_from_answer(step_prompt: str, answer: str) -> str:
-    """Generate next prompt (simplified: can be replaced by LLM)."""
-    return "What would you like to check next?"
+def first_prompt_messages(goal: str, constraints: dict | None = None) -> list[dict[str, str]]:
+    """Chat messages asking the LLM for the first question of an inspection."""
+    user = f"Inspection goal: {goal}"
+    if constraints:
+        user += f"\nConstraints: {json.dumps(constraints, sort_keys=True)}"
+    user += "\nAsk the first question."
+    return [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": user}]
+
+
+def next_prompt_messages(step_prompt: str, answer: str, next_step_prompt: str | None) -> list[dict[str, str]]:
+    """Chat messages asking the LLM to phrase the next question given the last answer."""
+    user = f"Previous question: {step_prompt}\nAnswer: {answer}\n"
+    if next_step_prompt:
+        user += f"Next planned check: {next_step_prompt}\nAsk it as one question, using the answer as context."
+    else:
+        user += "Ask the next most useful question."
+    return [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": user}]
+
+
+# Answers that carry no information beyond "this check passed"; a prompt phrased in advance
+# for a routine answer is as good as one phrased after it. Bare polarity answers (yes, y, none)
+# are left out: most planned checks ask about defects ("are there leaks...?"), so they can mean
+# either outcome depending on the question.
+_ROUTINE_ANSWERS = frozenset({
+    "ok", "okay", "done", "pass", "passed", "good", "fine", "checked", "complete",
+    "completed", "na", "n a", "no issues", "no issue", "all good", "looks good",
+    "looks fine", "no problems", "nothing found", "nothing to report",
+})
+
+
+def is_routine_answer(answer: str) -> bool:
+    """True for short 'all fine' answers (ok, done, no issues, ...)."""
+    normalized = " ".join(re.sub(r"[^\w\s]", " ", (answer or "").casefold()).split())
+    return normalized in _ROUTINE_ANSWERS
+
+
+def speculative_prompt_messages(step_prompt: str, next_step_prompt: str) -> list[dict[str, str]]:
+    """Chat messages phrasing the next planned check in advance, assuming a routine answer."""
+    return next_prompt_messages(step_prompt, "No issues found.", next_step_prompt)
+
+
+def next_prompt_from_answer(
+    step_prompt: str,
+    answer: str,
+    next_step_prompt: str | None = None,
+    llm: LLMClient | None = None,
+) -> str:
+    """Generate next prompt (LLM when configured; otherwise the planned step prompt)."""
+    return "".join(stream_next_prompt_text(step_prompt, answer, next_step_prompt, llm))
+
+
+def stream_text(text: str) -> Iterator[str]:
+    """Split text into word-sized chunks (whitespace kept) for token streaming."""
+    yield from re.findall(r"\S+\s*|\s+", text or "")
+
+
+def stream_first_prompt(
+    goal: str, constraints: dict | None = None, llm: LLMClient | None = None
+) -> Iterator[str]:
+    """Stream the first prompt for an intent as text chunks."""
+    fallback = first_prompt_for_intent(goal, constraints)
+    if llm is None:
+        yield from stream_text(fallback)
+        return
+    yield from _stream_llm(llm, first_prompt_messages(goal, constraints), fallback)
+
+
+def stream_next_prompt_text(
+    step_prompt: str,
+    answer: str,
+    next_step_prompt: str | None = None,
+    llm: LLMClient | None = None,
+) -> Iterator[str]:
+    """Stream the next prompt as text chunks."""
+    fallback = next_step_prompt or "What would you like to check next?"
+    if llm is None:
+        yield from stream_text(fallback)
+        return
+    yield from _stream_llm(llm, next_prompt_messages(step_prompt, answer, next_step_prompt), fallback)
+
+
+def _stream_llm(llm: LLMClient, messages: list[dict[str, str]], fallback: str) -> Iterator[str]:
+    """Stream LLM output; if it fails or is empty before the first chunk, stream fallback instead."""
+    started = False
+    try:
+        for chunk in llm.stream(messages):
+            started = True
+            yield chunk
+    except LLMError:
+        if started:
+            raise
+        _log.warning("LLM prompt generation failed; using template prompt", exc_info=True)
+    if not started:
+        yield from stream_text(fallback)
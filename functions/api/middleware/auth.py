@@ -3,12 +3,29 @@ Tenant and auth middleware: extract tenantId and user id; enforce tenant isolati
 """
 from __future__ import annotations
 
+import hashlib
 import re
+import time
 from typing import Any
 
+from infrastructure.cache.ttl_cache import TTLCache
+from infrastructure.config.logging import get_logger
+from infrastructure.config.observability import record_metric
+
 # Request-like: any object with .path and .headers (Firebase Request or Flask request)
 _REQUEST = Any
 
+_log = get_logger(__name__)
+
+# Verified claims keyed by sha256(token); each entry lives until shortly before the token's exp.
+# Firebase ID tokens are valid for at most one hour.
+_TOKEN_CACHE_MAX_ENTRIES = 2048
+_TOKEN_CACHE_MAX_TTL_SECONDS = 3600.0
+_TOKEN_EXPIRY_MARGIN_SECONDS = 30.0
+_token_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+    max_entries=_TOKEN_CACHE_MAX_ENTRIES, ttl_seconds=_TOKEN_CACHE_MAX_TTL_SECONDS
+)
+
 
 def get_tenant_id_from_path(path: str) -> str | None:
     """Extract tenantId from path (e.g. /api/v1/tenants/{tenantId}/...)."""
@@ -28,17 +45,96 @@ def get_user_id(request: _REQUEST) -> str | None:
     uid = headers.get("X-User-Id") if hasattr(headers, "get") else None
     if uid:
         return uid
+    auth_header = headers.get("Authorization", "") if hasattr(headers, "get") else ""
+    token = (auth_header or "").replace("Bearer ", "").strip()
+    if not token:
+        return None
+    claims = verify_token(token)
+    return claims.get("uid") if claims else None
+
+
+def verify_token(token: str) -> dict[str, Any] | None:
+    """
+    Return verified ID-token claims, or None if the token is invalid or expired.
+    Verified claims are cached per instance until just before the token's exp, so repeated
+    requests with the same token skip signature verification.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    claims = _token_cache.get(key)
+    if claims is not None:
+        record_metric("auth.token_cache.hit")
+        return claims
+    record_metric("auth.token_cache.miss")
+
+    from firebase_admin import auth
+
+    from infrastructure.config.startup import ensure_firebase_app
+
+    ensure_firebase_app()
+    started = time.perf_counter()
     try:
-        from firebase_admin import auth
-
-        auth_header = headers.get("Authorization", "") if hasattr(headers, "get") else ""
-        token = (auth_header or "").replace("Bearer ", "").strip()
-        if not token:
-            return None
-        decoded = auth.verify_id_token(token)
-        return decoded.get("uid")
+        claims = auth.verify_id_token(token)
+    except (auth.InvalidIdTokenError, ValueError) as e:
+        # Malformed, expired, revoked or wrong-project tokens: caller answers 401.
+        _log.info("rejected ID token: %s", type(e).__name__)
+        return None
+    except auth.CertificateFetchError:
+        _log.exception("could not fetch Firebase token signing keys")
+        return None
+    finally:
+        record_metric("auth.verify_latency_ms", (time.perf_counter() - started) * 1000.0)
+
+    ttl = float(claims.get("exp", 0)) - time.time() - _TOKEN_EXPIRY_MARGIN_SECONDS
+    _token_cache.set(key, claims, ttl_seconds=min(ttl, _TOKEN_CACHE_MAX_TTL_SECONDS))
+    return claims
+
+
+def prefetch_signing_keys() -> bool:
+    """
+    Warm the Firebase token verifier's signing-key cache so the first verification on this
+    instance does not pay the key fetch. firebase_admin has no public API for this, so the
+    verifier's own key-fetch request is looked up defensively; if the SDK no longer exposes
+    it, prefetch is skipped and the first verify_id_token fetches the keys as usual.
+    Best effort: returns False if the keys were not fetched.
+    """
+    try:
+        from infrastructure.config.startup import ensure_firebase_app
+
+        ensure_firebase_app()
+        fetch = _signing_key_fetch()
+        if fetch is None:
+            _log.info("firebase_admin does not expose its token verifier; skipping key prefetch")
+            return False
+        fetch()
+        return True
     except Exception:
+        _log.warning("could not prefetch Firebase token signing keys", exc_info=True)
+        return False
+
+
+def _signing_key_fetch():
+    """
+    Callable that fetches the ID-token signing keys through the SDK verifier's caching
+    request (so verify_id_token reuses them), or None if those internals are unavailable.
+    """
+    try:
+        from firebase_admin import _token_gen, auth
+    except ImportError:
+        return None
+    get_client = getattr(auth, "_get_client", None)
+    cert_uri = getattr(_token_gen, "ID_TOKEN_CERT_URI", None)
+    if get_client is None or cert_uri is None:
         return None
+    verifier = getattr(get_client(None), "_token_verifier", None)
+    request = getattr(verifier, "request", None)
+    if not callable(request):
+        return None
+    return lambda: request(cert_uri, method="GET")
+
+
+def token_cache_stats():
+    """Hit/miss/eviction counters for the verified-token cache on this instance."""
+    return _token_cache.stats()
 
 
 def require_tenant_and_user(request: _REQUEST) -> tuple[str, str] | None:
@@ -0,0 +1,121 @@
+"""
+Sharing and collaborator contributions (FR-010, FR-011, User Story 3).
+"""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+
+from api.middleware.auth import require_tenant_and_user
+from api.middleware.errors import (
+    error_response,
+    forbidden_response,
+    not_found_response,
+    validation_error_response,
+)
+from api.routes.router import parse_json_body
+from infrastructure.persistence import collaboration_repository, session_repository
+from model.entities.collaboration import Contribution, ContributionType
+
+DEFAULT_LINK_TTL_HOURS = 72
+MAX_LINK_TTL_HOURS = 24 * 30
+MAX_CONTENT_BYTES = 16 * 1024
+
+
+def _load(request, tenant_id: str, session_id: str):
+    """(user_id, session) or an error response."""
+    auth = require_tenant_and_user(request)
+    if not auth:
+        return None, error_response("Unauthorized", 401)
+    session = session_repository.load(tenant_id, session_id)
+    if not session:
+        return None, not_found_response("Session")
+    return (auth[1], session), None
+
+
+def share_session(request, tenant_id: str, session_id: str):
+    """
+    POST .../share - owner grants participants access and/or issues a share link.
+    linkEnabled true issues a new link token (returned once; only its hash is stored);
+    false revokes every active link.
+    """
+    loaded, error = _load(request, tenant_id, session_id)
+    if error:
+        return error
+    user_id, session = loaded
+    if session.created_by != user_id:
+        return forbidden_response("Only the session owner can share the inspection")
+
+    body = parse_json_body(request) or {}
+    participant_ids = body.get("participantIds") or []
+    if not isinstance(participant_ids, list):
+        return validation_error_response("participantIds must be a list of user IDs")
+    participant_ids = [p for p in participant_ids if isinstance(p, str) and p and p != user_id]
+    link_enabled = body.get("linkEnabled")
+    if link_enabled is not None and not isinstance(link_enabled, bool):
+        return validation_error_response("linkEnabled must be true or false")
+    hours = body.get("expiresInHours") or DEFAULT_LINK_TTL_HOURS
+    if isinstance(hours, bool) or not isinstance(hours, int) or not 1 <= hours <= MAX_LINK_TTL_HOURS:
+        return validation_error_response(f"expiresInHours must be an integer between 1 and {MAX_LINK_TTL_HOURS}")
+
+    collaboration_repository.add_collaborators(tenant_id, session.id, participant_ids, via="participant")
+    out: dict = {"sessionId": session.id, "participantIds": participant_ids}
+    if link_enabled is True:
+        token, expires_at = collaboration_repository.create_share_link(
+            tenant_id, session.id, user_id, timedelta(hours=hours)
+        )
+        out |= {"shareToken": token, "expiresAt": expires_at.isoformat() + "Z"}
+    elif link_enabled is False:
+        out["revokedLinks"] = collaboration_repository.revoke_share_links(tenant_id, session.id)
+    return out, 200
+
+
+def _can_contribute(request, body: dict, tenant_id: str, user_id: str, session) -> bool:
+    """Owner, granted collaborator, or holder of a valid share link (who is then granted)."""
+    if session.created_by == user_id or collaboration_repository.is_collaborator(tenant_id, session.id, user_id):
+        return True
+    headers = getattr(request, "headers", {})
+    token = (headers.get("X-Share-Token") if hasattr(headers, "get") else None) or body.get("shareToken")
+    if token and collaboration_repository.resolve_share_link(tenant_id, token) == session.id:
+        collaboration_repository.add_collaborators(tenant_id, session.id, [user_id], via="link")
+        return True
+    return False
+
+
+def add_contribution(request, tenant_id: str, session_id: str):
+    """POST .../collaboration - append a comment, follow-up task or evidence ref (attributed to caller)."""
+    loaded, error = _load(request, tenant_id, session_id)
+    if error:
+        return error
+    user_id, session = loaded
+    if session.status.value == "completed":
+        # The record was materialized at completion; later contributions would never reach it.
+        return error_response("Session is completed; contributions are closed", 409)
+    body = parse_json_body(request) or {}
+    if not _can_contribute(request, body, tenant_id, user_id, session):
+        return forbidden_response("Not a collaborator on this inspection")
+
+    try:
+        contribution_type = ContributionType(body.get("type"))
+    except ValueError:
+        return validation_error_response(f"type must be one of {[t.value for t in ContributionType]}")
+    content = body.get("content")
+    if not isinstance(content, (str, dict)) or not content:
+        return validation_error_response("content must be a non-empty string or object")
+    if len(json.dumps(content, default=str)) > MAX_CONTENT_BYTES:
+        return validation_error_response(f"content exceeds {MAX_CONTENT_BYTES} bytes")
+    if contribution_type == ContributionType.EVIDENCE and not (isinstance(content, dict) and content.get("evidenceId")):
+        return validation_error_response("evidence contributions need content.evidenceId")
+
+    now = datetime.utcnow()
+    contribution = Contribution(
+        id=collaboration_repository.new_contribution_id(now),
+        session_id=session.id,
+        type=contribution_type,
+        content=content,
+        created_at=now,
+        created_by=user_id,
+        linked_step_id=body.get("linkedStepId"),
+    )
+    collaboration_repository.append_contribution(tenant_id, contribution)
+    return {"contributionId": contribution.id, "createdAt": now.isoformat() + "Z"}, 201
@@ -0,0 +1,71 @@
+"""
+Session change feed (research.md decision #3): GET .../events streams compact deltas over SSE.
+
+Every frame carries an id; clients reconnect with Last-Event-ID (or ?since=) and receive only
+what they missed. Streams end after change_feed_max_seconds so instances are not pinned by
+idle viewers; EventSource reconnects automatically with its last id.
+"""
+from __future__ import annotations
+
+import queue
+import time
+from datetime import datetime
+
+from api.middleware.errors import forbidden_response, validation_error_response
+from api.routes.inspection_collaboration import _load
+from api.routes.streaming import EventStream, sse_comment, sse_event
+from infrastructure.config.factories import get_config
+from infrastructure.events import session_feed
+from infrastructure.persistence import collaboration_repository
+from infrastructure.persistence.session_repository import progress_to_dict
+
+HEARTBEAT_SECONDS = 15.0
+
+
+def _resume_token(request) -> tuple[int | None, bool]:
+    """(since, valid) from Last-Event-ID or ?since=."""
+    headers = getattr(request, "headers", {})
+    args = getattr(request, "args", None)
+    raw = (headers.get("Last-Event-ID") if hasattr(headers, "get") else None) or (
+        args.get("since") if args is not None and hasattr(args, "get") else None
+    )
+    if not raw:
+        return None, True
+    try:
+        return int(raw), int(raw) >= 0
+    except ValueError:
+        return None, False
+
+
+def stream_session_events(request, tenant_id: str, session_id: str):
+    """GET .../events - owner or collaborator follows a session's changes."""
+    loaded, error = _load(request, tenant_id, session_id)
+    if error:
+        return error
+    user_id, session = loaded
+    if session.created_by != user_id and not collaboration_repository.is_collaborator(tenant_id, session.id, user_id):
+        return forbidden_response("Not a collaborator on this inspection")
+    since, valid = _resume_token(request)
+    if not valid:
+        return validation_error_response("Last-Event-ID / since must be an event id")
+    return EventStream(_stream(tenant_id, session, since, get_config().change_feed_max_seconds)), 200
+
+
+def _stream(tenant_id: str, session, since: int | None, max_seconds: float):
+    subscription = session_feed.subscribe(tenant_id, session.id, since)
+    try:
+        if since is None:
+            # Fresh viewers start from the current state; deltas follow.
+            now = session_feed.event_id(datetime.utcnow())
+            progress = progress_to_dict(session.progress) if session.progress else None
+            yield sse_event("snapshot", {"status": session.status.value, "progress": progress}, now)
+        deadline = time.monotonic() + max_seconds
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                event = subscription.events.get(timeout=min(HEARTBEAT_SECONDS, remaining))
+            except queue.Empty:
+                yield sse_comment("keep-alive")
+                continue
+            yield sse_event(event.type, event.data, event.id)
+    finally:
+        subscription.close()
@@ -1,52 +1,78 @@
 """
-Add evidence (T030).
+Add evidence (T030) and direct-to-Storage evidence uploads.
+
+Photos and files never pass through the function: POST .../evidence/uploads returns a V4
+signed resumable upload URL for the evidence path, the client uploads to Cloud Storage,
+then POST .../evidence/{evidenceId}/finalize verifies the stored object's size against the
+tenant limit and records the Evidence metadata.
 """
 from __future__ import annotations
 
-from datetime import datetime
+import json
+import re
 import uuid
+from datetime import datetime, timedelta
 
-from api.middleware.auth import get_tenant_id_from_path, require_tenant_and_user
+from api.middleware.auth import require_tenant_and_user
 from api.middleware.errors import error_response, not_found_response, validation_error_response
 from api.routes.router import parse_json_body
-from api.routes.inspection_sessions import _parse_path_session_id
-from infrastructure.config.factories import build_config
-from infrastructure.persistence import session_repository, evidence_repository
+from infrastructure.config.factories import get_config
+from infrastructure.config.tenant_config import TenantConfig, get_tenant_config
+from infrastructure.persistence import evidence_repository, session_repository, storage_client
 from model.entities.evidence import Evidence, EvidenceType
 
+# Evidence types whose bytes live in Cloud Storage.
+_UPLOAD_TYPES = frozenset({EvidenceType.PHOTO.value, EvidenceType.FILE.value})
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def _quota_error(config: TenantConfig):
+    return validation_error_response(
+        f"observation already has {config.evidence_max_count_per_observation} evidence items (the limit)"
+    )
+
+
+def _save(save, tenant_id: str, session_id: str, evidence: Evidence, config: TenantConfig):
+    """Run a counted evidence write; returns an error response if the quota check rejected it."""
+    try:
+        save(tenant_id, session_id, evidence, config.evidence_max_count_per_observation)
+    except evidence_repository.ObservationNotFoundError:
+        return not_found_response("Observation")
+    except evidence_repository.EvidenceQuotaExceededError:
+        return _quota_error(config)
+    return None
+
 
-def handle_evidence_request(request):
+def handle_evidence_request(request, tenant_id: str, session_id: str):
     """POST .../inspection_sessions/{sessionId}/evidence - add evidence."""
     auth = require_tenant_and_user(request)
     if not auth:
         return error_response("Unauthorized", 401)
-    tenant_id, user_id = auth
-    path = getattr(request, "path", "")
-    tenant_id = get_tenant_id_from_path(path) or tenant_id
-    session_id = _parse_path_session_id(request)
-    if not session_id:
-        return not_found_response("Session"), 404
+    _, user_id = auth
     session = session_repository.load(tenant_id, session_id)
     if not session:
-        return not_found_response("Session"), 404
+        return not_found_response("Session")
 
     body = parse_json_body(request) or {}
     observation_id = body.get("observationId")
     type_str = body.get("type", "note")
     if not observation_id:
-        return validation_error_response("observationId is required"), 400
-    config = build_config()
-    if type_str not in config.evidence_types:
-        return validation_error_response(f"type must be one of {config.evidence_types}"), 400
+        return validation_error_response("observationId is required")
+    config = get_tenant_config(tenant_id)
+    if not config.allows_evidence_type(type_str):
+        return validation_error_response(f"type must be one of {sorted(config.evidence_types)}")
     try:
         evidence_type = EvidenceType(type_str)
     except ValueError:
-        return validation_error_response("invalid evidence type"), 400
+        return validation_error_response("invalid evidence type")
 
     storage_path = body.get("storagePath")
     payload = body.get("payload")
     if not storage_path and payload is None:
         payload = {}
+    size = len(json.dumps(payload, default=str)) if payload is not None else None
+    if size is not None and size > config.evidence_max_size_bytes:
+        return validation_error_response(f"payload exceeds {config.evidence_max_size_bytes} bytes")
 
     evidence_id = str(uuid.uuid4())
     evidence = Evidence(
@@ -58,6 +84,118 @@ def handle_evidence_request(request):
         payload=payload,
         created_at=datetime.utcnow(),
         created_by=user_id,
+        size_bytes=size,
     )
-    evidence_repository.save_evidence(tenant_id, session_id, evidence)
+    rejected = _save(evidence_repository.save_evidence, tenant_id, session_id, evidence, config)
+    if rejected:
+        return rejected
     return {"evidenceId": evidence_id}, 201
+
+
+def _session_user(request, tenant_id: str, session_id: str):
+    """Caller's user id if the session exists, or an error response."""
+    auth = require_tenant_and_user(request)
+    if not auth:
+        return None, error_response("Unauthorized", 401)
+    if not session_repository.load(tenant_id, session_id):
+        return None, not_found_response("Session")
+    return auth[1], None
+
+
+def start_upload(request, tenant_id: str, session_id: str):
+    """POST .../evidence/uploads - reserve an evidence id and return a signed resumable upload URL."""
+    user_id, error = _session_user(request, tenant_id, session_id)
+    if error:
+        return error
+
+    body = parse_json_body(request) or {}
+    observation_id = body.get("observationId")
+    type_str = body.get("type", EvidenceType.PHOTO.value)
+    content_type = body.get("contentType") or "application/octet-stream"
+    filename = _UNSAFE_FILENAME.sub("_", (body.get("filename") or "").rsplit("/", 1)[-1]).strip("._")
+    if not observation_id:
+        return validation_error_response("observationId is required")
+    if not filename:
+        return validation_error_response("filename is required")
+    config = get_tenant_config(tenant_id)
+    if type_str not in _UPLOAD_TYPES or not config.allows_evidence_type(type_str):
+        allowed = sorted(_UPLOAD_TYPES & config.evidence_types)
+        return validation_error_response(f"type must be one of {allowed}")
+    declared = body.get("sizeBytes")
+    if declared is not None:
+        try:
+            declared = int(declared)
+        except (TypeError, ValueError):
+            return validation_error_response("sizeBytes must be an integer")
+    if declared is not None and declared > config.evidence_max_size_bytes:
+        return validation_error_response(f"file exceeds {config.evidence_max_size_bytes} bytes")
+    # Early check against the counters so doomed bytes are not uploaded; finalize enforces it.
+    if evidence_repository.observation_evidence_count(
+        tenant_id, session_id, observation_id
+    ) >= config.evidence_max_count_per_observation:
+        return _quota_error(config)
+
+    evidence_id = str(uuid.uuid4())
+    storage_path = evidence_repository.get_evidence_storage_path(tenant_id, session_id, evidence_id, filename)
+    ttl = get_config().evidence_upload_url_ttl_seconds
+    upload_url = storage_client.signed_resumable_upload_url(storage_path, content_type, ttl)
+    now = datetime.utcnow()
+    evidence_repository.save_pending_upload(tenant_id, session_id, evidence_id, {
+        "observationId": observation_id,
+        "type": type_str,
+        "storagePath": storage_path,
+        "contentType": content_type,
+        "createdBy": user_id,
+        "createdAt": now,
+        # Kept past the URL expiry so an upload started just before it can still be finalized.
+        "expiresAt": now + timedelta(seconds=ttl) + timedelta(days=1),
+    })
+    return {
+        "evidenceId": evidence_id,
+        "uploadUrl": upload_url,
+        "uploadMethod": "POST",
+        "uploadHeaders": {"x-goog-resumable": "start", "Content-Type": content_type},
+        "storagePath": storage_path,
+        "maxSizeBytes": config.evidence_max_size_bytes,
+        "expiresInSeconds": int(ttl),
+    }, 201
+
+
+def finalize_upload(request, tenant_id: str, session_id: str, evidence_id: str):
+    """POST .../evidence/{evidenceId}/finalize - verify the uploaded object and record evidence."""
+    user_id, error = _session_user(request, tenant_id, session_id)
+    if error:
+        return error
+    upload = evidence_repository.load_pending_upload(tenant_id, session_id, evidence_id)
+    if not upload:
+        return not_found_response("Upload")
+    if upload["createdBy"] != user_id:
+        return error_response("Upload was started by another user", 403)
+
+    stored = storage_client.get_object_metadata(upload["storagePath"])
+    if stored is None:
+        return error_response("Upload not found in storage; upload the file before finalizing", 409)
+    size, content_type = stored
+    config = get_tenant_config(tenant_id)
+    if size > config.evidence_max_size_bytes:
+        storage_client.delete_object(upload["storagePath"])
+        return validation_error_response(f"file exceeds {config.evidence_max_size_bytes} bytes")
+
+    evidence = Evidence(
+        id=evidence_id,
+        session_id=session_id,
+        observation_id=upload["observationId"],
+        type=EvidenceType(upload["type"]),
+        storage_path=upload["storagePath"],
+        payload=None,
+        created_at=datetime.utcnow(),
+        created_by=user_id,
+        content_type=content_type or upload.get("contentType"),
+        size_bytes=size,
+        derivatives=upload.get("derivatives"),
+    )
+    rejected = _save(evidence_repository.finalize_upload, tenant_id, session_id, evidence, config)
+    if rejected:
+        storage_client.delete_object(upload["storagePath"])
+        return rejected
+    return {"evidenceId": evidence_id, "storagePath": evidence.storage_path, "sizeBytes": size}, 201
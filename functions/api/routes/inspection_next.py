@@ -3,73 +3,170 @@ Submit answer and get next prompt (T029).
 """
 from __future__ import annotations
 
-from datetime import datetime
 import uuid
+from datetime import datetime
 
-from api.middleware.auth import get_tenant_id_from_path, require_tenant_and_user
+from ai.graph import speculation
+from ai.graph.inspection_graph import stream_next_prompt
+from api.middleware.auth import require_tenant_and_user
 from api.middleware.errors import error_response, not_found_response
+from api.middleware.response_states import error_state_response
 from api.routes.router import parse_json_body
-from api.routes.inspection_sessions import _parse_path_session_id
-from infrastructure.persistence import session_repository, step_repository, observation_repository
+from api.routes.streaming import EventStream, sse_event, wants_stream
+from infrastructure.config.logging import get_logger
+from infrastructure.persistence import session_repository
+from infrastructure.persistence.session_repository import AdvanceResult
 from model.entities.observation import Observation, ObservationPriority
-from model.entities.step import Step, StepStatus
-from ai.graph.inspection_graph import run_next_prompt
+from model.entities.step import Step, StepSource, StepStatus
+
+_log = get_logger(__name__)
 
 
-def handle_next_request(request):
+def handle_next_request(request, tenant_id: str, session_id: str):
     """POST .../inspection_sessions/{sessionId}/next - submit answer, get next prompt."""
     auth = require_tenant_and_user(request)
     if not auth:
         return error_response("Unauthorized", 401)
-    tenant_id, user_id = auth
-    path = getattr(request, "path", "")
-    tenant_id = get_tenant_id_from_path(path) or tenant_id
-    session_id = _parse_path_session_id(request)
-    if not session_id:
-        return not_found_response("Session"), 404
-    session = session_repository.load(tenant_id, session_id)
-    if not session:
-        return not_found_response("Session"), 404
+    _, user_id = auth
 
     body = parse_json_body(request) or {}
     answer = (body.get("answer") or body.get("observation") or "").strip()
     if not answer:
         return error_response("answer or observation is required", 400)
-
-    steps = step_repository.load_steps(tenant_id, session_id)
-    if not steps:
-        return {"hasNext": False, "prompt": None, "stepCompleted": None, "sessionStatus": session.status.value}, 200
-
-    current = steps[0]
     priority = body.get("priority", "normal")
     try:
         obs_priority = ObservationPriority(priority)
     except ValueError:
         obs_priority = ObservationPriority.NORMAL
 
-    obs = Observation(
-        id=str(uuid.uuid4()),
-        session_id=session_id,
-        step_id=current.id,
-        content=answer,
-        priority=obs_priority,
-        created_at=datetime.utcnow(),
-        created_by=user_id,
-        evidence_ids=[],
+    def make_observation(current: Step) -> Observation:
+        return Observation(
+            id=str(uuid.uuid4()),
+            session_id=session_id,
+            step_id=current.id,
+            content=answer,
+            priority=obs_priority,
+            created_at=datetime.utcnow(),
+            created_by=user_id,
+            evidence_ids=[],
+        )
+
+    # One transaction: read session + current/next pending step, write observation + step transition.
+    result = session_repository.advance(tenant_id, session_id, make_observation)
+    if result is None:
+        return not_found_response("Session")
+    session = result.session
+    current = result.completed_step
+    if current is None:
+        return {"hasNext": False, "prompt": None, "stepCompleted": None, "sessionStatus": session.status.value}, 200
+
+    # Rehydrate the graph from the step window advance() already read; no full plan load.
+    window = [s for s in (current, result.next_step, result.following_step) if s is not None]
+    steps_dict = [
+        {"id": s.id, "order": s.order, "type": s.type, "prompt": s.prompt, "status": s.status.value, "source": s.source.value}
+        for s in window
+    ]
+    candidate = speculation.valid_candidate(current, result.next_step)
+    events = _apply_graph_changes(
+        stream_next_prompt(current.id, answer, steps_dict, candidate), tenant_id, session_id, result
     )
-    observation_repository.save_observation(tenant_id, session_id, obs)
+    if wants_stream(request):
+        return EventStream(_stream_next(events, session.status.value)), 200
 
-    # Mark current step completed in DB
-    current.updated_at = datetime.utcnow()
-    object.__setattr__(current, "status", StepStatus.COMPLETED)
-    step_repository.save_step(tenant_id, session_id, current)
+    completed_step, asked, tokens, has_next = None, None, [], False
+    for kind, payload in events:
+        if kind == "completed":
+            completed_step = payload
+        elif kind == "ask":
+            asked = payload
+        elif kind == "token":
+            tokens.append(payload)
+        elif kind == "done":
+            has_next = payload
+    return _next_body(completed_step, "".join(tokens), has_next, asked, session.status.value), 200
 
-    steps_dict = [{"id": s.id, "order": s.order, "type": s.type, "prompt": s.prompt, "status": s.status.value} for s in steps]
-    completed_step, next_text, has_next = run_next_prompt(current.id, answer, steps_dict)
 
+def _apply_graph_changes(events, tenant_id: str, session_id: str, result: AdvanceResult):
+    """
+    Pass graph events through, persisting steps the graph added as one checkpoint delta (only
+    those; the answered step was written by advance) before the prompt is asked, and starting
+    speculation for the step after the one asked. A started speculation is passed on as
+    ("speculating", Speculation) so a stream can settle it after its done event; JSON
+    responses ignore it (fire and forget).
+    """
+    added: dict[str, Step] = {}
+    renumber = None
+    for kind, payload in events:
+        if kind == "renumbered":
+            renumber = (payload["fromOrder"], payload["by"])
+        elif kind == "added":
+            step = _new_step(payload, session_id)
+            added[step.id] = step
+        elif kind == "ask":
+            asked = added.get(payload["id"]) or result.next_step
+            if added:
+                session_repository.add_steps(result, tenant_id, list(added.values()), renumber)
+            # An added step is asked before the planned next step, which then follows it.
+            upcoming = result.next_step if payload["id"] in added else result.following_step
+            if asked is not None and asked.id == payload["id"]:
+                scheduled = speculation.schedule(tenant_id, session_id, asked, upcoming)
+                if scheduled is not None:
+                    yield "speculating", scheduled
+        yield kind, payload
+
+
+def _new_step(d: dict, session_id: str) -> Step:
+    now = datetime.utcnow()
+    return Step(
+        id=d["id"],
+        session_id=session_id,
+        order=d["order"],
+        type=d["type"],
+        prompt=d["prompt"],
+        target_id=None,
+        status=StepStatus.PENDING,
+        created_at=now,
+        updated_at=now,
+        source=StepSource(d["source"]),
+    )
+
+
+def _next_body(completed_step, next_text: str, has_next: bool, asked: dict | None, session_status: str) -> dict:
     return {
         "hasNext": has_next,
-        "prompt": {"stepId": None, "text": next_text, "type": "check"} if next_text else None,
+        "prompt": {"stepId": asked["id"] if asked else None, "text": next_text, "type": asked["type"] if asked else "check"} if next_text else None,
         "stepCompleted": {"stepId": completed_step["id"], "order": completed_step["order"], "type": completed_step["type"], "status": "completed"} if completed_step else None,
-        "sessionStatus": session.status.value,
-    }, 200
+        "sessionStatus": session_status,
+    }
+
+
+def _stream_next(events, session_status: str):
+    """
+    SSE: step_completed, step_added, prompt_token chunks, then done (same body as the JSON
+    response). Speculation for the following prompt is settled after done is sent.
+    """
+    completed_step, asked, tokens, has_next = None, None, [], False
+    scheduled = None
+    try:
+        for kind, payload in events:
+            if kind == "completed":
+                completed_step = payload
+                if payload:
+                    yield sse_event("step_completed", {"stepId": payload["id"], "order": payload["order"], "type": payload["type"], "status": "completed"})
+            elif kind == "added":
+                yield sse_event("step_added", {"stepId": payload["id"], "order": payload["order"], "type": payload["type"], "source": payload["source"], "status": "pending"})
+            elif kind == "ask":
+                asked = payload
+            elif kind == "token":
+                tokens.append(payload)
+                yield sse_event("prompt_token", {"text": payload})
+            elif kind == "done":
+                has_next = payload
+            elif kind == "speculating":
+                scheduled = payload
+    except Exception:
+        _log.exception("streaming next prompt failed")
+        yield sse_event("error", error_state_response("INTERNAL", "Next prompt unavailable; your answer was saved."))
+        return
+    yield sse_event("done", _next_body(completed_step, "".join(tokens), has_next, asked, session_status))
+    speculation.settle(scheduled)
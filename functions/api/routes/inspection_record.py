@@ -3,31 +3,35 @@ Record generation and GET record (T031).
 """
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import UTC, datetime
 
-from api.middleware.auth import get_tenant_id_from_path, require_tenant_and_user
+from api.middleware.auth import require_tenant_and_user
 from api.middleware.errors import error_response, not_found_response
-from api.routes.inspection_sessions import _parse_path_session_id
-from infrastructure.persistence import (
-    session_repository,
-    step_repository,
-    observation_repository,
-    evidence_repository,
-)
+from infrastructure.persistence import record_repository, session_repository
+from model.entities.collaboration import ContributionType
 from model.entities.inspection_record import InspectionRecord
 
 
-def _build_record(tenant_id: str, session_id: str, session) -> InspectionRecord:
-    """Build InspectionRecord from session, steps, observations, evidence."""
-    steps = step_repository.load_steps(tenant_id, session_id)
+def _build_record(tenant_id: str, session_id: str, version: int = 1) -> InspectionRecord:
+    """
+    Build InspectionRecord from the session's steps, observations, evidence and collaborator
+    contributions (joined in memory). Contributions arrive in createdAt order across all
+    collaborators: follow-up tasks go to followUps, comments and evidence refs to contributions.
+    """
+    sources = record_repository.load_record_sources(tenant_id, session_id)
     findings = []
     evidence_summary = []
     incomplete = []
     follow_ups = []
+    contributions = []
 
-    for step in steps:
-        obs_list = observation_repository.load_observations_for_step(tenant_id, session_id, step.id)
-        for obs in obs_list:
+    obs_by_step: dict[str, list] = {}
+    for obs in sources.observations:
+        obs_by_step.setdefault(obs.step_id, []).append(obs)
+    step_by_obs = {obs.id: obs.step_id for obs in sources.observations}
+
+    for step in sources.steps:
+        for obs in obs_by_step.get(step.id, []):
             findings.append({
                 "stepId": step.id,
                 "content": obs.content,
@@ -38,8 +42,33 @@ def _build_record(tenant_id: str, session_id: str, session) -> InspectionRecord:
         if step.status.value == "pending":
             incomplete.append({"stepId": step.id, "prompt": step.prompt})
 
+    for ev in sources.evidence:
+        evidence_summary.append({
+            "evidenceId": ev.id,
+            "observationId": ev.observation_id,
+            "stepId": step_by_obs.get(ev.observation_id),
+            "type": ev.type.value,
+            "storagePath": ev.storage_path,
+            "derivatives": ev.derivatives,
+            "createdBy": ev.created_by,
+        })
+
+    for c in sources.contributions:
+        entry = {
+            "contributionId": c.id,
+            "type": c.type.value,
+            "content": c.content,
+            "stepId": c.linked_step_id,
+            "createdBy": c.created_by,
+            "createdAt": _isoformat_utc(c.created_at),
+        }
+        if c.type == ContributionType.FOLLOW_UP_TASK:
+            follow_ups.append(entry | {"resolvedAt": _isoformat_utc(c.resolved_at) if c.resolved_at else None})
+        else:
+            contributions.append(entry)
+
     return InspectionRecord(
-        id=f"record-{session_id}",
+        id=record_repository.record_id_for(session_id, version),
         session_id=session_id,
         tenant_id=tenant_id,
         summary={
@@ -47,33 +76,81 @@ def _build_record(tenant_id: str, session_id: str, session) -> InspectionRecord:
             "evidenceSummary": evidence_summary,
             "incomplete": incomplete,
             "followUps": follow_ups,
+            "contributions": contributions,
         },
         generated_at=datetime.utcnow(),
-        version=1,
+        version=version,
     )
 
 
-def handle_record_request(request):
-    """GET .../inspection_sessions/{sessionId}/record - get decision-ready record."""
-    auth = require_tenant_and_user(request)
-    if not auth:
+def materialize_record(tenant_id: str, session, uow=None) -> InspectionRecord:
+    """
+    Build and persist the next record version for a session.
+    Caller links it via session.record_id in the same uow (see complete_session).
+    """
+    version = _record_version(session.record_id) + 1 if session.record_id else 1
+    record = _build_record(tenant_id, session.id, version)
+    record_repository.save_record(tenant_id, record, uow=uow)
+    return record
+
+
+def _record_version(record_id: str) -> int:
+    """Version encoded in a record id (record-{sessionId}-v{n}); 0 for legacy ids."""
+    _, _, suffix = record_id.rpartition("-v")
+    return int(suffix) if suffix.isdigit() else 0
+
+
+def _isoformat_utc(value: datetime) -> str:
+    """ISO-8601 with Z suffix for naive-UTC (built) and tz-aware (read back) timestamps."""
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return value.isoformat() + "Z"
+
+
+def _etag(record_id: str) -> str:
+    return f'"{record_id}"'
+
+
+def _if_none_match(request, etag: str) -> bool:
+    """True if the client's If-None-Match covers etag (records are immutable per id)."""
+    headers = getattr(request, "headers", {})
+    value = headers.get("If-None-Match", "") if hasattr(headers, "get") else ""
+    if not value:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in value.split(",")]
+    return "*" in tags or etag in tags
+
+
+def handle_record_request(request, tenant_id: str, session_id: str):
+    """
+    GET .../inspection_sessions/{sessionId}/record - get decision-ready record.
+    Returns (body, status, headers); 304 when If-None-Match matches the record ETag.
+    """
+    if not require_tenant_and_user(request):
         return error_response("Unauthorized", 401)
-    tenant_id, user_id = auth
-    path = getattr(request, "path", "")
-    tenant_id = get_tenant_id_from_path(path) or tenant_id
-    session_id = _parse_path_session_id(request)
-    if not session_id:
-        return not_found_response("Session"), 404
     session = session_repository.load(tenant_id, session_id)
     if not session:
-        return not_found_response("Session"), 404
+        return not_found_response("Session")
     if session.status.value != "completed":
-        return not_found_response("Record not available until session is completed"), 404
+        return not_found_response("Record not available until session is completed")
+
+    # Materialized on completion; the session document carries the current record id.
+    if session.record_id and _if_none_match(request, _etag(session.record_id)):
+        return None, 304, {"ETag": _etag(session.record_id)}
+    record = None
+    if session.record_id:
+        record = record_repository.load_record(tenant_id, session_id, session.record_id)
+    if record is None:
+        # Sessions completed before records were materialized: build once and link atomically.
+        with session_repository.unit_of_work() as uow:
+            record = materialize_record(tenant_id, session, uow=uow)
+            object.__setattr__(session, "record_id", record.id)
+            session_repository.save(session, uow=uow)
 
-    record = _build_record(tenant_id, session_id, session)
+    headers = {"ETag": _etag(record.id), "Cache-Control": "private, no-cache"}
     return {
         "sessionId": record.session_id,
         "summary": record.summary,
-        "generatedAt": record.generated_at.isoformat() + "Z",
+        "generatedAt": _isoformat_utc(record.generated_at),
         "version": record.version,
-    }, 200
+    }, 200, headers
@@ -1,68 +1,46 @@
 """
-Inspection session handlers: create session, get session, complete session (T027, T028, T065).
+Inspection session handlers: create, list, get and complete sessions (T027, T028, T065).
 """
 from __future__ import annotations
 
+import base64
+import hashlib
+import json
 import uuid
-from datetime import datetime
+from datetime import UTC, datetime
 
-from api.middleware.auth import get_tenant_id_from_path, get_user_id, require_tenant_and_user
-from api.middleware.errors import error_response, not_found_response, forbidden_response
-from api.middleware.response_states import error_state_response, success_response
+from ai.graph import speculation
+from ai.graph.inspection_graph import run_initial_graph, stream_initial_graph
+from api.middleware.auth import require_tenant_and_user
+from api.middleware.errors import error_response, forbidden_response, not_found_response
+from api.middleware.response_states import error_state_response
 from api.routes.router import parse_json_body
-from infrastructure.config.factories import build_config
-from infrastructure.persistence import session_repository, step_repository
-from model.aggregates.inspection_session import InspectionSession, SessionStatus
+from api.routes.streaming import EventStream, sse_event, wants_stream
+from infrastructure.config.logging import get_logger
+from infrastructure.config.tenant_config import get_tenant_config
+from infrastructure.persistence import (
+    graph_checkpoint_repository,
+    session_repository,
+    step_repository,
+)
+from infrastructure.persistence.graph_checkpoint_repository import GraphCheckpoint
+from model.aggregates.inspection_session import InspectionSession, SessionProgress, SessionStatus
 from model.entities.intent import Intent
 from model.entities.step import Step, StepSource, StepStatus
 from model.entities.target import Target
-from ai.graph.inspection_graph import run_initial_graph
 
+_log = get_logger(__name__)
 
-def _parse_path_session_id(request) -> str | None:
-    """Extract sessionId from path /api/v1/tenants/{tenantId}/inspection_sessions/{sessionId}."""
-    path = getattr(request, "path", "") or ""
-    parts = path.strip("/").split("/")
-    if "inspection_sessions" in parts:
-        idx = parts.index("inspection_sessions")
-        if idx + 1 < len(parts):
-            return parts[idx + 1]
-    return None
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
 
 
-def _is_create_path(path: str) -> bool:
-    """Path is .../inspection_sessions with no session id after."""
-    return path.rstrip("/").endswith("inspection_sessions")
-
-
-def _is_complete_path(path: str) -> bool:
-    return "complete" in path
-
-
-def handle_sessions_request(request):
-    """Dispatch to create_session, get_session, or complete_session by method and path."""
-    path = getattr(request, "path", "") or ""
-    method = (getattr(request, "method", None) or "GET").upper()
-    if method == "GET":
-        return get_session(request)
-    if method == "POST":
-        if _is_complete_path(path):
-            return complete_session(request)
-        if _is_create_path(path):
-            return create_session(request)
-    return error_response("Not found", 404)
-
-
-def create_session(request):
+def create_session(request, tenant_id: str):
     """POST create session from intent (T027). Enforce config (T060); vague intent → clarify (T061)."""
     auth = require_tenant_and_user(request)
     if not auth:
         return error_response("Unauthorized", 401)
-    tenant_id, user_id = auth
-    # Path may be /api/v1/tenants/xxx/inspection_sessions
-    path = getattr(request, "path", "")
-    if "/inspection_sessions" not in path and tenant_id not in path:
-        tenant_id = get_tenant_id_from_path(path) or tenant_id
+    _, user_id = auth
 
     body = parse_json_body(request)
     if not body or "intent" not in body:
@@ -74,7 +52,7 @@ def create_session(request):
     if len(goal) < 3:
         return error_state_response("CLARIFY", "Please describe your inspection goal in more detail."), 400
 
-    config = build_config()
+    config = get_tenant_config(tenant_id)
     intent = Intent(goal=goal, constraints=intent_obj.get("constraints"))
     target = None
     if body.get("target"):
@@ -101,73 +79,260 @@ def create_session(request):
     )
     session.start_progress()
 
-    steps_list, first_prompt = run_initial_graph(goal, intent.constraints)
-    session_repository.save(session)
+    if wants_stream(request):
+        return EventStream(
+            _stream_create_session(session, goal, intent.constraints, list(config.step_libraries_enabled))
+        ), 200
 
-    for i, s in enumerate(steps_list):
-        step = Step(
+    steps_list, first_prompt = run_initial_graph(
+        goal,
+        intent.constraints,
+        tenant_id=tenant_id,
+        libraries=list(config.step_libraries_enabled),
+        target_type=target.type if target else None,
+    )
+    _persist_new_session(session, steps_list, first_prompt)
+    return _session_created_body(session, steps_list, first_prompt), 201
+
+
+def _persist_new_session(
+    session: InspectionSession, steps_list: list[dict], first_prompt: str
+) -> speculation.Speculation | None:
+    """
+    Write the session, its progress counters, initial steps and the graph's initial checkpoint
+    snapshot in one atomic batch, then start phrasing the second step's prompt while the first
+    is answered. Returns the started speculation (streams settle it after done; JSON
+    responses do not wait for it).
+    """
+    steps = [
+        Step(
             id=s.get("id", f"step-{i}"),
-            session_id=session_id,
+            session_id=session.id,
             order=s.get("order", i),
             type=s.get("type", "check"),
-            prompt=s.get("prompt", first_prompt),
+            prompt=s.get("prompt") or first_prompt,
             target_id=None,
             status=StepStatus.PENDING,
-            created_at=now,
-            updated_at=now,
+            created_at=session.created_at,
+            updated_at=session.created_at,
             source=StepSource.INITIAL,
         )
-        step_repository.save_step(tenant_id, session_id, step)
+        for i, s in enumerate(steps_list)
+    ]
+    session.progress = SessionProgress.from_steps(steps)
 
-    response_data = {
-        "sessionId": session_id,
+    # Session and initial steps commit together: one round trip, no partially created plans.
+    with session_repository.unit_of_work() as uow:
+        graph_fields = graph_checkpoint_repository.stage_snapshot(
+            uow, session.tenant_id, session.id, GraphCheckpoint.from_steps(steps)
+        )
+        session_repository.save(session, uow=uow, include_progress=True, fields=graph_fields)
+        for step in steps:
+            step_repository.save_step(session.tenant_id, session.id, step, uow=uow)
+    if not steps:
+        return None
+    return speculation.schedule(session.tenant_id, session.id, steps[0], steps[1] if len(steps) > 1 else None)
+
+
+def _session_created_body(session: InspectionSession, steps_list: list[dict], first_prompt: str) -> dict:
+    return {
+        "sessionId": session.id,
         "status": session.status.value,
         "initialSteps": [{"stepId": s.get("id"), "order": s.get("order"), "type": s.get("type"), "status": "pending"} for s in steps_list],
-        "currentPrompt": {"stepId": steps_list[0]["id"] if steps_list else None, "text": first_prompt, "type": "check"},
+        "currentPrompt": {"stepId": steps_list[0]["id"] if steps_list else None, "text": first_prompt, "type": steps_list[0]["type"] if steps_list else "check"},
     }
-    return response_data, 201
 
 
-def get_session(request):
-    """GET session for resumption (T028)."""
+def _stream_create_session(
+    session: InspectionSession,
+    goal: str,
+    constraints: dict | None,
+    libraries: list[str] | None = None,
+):
+    """
+    SSE: one step per initial step, prompt_token chunks, then session_created once the session
+    is persisted and done (with the same body as the non-streaming 201). On failure an error
+    event says the session was not created; no session id is announced before it exists.
+    Speculation for the second prompt is settled after done, while the stream is still open.
+    """
+    steps_list: list[dict] = []
+    tokens: list[str] = []
+    try:
+        target_type = session.target.type if session.target else None
+        for kind, payload in stream_initial_graph(goal, constraints, session.tenant_id, libraries, target_type):
+            if kind == "step":
+                steps_list.append(payload)
+                yield sse_event("step", {"stepId": payload.get("id"), "order": payload.get("order"), "type": payload.get("type"), "status": "pending"})
+            elif kind == "token":
+                tokens.append(payload)
+                yield sse_event("prompt_token", {"text": payload})
+        first_prompt = "".join(tokens)
+        scheduled = _persist_new_session(session, steps_list, first_prompt)
+    except Exception:
+        _log.exception("streaming session creation failed")
+        yield sse_event("error", error_state_response("INTERNAL", "Session was not created; please retry."))
+        return
+    yield sse_event("session_created", {"sessionId": session.id, "status": session.status.value})
+    yield sse_event("done", _session_created_body(session, steps_list, first_prompt))
+    speculation.settle(scheduled)
+
+
+def _query_args(request) -> dict[str, list[str]]:
+    args = getattr(request, "args", None)
+    if args is None or not hasattr(args, "getlist"):
+        return {}
+    return {key: args.getlist(key) for key in args}
+
+
+def _parse_time(value: str) -> datetime:
+    """ISO 8601 instant; naive values are UTC (as stored)."""
+    t = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return t.astimezone(UTC).replace(tzinfo=None) if t.tzinfo else t
+
+
+def _filter_fingerprint(query: session_repository.SessionQuery) -> str:
+    return hashlib.sha256(repr(query).encode("utf-8")).hexdigest()[:12]
+
+
+def _encode_cursor(row: dict, query: session_repository.SessionQuery) -> str:
+    created_at = row["createdAt"]
+    if created_at.tzinfo:
+        created_at = created_at.astimezone(UTC).replace(tzinfo=None)
+    raw = json.dumps({"t": created_at.isoformat(), "id": row["id"], "f": _filter_fingerprint(query)})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, query: session_repository.SessionQuery) -> tuple[datetime, str] | None:
+    """(createdAt, id) from an opaque cursor; None if malformed or issued for other filters."""
+    try:
+        d = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if d["f"] != _filter_fingerprint(query):
+            return None
+        return datetime.fromisoformat(d["t"]), str(d["id"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _iso(value) -> str | None:
+    return value.isoformat() if isinstance(value, datetime) else None
+
+
+def _summary(row: dict) -> dict:
+    progress = row.get("progress") or {}
+    return {
+        "sessionId": row["id"],
+        "status": row.get("status"),
+        "goal": (row.get("intent") or {}).get("goal"),
+        "target": row.get("target"),
+        "createdBy": row.get("createdBy"),
+        "createdAt": _iso(row.get("createdAt")),
+        "updatedAt": _iso(row.get("updatedAt")),
+        "completedAt": _iso(row.get("completedAt")),
+        "recordId": row.get("recordId"),
+        "progress": {
+            "totalSteps": progress.get("total", 0),
+            "completedSteps": progress.get("completed", 0),
+            "skippedSteps": progress.get("skipped", 0),
+            "pendingSteps": progress.get("pending", 0),
+        },
+    }
+
+
+def list_sessions(request, tenant_id: str):
+    """
+    GET sessions for the tenant, newest first: filter by status (repeatable or comma list),
+    createdBy, targetType, targetIdentifier, createdAfter/createdBefore; page with limit and
+    the opaque nextCursor of the previous page.
+    """
     auth = require_tenant_and_user(request)
     if not auth:
         return error_response("Unauthorized", 401)
-    tenant_id, user_id = auth
-    path = getattr(request, "path", "")
-    tenant_id = get_tenant_id_from_path(path) or tenant_id
-    session_id = _parse_path_session_id(request)
-    if not session_id:
-        return not_found_response("Session"), 404
+    args = _query_args(request)
+
+    def first(key: str) -> str | None:
+        values = args.get(key) or []
+        return values[0] if values and values[0] else None
+
+    statuses = tuple(sorted({v for raw in args.get("status", []) for v in raw.split(",") if v}))
+    valid = {s.value for s in SessionStatus}
+    if any(v not in valid for v in statuses):
+        return error_response(f"status must be one of {sorted(valid)}", 400)
+    try:
+        created_after = _parse_time(first("createdAfter")) if first("createdAfter") else None
+        created_before = _parse_time(first("createdBefore")) if first("createdBefore") else None
+        limit = int(first("limit") or DEFAULT_PAGE_SIZE)
+    except ValueError:
+        return error_response("createdAfter/createdBefore must be ISO 8601 and limit an integer", 400)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return error_response(f"limit must be between 1 and {MAX_PAGE_SIZE}", 400)
+
+    query = session_repository.SessionQuery(
+        statuses=statuses,
+        created_by=first("createdBy"),
+        target_type=first("targetType"),
+        target_identifier=first("targetIdentifier"),
+        created_after=created_after,
+        created_before=created_before,
+    )
+    after = None
+    if first("cursor"):
+        after = _decode_cursor(first("cursor"), query)
+        if after is None:
+            return error_response("cursor is invalid or was issued for different filters", 400)
+
+    rows, has_more = session_repository.list_sessions(tenant_id, query, limit, after)
+    return {
+        "sessions": [_summary(row) for row in rows],
+        "nextCursor": _encode_cursor(rows[-1], query) if has_more and rows else None,
+    }, 200
+
+
+def get_session(request, tenant_id: str, session_id: str):
+    """GET session for resumption (T028)."""
+    if not require_tenant_and_user(request):
+        return error_response("Unauthorized", 401)
     session = session_repository.load(tenant_id, session_id)
     if not session:
-        return not_found_response("Session"), 404
-    steps = step_repository.load_steps(tenant_id, session_id)
-    current = steps[0] if steps else None
+        return not_found_response("Session")
+    progress = session.progress
+    if progress is None:
+        # Sessions created before progress counters were denormalized onto the session.
+        progress = SessionProgress.from_steps(step_repository.load_steps(tenant_id, session_id))
     return {
         "sessionId": session_id,
         "status": session.status.value,
-        "currentPrompt": {"stepId": current.id, "text": current.prompt, "type": current.type} if current else None,
-        "progress": {"totalSteps": len(steps)},
+        "currentPrompt": (
+            {"stepId": progress.current_step_id, "text": progress.current_prompt, "type": progress.current_step_type}
+            if progress.current_step_id
+            else None
+        ),
+        "progress": {
+            "totalSteps": progress.total,
+            "completedSteps": progress.completed,
+            "skippedSteps": progress.skipped,
+            "pendingSteps": progress.pending,
+        },
     }, 200
 
 
-def complete_session(request):
+def complete_session(request, tenant_id: str, session_id: str):
     """Complete session: only primary user (session owner) can mark complete (T065)."""
     auth = require_tenant_and_user(request)
     if not auth:
         return error_response("Unauthorized", 401)
-    tenant_id, user_id = auth
-    path = getattr(request, "path", "")
-    tenant_id = get_tenant_id_from_path(path) or tenant_id
-    session_id = _parse_path_session_id(request)
-    if not session_id:
-        return not_found_response("Session"), 404
+    _, user_id = auth
     session = session_repository.load(tenant_id, session_id)
     if not session:
-        return not_found_response("Session"), 404
+        return not_found_response("Session")
     if session.created_by != user_id:
-        return forbidden_response("Only the session owner can complete the inspection"), 403
-    session.complete()
-    session_repository.save(session)
+        return forbidden_response("Only the session owner can complete the inspection")
+    if session.status != SessionStatus.COMPLETED:
+        # Materialize the record once so GET record is a single document read; the record and
+        # the completed session carrying its id commit together, so neither is left dangling.
+        from api.routes.inspection_record import materialize_record
+
+        with session_repository.unit_of_work() as uow:
+            record = materialize_record(tenant_id, session, uow=uow)
+            session.complete(record_id=record.id)
+            session_repository.save(session, uow=uow)
     return {"sessionId": session_id, "status": session.status.value}, 200
@@ -0,0 +1,146 @@
+"""
+Offline sync (FR-014): POST .../sync replays a client's queued answers and evidence in one request.
+
+Actions carry client-generated ids (actionId, and optionally observationId / evidenceId, which
+default to the actionId), so a replay after a lost response is recognized and not applied twice.
+Each action gets its own status; one bad action does not fail the batch.
+"""
+from __future__ import annotations
+
+import json
+import re
+from datetime import datetime
+
+from api.middleware.auth import require_tenant_and_user
+from api.middleware.errors import error_response, not_found_response, validation_error_response
+from api.routes.router import parse_json_body
+from infrastructure.config.tenant_config import TenantConfig, get_tenant_config
+from infrastructure.persistence import session_repository, sync_repository
+from model.entities.evidence import Evidence, EvidenceType
+from model.entities.observation import Observation, ObservationPriority
+from model.entities.sync_action import SyncAction, SyncResult, SyncStatus
+
+MAX_SYNC_ACTIONS = 500
+# New client ids become document ids: no slashes, long enough to be unique per device.
+# References to existing documents (stepId, evidence observationId) only need to be safe paths.
+_CLIENT_ID = re.compile(r"^[A-Za-z0-9_-]{8,128}$")
+
+
+def sync_session(request, tenant_id: str, session_id: str):
+    """POST .../inspection_sessions/{sessionId}/sync - apply queued actions in order."""
+    auth = require_tenant_and_user(request)
+    if not auth:
+        return error_response("Unauthorized", 401)
+    _, user_id = auth
+    session = session_repository.load(tenant_id, session_id)
+    if not session:
+        return not_found_response("Session")
+    if session.status.value == "completed":
+        return error_response("Session is completed; queued actions can no longer be applied", 409)
+
+    body = parse_json_body(request) or {}
+    raw_actions = body.get("actions")
+    if not isinstance(raw_actions, list) or not raw_actions:
+        return validation_error_response("actions must be a non-empty list")
+    if len(raw_actions) > MAX_SYNC_ACTIONS:
+        return validation_error_response(f"at most {MAX_SYNC_ACTIONS} actions per request")
+
+    config = get_tenant_config(tenant_id)
+    parsed = [_parse_action(raw, session_id, user_id, config) for raw in raw_actions]
+    valid = [p for p in parsed if isinstance(p, SyncAction)]
+    outcomes: list[SyncResult] = []
+    if valid:
+        outcomes = sync_repository.apply_actions(
+            tenant_id, session_id, user_id, valid, config.evidence_max_count_per_observation
+        )
+        if outcomes is None:
+            return not_found_response("Session")
+    applied = iter(outcomes)
+    results = [next(applied) if isinstance(p, SyncAction) else p for p in parsed]
+
+    counts = {s.value: sum(1 for r in results if r.status == s) for s in SyncStatus}
+    return {"results": [r.to_dict() for r in results], **counts}, 200
+
+
+def _parse_action(raw, session_id: str, user_id: str, config: TenantConfig) -> SyncAction | SyncResult:
+    """A SyncAction, or a rejected SyncResult explaining why the action is malformed."""
+    action_id = raw.get("actionId") if isinstance(raw, dict) else None
+    if not isinstance(action_id, str) or not _CLIENT_ID.match(action_id):
+        return SyncResult(str(action_id), SyncStatus.REJECTED, error="actionId must be 8-128 characters [A-Za-z0-9_-]")
+
+    def rejected(error: str) -> SyncResult:
+        return SyncResult(action_id, SyncStatus.REJECTED, error=error)
+
+    now = datetime.utcnow()
+    kind = raw.get("type")
+    if kind == "answer":
+        observation_id = raw.get("observationId") or action_id
+        step_id = raw.get("stepId")
+        answer = (raw.get("answer") or raw.get("observation") or "").strip()
+        if not _valid_id(observation_id):
+            return rejected("observationId must be 8-128 characters [A-Za-z0-9_-]")
+        if not _valid_ref(step_id):
+            return rejected("stepId is required")
+        if not answer:
+            return rejected("answer is required")
+        try:
+            priority = ObservationPriority(raw.get("priority", "normal"))
+        except ValueError:
+            priority = ObservationPriority.NORMAL
+        observation = Observation(
+            id=observation_id,
+            session_id=session_id,
+            step_id=step_id,
+            content=answer,
+            priority=priority,
+            created_at=now,
+            created_by=user_id,
+            evidence_ids=[],
+        )
+        return SyncAction(action_id, observation=observation)
+
+    if kind == "evidence":
+        evidence_id = raw.get("evidenceId") or action_id
+        observation_id = raw.get("observationId")
+        if not _valid_id(evidence_id):
+            return rejected("evidenceId must be 8-128 characters [A-Za-z0-9_-]")
+        if not _valid_ref(observation_id):
+            return rejected("observationId is required")
+        type_str = raw.get("evidenceType", "note")
+        if not config.allows_evidence_type(type_str):
+            return rejected(f"evidenceType must be one of {sorted(config.evidence_types)}")
+        try:
+            evidence_type = EvidenceType(type_str)
+        except ValueError:
+            return rejected("invalid evidence type")
+        storage_path = raw.get("storagePath")
+        payload = raw.get("payload")
+        if not storage_path and payload is None:
+            payload = {}
+        size = len(json.dumps(payload, default=str)) if payload is not None else None
+        if size is not None and size > config.evidence_max_size_bytes:
+            return rejected(f"payload exceeds {config.evidence_max_size_bytes} bytes")
+        evidence = Evidence(
+            id=evidence_id,
+            session_id=session_id,
+            observation_id=observation_id,
+            type=evidence_type,
+            storage_path=storage_path,
+            payload=payload,
+            created_at=now,
+            created_by=user_id,
+            size_bytes=size,
+        )
+        return SyncAction(action_id, evidence=evidence)
+
+    return rejected("type must be answer or evidence")
+
+
+def _valid_id(value) -> bool:
+    """A new client-generated id."""
+    return isinstance(value, str) and bool(_CLIENT_ID.match(value))
+
+
+def _valid_ref(value) -> bool:
+    """A reference to an existing document (server ids such as step-1, or a client id)."""
+    return isinstance(value, str) and 0 < len(value) <= 128 and "/" not in value
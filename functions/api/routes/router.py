@@ -1,9 +1,27 @@
 """
-Shared request helpers. (Central dispatch removed; each Cloud Function calls its handler directly.)
+Shared request helpers and the compiled route table.
+
+The route table maps method + path template to a handler so one function (main.inspection_api)
+can serve every endpoint; per-endpoint Cloud Functions dispatch through it restricted to their
+module. Handlers are called as handler(request, **params), params named after the template.
 """
 from __future__ import annotations
 
+import importlib
 import json
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from api.middleware.errors import error_response
+
+# Path parameter converters: {name} or {name:type}.
+_CONVERTERS: dict[str, tuple[str, Callable[[str], Any]]] = {
+    "str": (r"[^/]+", str),
+    "int": (r"\d+", int),
+}
+_PARAM = re.compile(r"\{(\w+)(?::(\w+))?\}")
 
 
 def parse_json_body(request) -> dict | None:
@@ -18,3 +36,120 @@ def parse_json_body(request) -> dict | None:
         return json.loads(raw) if raw else None
     except Exception:
         return None
+
+
+@dataclass(frozen=True)
+class Route:
+    """Method + path template compiled to an anchored regex; handler is 'module:function'."""
+
+    method: str
+    template: str
+    handler: str
+    pattern: re.Pattern = field(compare=False)
+    converters: dict[str, Callable[[str], Any]] = field(compare=False)
+
+
+@dataclass(frozen=True)
+class RouteMatch:
+    route: Route
+    params: dict[str, Any]
+
+
+def compile_route(method: str, template: str, handler: str) -> Route:
+    """Compile '/tenants/{tenant_id}/x/{n:int}' into a Route with typed named groups."""
+    converters: dict[str, Callable[[str], Any]] = {}
+    regex = ""
+    pos = 0
+    for m in _PARAM.finditer(template):
+        name, kind = m.group(1), m.group(2) or "str"
+        if kind not in _CONVERTERS:
+            raise ValueError(f"unknown converter {kind!r} in {template}")
+        part, convert = _CONVERTERS[kind]
+        regex += re.escape(template[pos : m.start()]) + f"(?P<{name}>{part})"
+        converters[name] = convert
+        pos = m.end()
+    regex += re.escape(template[pos:])
+    return Route(
+        method=method.upper(),
+        template=template,
+        handler=handler,
+        pattern=re.compile(f"^{regex}$"),
+        converters=converters,
+    )
+
+
+class RouteTable:
+    """Precompiled routes; handlers are imported on first use to keep cold starts small."""
+
+    def __init__(self, routes: list[tuple[str, str, str]]) -> None:
+        self._routes = [compile_route(*r) for r in routes]
+        self._handlers: dict[str, Callable] = {}
+
+    def match(self, method: str, path: str, module: str | None = None) -> RouteMatch | None:
+        """
+        Return the route for method + path, with typed params; None if nothing matches.
+        module restricts matching to handlers defined in that module.
+        """
+        path = "/" + (path or "").strip("/")
+        method = (method or "GET").upper()
+        for route in self._routes_in(module):
+            if route.method != method:
+                continue
+            m = route.pattern.match(path)
+            if m:
+                params = {k: route.converters[k](v) for k, v in m.groupdict().items()}
+                return RouteMatch(route=route, params=params)
+        return None
+
+    def allowed_methods(self, path: str, module: str | None = None) -> list[str]:
+        path = "/" + (path or "").strip("/")
+        return sorted({r.method for r in self._routes_in(module) if r.pattern.match(path)})
+
+    def _routes_in(self, module: str | None) -> list[Route]:
+        if module is None:
+            return self._routes
+        return [r for r in self._routes if r.handler.startswith(f"{module}:")]
+
+    def handler_for(self, route: Route) -> Callable:
+        handler = self._handlers.get(route.handler)
+        if handler is None:
+            module_name, _, func_name = route.handler.partition(":")
+            handler = getattr(importlib.import_module(module_name), func_name)
+            self._handlers[route.handler] = handler
+        return handler
+
+    def dispatch(self, request, module: str | None = None):
+        """
+        Call the matching handler with the path params as keyword arguments; 404 for unknown
+        paths, 405 for a known path and wrong method. module restricts dispatch to the
+        handlers of one module (per-endpoint Cloud Functions).
+        """
+        path = getattr(request, "path", "") or ""
+        method = getattr(request, "method", None) or "GET"
+        match = self.match(method, path, module)
+        if match is None:
+            if self.allowed_methods(path, module):
+                return error_response("Method not allowed", 405)
+            return error_response("Not found", 404)
+        return self.handler_for(match.route)(request, **match.params)
+
+
+_SESSIONS = "/api/v1/tenants/{tenant_id}/inspection_sessions"
+_SESSION = _SESSIONS + "/{session_id}"
+
+# Every API endpoint (single entry point mode).
+API_ROUTES = RouteTable([
+    ("POST", _SESSIONS, "api.routes.inspection_sessions:create_session"),
+    ("GET", _SESSIONS, "api.routes.inspection_sessions:list_sessions"),
+    ("GET", _SESSION, "api.routes.inspection_sessions:get_session"),
+    ("POST", _SESSION + "/complete", "api.routes.inspection_sessions:complete_session"),
+    ("POST", _SESSION + "/next", "api.routes.inspection_next:handle_next_request"),
+    ("POST", _SESSION + "/evidence", "api.routes.inspection_evidence:handle_evidence_request"),
+    ("POST", _SESSION + "/evidence/uploads", "api.routes.inspection_evidence:start_upload"),
+    ("POST", _SESSION + "/evidence/{evidence_id}/finalize", "api.routes.inspection_evidence:finalize_upload"),
+    ("GET", _SESSION + "/record", "api.routes.inspection_record:handle_record_request"),
+    ("POST", _SESSION + "/share", "api.routes.inspection_collaboration:share_session"),
+    ("POST", _SESSION + "/collaboration", "api.routes.inspection_collaboration:add_contribution"),
+    ("GET", _SESSION + "/events", "api.routes.inspection_events:stream_session_events"),
+    ("POST", _SESSION + "/sync", "api.routes.inspection_sync:sync_session"),
+])
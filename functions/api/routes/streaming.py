@@ -0,0 +1,46 @@
+"""
+Server-sent events for streaming responses (research.md decision #4).
+Handlers return (EventStream(...), status); main.py turns it into a streamed text/event-stream response.
+"""
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # ask proxies not to buffer the stream
+}
+
+
+class EventStream:
+    """Iterable of already-formatted SSE frames."""
+
+    def __init__(self, frames: Iterable[str]) -> None:
+        self._frames = frames
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._frames)
+
+
+def wants_stream(request) -> bool:
+    """Client asked for streaming: Accept: text/event-stream or ?stream=true."""
+    headers = getattr(request, "headers", {})
+    accept = headers.get("Accept", "") if hasattr(headers, "get") else ""
+    if "text/event-stream" in (accept or ""):
+        return True
+    args = getattr(request, "args", None)
+    value = args.get("stream", "") if args is not None and hasattr(args, "get") else ""
+    return str(value).lower() in ("1", "true")
+
+
+def sse_event(event: str, data: Any, event_id: str | int | None = None) -> str:
+    """Format one SSE frame: named event with a single-line JSON payload (and optional resume id)."""
+    id_line = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{id_line}event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+
+def sse_comment(text: str = "") -> str:
+    """SSE comment frame; keeps idle connections open through proxies."""
+    return f": {text}\n\n"
@@ -0,0 +1 @@
+# Analytics export (collection-group scans to Parquet in Storage)
@@ -0,0 +1,184 @@
+"""
+Incremental export of observations and evidence to Parquet files in Cloud Storage.
+
+Each run scans the observations and evidence collection groups (every tenant and session in
+one ordered query each) from the last checkpoint, in pages of ANALYTICS_EXPORT_CHUNK_SIZE.
+Rows are labelled with the session's target and written to Hive-style partitions:
+
+    {ANALYTICS_EXPORT_PREFIX}/{collection}/tenant_id={t}/dt={YYYY-MM-DD}/part-{chunk}.parquet
+
+The checkpoint (createdAt, path) advances after each page's files are written. Part names are
+derived from the page's starting checkpoint, so re-running a page after a crash overwrites its
+files instead of duplicating rows. Only documents older than ANALYTICS_EXPORT_LAG_SECONDS are
+exported, so writes still in flight are not skipped. Reports read these files, never the
+session documents. pyarrow is imported on first use (scheduled function only).
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from infrastructure.config.factories import get_config
+from infrastructure.config.logging import get_logger
+from infrastructure.config.observability import record_metric
+from infrastructure.persistence import analytics_export_repository, storage_client
+
+_log = get_logger(__name__)
+
+COLLECTIONS = ("observations", "evidence")
+PARQUET_CONTENT_TYPE = "application/vnd.apache.parquet"
+
+_DOC_PATH = re.compile(r"^tenants/([^/]+)/inspection_sessions/([^/]+)/(?:observations|evidence)/([^/]+)$")
+
+# Column name -> Arrow type name, in file order. Labels come from the session document.
+_COLUMNS: dict[str, tuple[tuple[str, str], ...]] = {
+    "observations": (
+        ("tenant_id", "string"),
+        ("session_id", "string"),
+        ("observation_id", "string"),
+        ("step_id", "string"),
+        ("priority", "string"),
+        ("content", "string"),
+        ("evidence_count", "int32"),
+        ("created_by", "string"),
+        ("created_at", "timestamp"),
+        ("target_type", "string"),
+        ("target_identifier", "string"),
+    ),
+    "evidence": (
+        ("tenant_id", "string"),
+        ("session_id", "string"),
+        ("evidence_id", "string"),
+        ("observation_id", "string"),
+        ("type", "string"),
+        ("content_type", "string"),
+        ("size_bytes", "int64"),
+        ("created_by", "string"),
+        ("created_at", "timestamp"),
+        ("target_type", "string"),
+        ("target_identifier", "string"),
+    ),
+}
+
+
+@dataclass
+class ExportResult:
+    collection: str
+    rows: int = 0
+    files: list[str] = field(default_factory=list)
+    checkpoint: tuple[datetime, str] | None = None
+    complete: bool = True  # False when the run stopped at its time budget
+
+
+def _utc(t: datetime) -> datetime:
+    return t.astimezone(UTC) if t.tzinfo else t.replace(tzinfo=UTC)
+
+
+def to_row(collection: str, path: str, d: dict[str, Any], labels: dict[str, Any]) -> dict[str, Any] | None:
+    """Flat export row for one document; None for documents outside tenant session paths."""
+    m = _DOC_PATH.match(path)
+    if m is None:
+        return None
+    tenant_id, session_id, doc_id = m.groups()
+    target = labels.get("target") or {}
+    row: dict[str, Any] = {
+        "tenant_id": tenant_id,
+        "session_id": session_id,
+        "created_by": d.get("createdBy"),
+        "created_at": _utc(d["createdAt"]),
+        "target_type": target.get("type"),
+        "target_identifier": target.get("identifier"),
+    }
+    if collection == "observations":
+        row |= {
+            "observation_id": doc_id,
+            "step_id": d.get("stepId"),
+            "priority": d.get("priority", "normal"),
+            "content": d.get("content"),
+            "evidence_count": len(d.get("evidenceIds") or []),
+        }
+    else:
+        row |= {
+            "evidence_id": doc_id,
+            "observation_id": d.get("observationId"),
+            "type": d.get("type"),
+            "content_type": d.get("contentType"),
+            "size_bytes": d.get("sizeBytes"),
+        }
+    return row
+
+
+def partition_rows(
+    collection: str, page: list[tuple[str, dict[str, Any]]]
+) -> dict[tuple[str, str], list[dict[str, Any]]]:
+    """Group a page into (tenant_id, YYYY-MM-DD) partitions, labelled with session fields."""
+    keys = {m.groups()[:2] for path, _ in page if (m := _DOC_PATH.match(path))}
+    labels = analytics_export_repository.load_session_labels(keys)
+    partitions: dict[tuple[str, str], list[dict[str, Any]]] = defaultdict(list)
+    for path, d in page:
+        m = _DOC_PATH.match(path)
+        row = to_row(collection, path, d, labels.get(m.groups()[:2], {}) if m else {})
+        if row is not None:
+            partitions[(row["tenant_id"], row["created_at"].date().isoformat())].append(row)
+    return partitions
+
+
+def to_parquet(collection: str, rows: list[dict[str, Any]]) -> bytes:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"string": pa.string(), "int32": pa.int32(), "int64": pa.int64(), "timestamp": pa.timestamp("us", tz="UTC")}
+    schema = pa.schema([(name, types[t]) for name, t in _COLUMNS[collection]])
+    table = pa.Table.from_pylist(rows, schema=schema)
+    buf = io.BytesIO()
+    pq.write_table(table, buf, compression="zstd")
+    return buf.getvalue()
+
+
+def part_name(collection: str, start: tuple[datetime, str] | None) -> str:
+    """Stable name for the page that starts after checkpoint start."""
+    key = f"{collection}|{start[0].isoformat()}|{start[1]}" if start else f"{collection}|start"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def export_collection(collection: str, now: datetime | None = None, deadline: float | None = None) -> ExportResult:
+    """Export documents created since the checkpoint; stops early (resumable) at deadline (monotonic)."""
+    config = get_config()
+    until = (now or datetime.utcnow()) - timedelta(seconds=config.analytics_export_lag_seconds)
+    chunk = config.analytics_export_chunk_size
+    after = analytics_export_repository.load_checkpoint(collection)
+    result = ExportResult(collection, checkpoint=after)
+    while True:
+        if deadline is not None and time.monotonic() >= deadline:
+            result.complete = False
+            break
+        page = analytics_export_repository.scan_collection_group(collection, after, until, chunk)
+        if not page:
+            break
+        name = part_name(collection, after)
+        for (tenant_id, day), rows in sorted(partition_rows(collection, page).items()):
+            path = f"{config.analytics_export_prefix}/{collection}/tenant_id={tenant_id}/dt={day}/part-{name}.parquet"
+            storage_client.upload_object(path, to_parquet(collection, rows), PARQUET_CONTENT_TYPE)
+            result.files.append(path)
+        last_path, last = page[-1]
+        after = (last["createdAt"], last_path)
+        analytics_export_repository.save_checkpoint(collection, after[0], after[1], len(page))
+        result.rows += len(page)
+        result.checkpoint = after
+        if len(page) < chunk:
+            break
+    record_metric("analytics_export.rows", float(result.rows), {"collection": collection})
+    _log.info("exported %d %s rows to %d files", result.rows, collection, len(result.files))
+    return result
+
+
+def run_export(budget_seconds: float = 420.0) -> list[ExportResult]:
+    """Export every collection within one time budget (scheduled function entry point)."""
+    deadline = time.monotonic() + budget_seconds
+    return [export_collection(c, deadline=deadline) for c in COLLECTIONS]
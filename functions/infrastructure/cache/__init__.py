@@ -0,0 +1 @@
+# In-process caches (per warm instance)
@@ -4,9 +4,11 @@ so tests can inject mocks.
 """
 from __future__ import annotations
 
+import threading
 from typing import Any, Protocol
 
 from infrastructure.config.loader import EnvConfig
+from infrastructure.config.logging import get_logger
 
 
 class FirestoreClientFactory(Protocol):
@@ -25,6 +27,10 @@ class StorageClientFactory(Protocol):
 
 _default_firestore_factory: Any = None
 _default_storage_factory: Any = None
+_UNSET: Any = object()
+_default_llm_client: Any = _UNSET
+_config: EnvConfig | None = None
+_llm_lock = threading.Lock()
 
 
 def get_firestore_factory() -> FirestoreClientFactory:
@@ -77,6 +83,62 @@ def set_storage_factory(factory: StorageClientFactory | None) -> None:
     _default_storage_factory = factory
 
 
+def get_llm_client():
+    """
+    Return the per-instance LLM client (pooled connections), or None when LLM_ENDPOINT is not
+    configured or invalid; callers then fall back to template prompts. Built once under a lock,
+    so concurrent first requests share one client (and an invalid endpoint is reported once).
+    """
+    global _default_llm_client
+    if _default_llm_client is _UNSET:
+        with _llm_lock:
+            if _default_llm_client is _UNSET:
+                _default_llm_client = _build_llm_client(get_config())
+    return _default_llm_client
+
+
+def _build_llm_client(config: EnvConfig):
+    if not config.llm_endpoint:
+        return None
+    from ai.clients.llm_client import LLMClient, LLMClientConfig
+
+    try:
+        return LLMClient(
+            LLMClientConfig(
+                endpoint=config.llm_endpoint,
+                api_key=config.llm_api_key,
+                model=config.llm_model,
+                timeout_seconds=config.llm_timeout_seconds,
+                max_concurrency=config.llm_max_concurrency,
+                max_retries=config.llm_max_retries,
+                pool_size=config.llm_max_concurrency,
+            )
+        )
+    except ValueError:
+        get_logger(__name__).error("LLM disabled: %s", config.llm_endpoint, exc_info=True)
+        return None
+
+
+def set_llm_client(client: Any = _UNSET) -> None:
+    """Inject LLM client (for tests); None disables the LLM, no argument resets to default."""
+    global _default_llm_client
+    _default_llm_client = client
+
+
+def get_config() -> EnvConfig:
+    """Per-instance EnvConfig: the environment is parsed once, not on every request."""
+    global _config
+    if _config is None:
+        _config = build_config()
+    return _config
+
+
+def set_config(config: EnvConfig | None) -> None:
+    """Inject config (for tests); None re-reads the environment on next use."""
+    global _config
+    _config = config
+
+
 def build_config(env_name: str | None = None) -> EnvConfig:
     """Build EnvConfig (from loader); tests can override env_name."""
     from infrastructure.config.loader import EnvConfig
@@ -0,0 +1,130 @@
+"""
+Startup profiling: import cost of each module on the cold-start path of each function.
+
+Each function is measured in a fresh interpreter with `python -X importtime`, importing
+main.py and then the route module its handler imports on the first request.
+
+    cd functions && python -m infrastructure.config.import_profile --budget-ms 1500
+
+Exits non-zero when any function's total import time exceeds the budget.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+
+# Cloud Function name -> module imported lazily by its handler in main.py (one entry per
+# function main.py exports; keep in step when adding a function).
+FUNCTION_ENTRY_MODULES: dict[str, str] = {
+    "inspection_sessions": "api.routes.inspection_sessions",
+    "inspection_next": "api.routes.inspection_next",
+    "inspection_evidence": "api.routes.inspection_evidence",
+    "inspection_record": "api.routes.inspection_record",
+    "inspection_collaboration": "api.routes.inspection_collaboration",
+    "inspection_sync": "api.routes.inspection_sync",
+    "inspection_events": "api.routes.inspection_events",
+    "evidence_derivatives": "infrastructure.media.derivatives",
+    "analytics_export": "infrastructure.analytics.parquet_export",
+    "inspection_api": "api.routes.router",
+}
+
+DEFAULT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", "1500"))
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    """One line of -X importtime output (microseconds)."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class FunctionProfile:
+    function: str
+    timings: list[ImportTiming]
+    error: str | None = None
+
+    @property
+    def total_ms(self) -> float:
+        """Sum of top-level cumulative times (modules imported directly by the entry script)."""
+        return sum(t.cumulative_us for t in self.timings if t.depth == 0) / 1000.0
+
+    def top(self, n: int = 15) -> list[ImportTiming]:
+        return sorted(self.timings, key=lambda t: t.cumulative_us, reverse=True)[:n]
+
+
+def parse_importtime(stderr: str) -> list[ImportTiming]:
+    """Parse `import time: self [us] | cumulative | imported package` lines."""
+    timings: list[ImportTiming] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        name = parts[2].rstrip()
+        stripped = name.lstrip(" ")
+        # Nested imports are indented by two spaces per level after the separator's space.
+        depth = max(0, (len(name) - len(stripped) - 1) // 2)
+        timings.append(
+            ImportTiming(
+                module=stripped,
+                self_us=int(parts[0].strip()),
+                cumulative_us=int(parts[1].strip()),
+                depth=depth,
+            )
+        )
+    return timings
+
+
+def profile_function(function: str, functions_dir: str, include_main: bool = True) -> FunctionProfile:
+    """Import main (optionally) and the function's route module in a fresh interpreter."""
+    module = FUNCTION_ENTRY_MODULES[function]
+    code = f"import main; import {module}" if include_main else f"import {module}"
+    env = {**os.environ, "PREWARM_CLIENTS": ""}  # measure imports only, no client creation
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=functions_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    error = None
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed"
+    return FunctionProfile(function=function, timings=parse_importtime(proc.stderr), error=error)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15, help="modules to list per function")
+    parser.add_argument("--skip-main", action="store_true", help="profile route modules only")
+    parser.add_argument("functions", nargs="*", default=list(FUNCTION_ENTRY_MODULES))
+    args = parser.parse_args(argv)
+
+    functions_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    over_budget = False
+    for function in args.functions:
+        profile = profile_function(function, functions_dir, include_main=not args.skip_main)
+        status = "OK"
+        if profile.error:
+            status = f"ERROR ({profile.error})"
+            over_budget = True
+        elif profile.total_ms > args.budget_ms:
+            status = "OVER BUDGET"
+            over_budget = True
+        print(f"{function}: {profile.total_ms:.1f} ms (budget {args.budget_ms:.0f} ms) {status}")
+        for t in profile.top(args.top):
+            print(f"  {t.cumulative_us / 1000.0:8.1f} ms  {t.self_us / 1000.0:7.1f} ms self  {t.module}")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,6 +23,25 @@ class EnvConfig:
     evidence_max_count_per_observation: int
     step_libraries_enabled: list[str]
     extra: dict[str, Any] = field(default_factory=dict)
+    session_cache_max_entries: int = 512
+    session_cache_ttl_seconds: float = 10.0
+    llm_model: str = "gpt-4o-mini"
+    llm_timeout_seconds: float = 8.0
+    llm_max_concurrency: int = 8
+    llm_max_retries: int = 2
+    plan_cache_max_entries: int = 256
+    plan_cache_ttl_seconds: float = 3600.0
+    plan_cache_shared: bool = False
+    step_library_dir: str | None = None
+    step_library_reload_seconds: float = 60.0
+    tenant_config_max_entries: int = 1024
+    tenant_config_ttl_seconds: float = 60.0
+    evidence_upload_url_ttl_seconds: float = 900.0
+    analytics_export_prefix: str = "analytics"
+    analytics_export_chunk_size: int = 5000
+    analytics_export_lag_seconds: float = 300.0
+    change_feed_max_seconds: float = 300.0
+    speculation_deadline_seconds: float = 2.0
 
     @classmethod
     def from_env(cls, env_name: str | None = None) -> "EnvConfig":
@@ -43,6 +62,25 @@ class EnvConfig:
                 os.environ.get("STEP_LIBRARIES_ENABLED", "default")
             ),
             extra={},
+            session_cache_max_entries=int(os.environ.get("SESSION_CACHE_MAX_ENTRIES", "512")),
+            session_cache_ttl_seconds=float(os.environ.get("SESSION_CACHE_TTL_SECONDS", "10")),
+            llm_model=os.environ.get("LLM_MODEL", "gpt-4o-mini"),
+            llm_timeout_seconds=float(os.environ.get("LLM_TIMEOUT_SECONDS", "8")),
+            llm_max_concurrency=int(os.environ.get("LLM_MAX_CONCURRENCY", "8")),
+            llm_max_retries=int(os.environ.get("LLM_MAX_RETRIES", "2")),
+            plan_cache_max_entries=int(os.environ.get("PLAN_CACHE_MAX_ENTRIES", "256")),
+            plan_cache_ttl_seconds=float(os.environ.get("PLAN_CACHE_TTL_SECONDS", "3600")),
+            plan_cache_shared=os.environ.get("PLAN_CACHE_SHARED", "").lower() in ("1", "true"),
+            step_library_dir=os.environ.get("STEP_LIBRARY_DIR"),
+            step_library_reload_seconds=float(os.environ.get("STEP_LIBRARY_RELOAD_SECONDS", "60")),
+            tenant_config_max_entries=int(os.environ.get("TENANT_CONFIG_MAX_ENTRIES", "1024")),
+            tenant_config_ttl_seconds=float(os.environ.get("TENANT_CONFIG_TTL_SECONDS", "60")),
+            evidence_upload_url_ttl_seconds=float(os.environ.get("EVIDENCE_UPLOAD_URL_TTL_SECONDS", "900")),
+            analytics_export_prefix=os.environ.get("ANALYTICS_EXPORT_PREFIX", "analytics").strip("/"),
+            analytics_export_chunk_size=int(os.environ.get("ANALYTICS_EXPORT_CHUNK_SIZE", "5000")),
+            analytics_export_lag_seconds=float(os.environ.get("ANALYTICS_EXPORT_LAG_SECONDS", "300")),
+            change_feed_max_seconds=float(os.environ.get("CHANGE_FEED_MAX_SECONDS", "300")),
+            speculation_deadline_seconds=float(os.environ.get("SPECULATION_DEADLINE_SECONDS", "2")),
         )
 
 
@@ -0,0 +1,79 @@
+"""
+Instance startup: lazy Firebase app initialization and controlled client pre-warming.
+Keeps heavy SDK imports (firebase_admin, Firestore, Storage, Auth) off the import path of main.py.
+"""
+from __future__ import annotations
+
+import os
+import threading
+
+from infrastructure.config.logging import get_logger
+
+_log = get_logger(__name__)
+
+_app_lock = threading.Lock()
+_app_initialized = False
+_prewarm_started = False
+
+# Clients warmed by default; override with PREWARM_CLIENTS (comma-separated, empty disables).
+DEFAULT_PREWARM_CLIENTS = "firestore,auth,step_libraries"
+
+
+def ensure_firebase_app() -> None:
+    """Initialize the default Firebase app on first use (idempotent, thread-safe)."""
+    global _app_initialized
+    if _app_initialized:
+        return
+    with _app_lock:
+        if _app_initialized:
+            return
+        import firebase_admin
+
+        try:
+            firebase_admin.get_app()
+        except ValueError:
+            firebase_admin.initialize_app()
+        _app_initialized = True
+
+
+def prewarm(clients: list[str]) -> None:
+    """Create shared clients now so the first request does not pay for them."""
+    for name in clients:
+        try:
+            if name == "firestore":
+                from infrastructure.persistence import firestore_client
+
+                firestore_client.get_firestore_client()
+            elif name == "storage":
+                from infrastructure.persistence import storage_client
+
+                storage_client.get_storage_bucket()
+            elif name == "auth":
+                from api.middleware.auth import prefetch_signing_keys
+
+                prefetch_signing_keys()
+            elif name == "step_libraries":
+                from ai.library.step_library import get_registry
+
+                get_registry().get()
+            else:
+                _log.warning("unknown prewarm client: %s", name)
+        except Exception:
+            _log.warning("prewarm of %s failed", name, exc_info=True)
+
+
+def start_prewarm() -> None:
+    """
+    Pre-warm configured clients in a background thread, once per instance.
+    Runs alongside the first request instead of blocking module import.
+    """
+    global _prewarm_started
+    if _prewarm_started or os.environ.get("FUNCTIONS_CONTROL_API") == "true":
+        # Already started, or firebase-tools is only loading main.py to discover functions.
+        return
+    _prewarm_started = True
+    value = os.environ.get("PREWARM_CLIENTS", DEFAULT_PREWARM_CLIENTS)
+    clients = [s.strip() for s in value.split(",") if s.strip()]
+    if not clients:
+        return
+    threading.Thread(target=prewarm, args=(clients,), name="prewarm", daemon=True).start()
@@ -0,0 +1,135 @@
+"""
+Per-tenant configuration (FR-007): env defaults with Firestore per-tenant overrides on top.
+
+Resolved configs are cached per tenant for TENANT_CONFIG_TTL_SECONDS, so the hot path is a
+dict lookup. Overrides are edited outside the API; every instance picks a change up within
+the TTL.
+The environment bounds what a tenant may allow: evidence types are intersected with the
+env's and limits are capped at the env's.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from infrastructure.cache.ttl_cache import CacheStats, TTLCache
+from infrastructure.config.factories import get_config
+from infrastructure.config.logging import get_logger
+
+_log = get_logger(__name__)
+
+# Failed override reads fall back to env defaults, retried after this long.
+_FAILURE_TTL_SECONDS = 5.0
+
+
+@dataclass(frozen=True)
+class TenantConfig:
+    """Resolved configuration for one tenant; version 0 means env defaults only."""
+
+    tenant_id: str
+    version: int
+    evidence_types: frozenset[str]
+    evidence_max_size_bytes: int
+    evidence_max_count_per_observation: int
+    step_libraries_enabled: tuple[str, ...]
+
+    def allows_evidence_type(self, evidence_type: str) -> bool:
+        return evidence_type in self.evidence_types
+
+
+_cache: TTLCache[str, TenantConfig] | None = None
+
+
+def _get_cache() -> TTLCache[str, TenantConfig]:
+    global _cache
+    if _cache is None:
+        config = get_config()
+        _cache = TTLCache(
+            max_entries=config.tenant_config_max_entries,
+            ttl_seconds=config.tenant_config_ttl_seconds,
+        )
+    return _cache
+
+
+def resolve(tenant_id: str, overrides: dict[str, Any] | None) -> TenantConfig:
+    """
+    Layer overrides (tenants/{tenantId}/config/inspection) on the env defaults.
+    A malformed override field is ignored (env default, with a warning), never an error.
+    """
+    env = get_config()
+    o = overrides or {}
+    types = frozenset(env.evidence_types)
+    override_types = _str_list(tenant_id, o, "evidenceTypes")
+    if override_types is not None:
+        types &= frozenset(override_types)
+    libraries = _str_list(tenant_id, o, "stepLibrariesEnabled")
+    return TenantConfig(
+        tenant_id=tenant_id,
+        version=_int(tenant_id, o, "version", 0),
+        evidence_types=types,
+        evidence_max_size_bytes=min(
+            _int(tenant_id, o, "evidenceMaxSizeBytes", env.evidence_max_size_bytes), env.evidence_max_size_bytes
+        ),
+        evidence_max_count_per_observation=min(
+            _int(tenant_id, o, "evidenceMaxCountPerObservation", env.evidence_max_count_per_observation),
+            env.evidence_max_count_per_observation,
+        ),
+        # An empty list is an override too: it disables step libraries for the tenant.
+        step_libraries_enabled=tuple(libraries if libraries is not None else env.step_libraries_enabled),
+    )
+
+
+def _int(tenant_id: str, o: dict[str, Any], key: str, default: int) -> int:
+    value = o.get(key)
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return _ignored(tenant_id, key, value, default)
+    try:
+        parsed = int(value)
+    except ValueError:
+        return _ignored(tenant_id, key, value, default)
+    return parsed if parsed >= 0 else _ignored(tenant_id, key, value, default)
+
+
+def _str_list(tenant_id: str, o: dict[str, Any], key: str) -> list[str] | None:
+    value = o.get(key)
+    if value is None:
+        return None
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        return _ignored(tenant_id, key, value, None)
+    return value
+
+
+def _ignored(tenant_id: str, key: str, value: Any, default):
+    _log.warning("tenant %s: ignoring malformed config override %s=%r", tenant_id, key, value)
+    return default
+
+
+def get_tenant_config(tenant_id: str) -> TenantConfig:
+    """Resolved config for tenant (cached for TENANT_CONFIG_TTL_SECONDS)."""
+    cache = _get_cache()
+    cached = cache.get(tenant_id)
+    if cached is not None:
+        return cached
+    from infrastructure.persistence import tenant_config_repository
+
+    try:
+        overrides = tenant_config_repository.load_overrides(tenant_id)
+    except Exception:
+        _log.warning("loading config overrides for tenant %s failed; using env defaults", tenant_id, exc_info=True)
+        resolved = cached or resolve(tenant_id, None)
+        cache.set(tenant_id, resolved, ttl_seconds=_FAILURE_TTL_SECONDS)
+        return resolved
+    resolved = resolve(tenant_id, overrides)
+    cache.set(tenant_id, resolved)
+    return resolved
+
+
+def cache_stats() -> CacheStats:
+    return _get_cache().stats()
+
+
+def clear_cache() -> None:
+    """Drop all resolved configs (for tests)."""
+    _get_cache().clear()
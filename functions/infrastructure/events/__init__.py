@@ -0,0 +1 @@
+# Session change feed (in-process observer fed by Firestore listeners)
@@ -0,0 +1,276 @@
+"""
+Session change feed (research.md decision #3): compact deltas for live session views.
+
+One SessionWatch per (tenant, session) per instance attaches Firestore snapshot listeners to
+the session document and its steps, observations, evidence, collaborators and contributions,
+turns document changes into FeedEvents and notifies its observers (one Subscription per open
+stream). All viewers of a session on an instance share one set of listeners.
+
+Event ids are Firestore times in microseconds times ID_SCALE, made strictly increasing per
+watch (one snapshot or commit can produce several events), so clients resume with Last-Event-ID:
+  - the watch keeps the last BUFFER_SIZE events and replays those newer than the id;
+  - a stream that starts a new watch also gets events for documents updated at or after the
+    id's time, derived from the listeners' initial snapshots (at-least-once: events from the
+    same microsecond may repeat, with the same payload);
+  - an id older than what the watch can account for yields one "resync" event, telling the
+    client to re-read the session once.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from infrastructure.config.logging import get_logger
+from infrastructure.persistence import firestore_client
+
+_log = get_logger(__name__)
+
+BUFFER_SIZE = 256
+ID_SCALE = 1000  # event ids per microsecond
+
+
+@dataclass(frozen=True)
+class FeedEvent:
+    id: int  # microseconds since the epoch (Firestore read or update time) * ID_SCALE + sequence
+    type: str
+    data: dict[str, Any]
+
+
+def to_micros(t: datetime) -> int:
+    t = t.astimezone(UTC) if t.tzinfo else t.replace(tzinfo=UTC)
+    return int(t.timestamp() * 1_000_000)
+
+
+def event_id(t: datetime) -> int:
+    """Smallest event id at time t."""
+    return to_micros(t) * ID_SCALE
+
+
+class Subscription:
+    """One observer: a queue of events for one open stream."""
+
+    def __init__(self, on_close: Callable[[Subscription], None]) -> None:
+        self.events: queue.Queue[FeedEvent] = queue.Queue()
+        self._on_close = on_close
+        self._closed = False
+
+    def notify(self, event: FeedEvent) -> None:
+        self.events.put(event)
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._on_close(self)
+
+
+# Compact projections per watched collection; only these fields are sent to clients.
+def _session_data(d: dict[str, Any]) -> dict[str, Any]:
+    p = d.get("progress") or {}
+    return {
+        "status": d.get("status"),
+        "progress": {k: p.get(k, 0) for k in ("total", "completed", "skipped", "pending")},
+        "currentStepId": p.get("currentStepId"),
+    }
+
+
+def change_events(
+    kind: str,
+    changes: list[tuple[str, str, dict[str, Any], datetime | None]],
+    read_time: datetime,
+    known_status: dict[str, str],
+    initial: bool,
+    since: int | None,
+) -> list[FeedEvent]:
+    """
+    FeedEvents for one listener callback. changes are (change type, doc id, data, update time).
+    known_status tracks step statuses, so only real status transitions become step events.
+    On the initial snapshot, events are produced only for documents updated at or after since's
+    microsecond. Ids are per-time bases; SessionWatch makes them unique.
+    """
+    events = []
+    read_id = event_id(read_time)
+    for change_type, doc_id, d, update_time in changes:
+        if kind == "steps":
+            previous = known_status.get(doc_id)
+            known_status[doc_id] = d.get("status")
+        if initial:
+            if since is None or update_time is None or to_micros(update_time) < since // ID_SCALE:
+                continue
+            eid = event_id(update_time)
+        else:
+            eid = read_id
+        if change_type == "REMOVED":
+            continue
+        if kind == "session":
+            events.append(FeedEvent(eid, "session_updated", _session_data(d)))
+        elif kind == "steps":
+            if change_type == "ADDED" and not initial:
+                events.append(FeedEvent(eid, "step_added", {
+                    "stepId": doc_id, "order": d.get("order"), "prompt": d.get("prompt"), "status": d.get("status"),
+                }))
+            elif initial or previous != d.get("status"):
+                events.append(FeedEvent(eid, "step_status_changed", {
+                    "stepId": doc_id, "status": d.get("status"), "previousStatus": None if initial else previous,
+                }))
+        elif change_type == "ADDED":
+            if kind == "observations":
+                events.append(FeedEvent(eid, "observation_added", {
+                    "observationId": doc_id, "stepId": d.get("stepId"),
+                    "priority": d.get("priority"), "createdBy": d.get("createdBy"),
+                }))
+            elif kind == "evidence":
+                events.append(FeedEvent(eid, "evidence_added", {
+                    "evidenceId": doc_id, "observationId": d.get("observationId"),
+                    "type": d.get("type"), "createdBy": d.get("createdBy"),
+                }))
+            elif kind == "collaborators":
+                events.append(FeedEvent(eid, "collaborator_joined", {"userId": doc_id, "via": d.get("via")}))
+            elif kind == "contributions":
+                events.append(FeedEvent(eid, "contribution_added", {
+                    "contributionId": doc_id, "type": d.get("type"), "createdBy": d.get("createdBy"),
+                    "stepId": d.get("linkedStepId"),
+                }))
+    return sorted(events, key=lambda e: e.id)
+
+
+class SessionWatch:
+    """Listeners for one session, shared by every local subscriber (the observed subject)."""
+
+    def __init__(self, tenant_id: str, session_id: str, since: int | None, first: Subscription | None = None) -> None:
+        self.key = (tenant_id, session_id)
+        self._lock = threading.Lock()
+        self._subscribers: set[Subscription] = set()
+        self._buffer: deque[FeedEvent] = deque(maxlen=BUFFER_SIZE)
+        self._floor: int | None = None  # ids at or after this are fully covered by the buffer
+        self._initial_since = since
+        self._first = first
+        self._initialized: set[str] = set()
+        self._known_status: dict[str, str] = {}
+        self._listeners: list = []
+        self._last_id = 0
+
+    def start(self) -> None:
+        session_ref = firestore_client.firestore_session_collection(self.key[0]).document(self.key[1])
+        client = firestore_client.get_firestore_client()
+        sources = {
+            "session": session_ref,
+            "steps": session_ref.collection("steps"),
+            "observations": session_ref.collection("observations"),
+            "evidence": session_ref.collection("evidence"),
+            "collaborators": session_ref.collection("collaborators"),
+            "contributions": client.collection_group("contributions")
+            .where("tenantId", "==", self.key[0])
+            .where("sessionId", "==", self.key[1])
+            .order_by("createdAt"),  # served by the record's contributions index
+        }
+        for kind, source in sources.items():
+            self._listeners.append(source.on_snapshot(self._callback(kind)))
+
+    def stop(self) -> None:
+        for listener in self._listeners:
+            listener.unsubscribe()
+        self._listeners = []
+
+    def _callback(self, kind: str):
+        def on_snapshot(_docs, changes, read_time) -> None:
+            rows = [
+                (c.type.name, c.document.id, c.document.to_dict() or {}, getattr(c.document, "update_time", None))
+                for c in changes
+            ]
+            try:
+                self.receive(kind, rows, read_time)
+            except Exception:
+                _log.exception("session feed %s/%s: %s snapshot failed", *self.key, kind)
+
+        return on_snapshot
+
+    def receive(self, kind: str, rows, read_time: datetime) -> None:
+        with self._lock:
+            initial = kind not in self._initialized
+            self._initialized.add(kind)
+            events = self._stamp(
+                change_events(kind, rows, read_time, self._known_status, initial, self._initial_since)
+            )
+            if initial:
+                self._floor = max(self._floor or 0, event_id(read_time))
+                # Catch-up events are for the stream that started the watch only.
+                for e in events:
+                    if self._first is not None:
+                        self._first.notify(e)
+                return
+            self._buffer.extend(events)
+            subscribers = list(self._subscribers)
+        for e in events:
+            for s in subscribers:
+                s.notify(e)
+
+    def _stamp(self, events: list[FeedEvent]) -> list[FeedEvent]:
+        """Give each event an id above every earlier one, so replay after an id is exact."""
+        out = []
+        for e in events:
+            self._last_id = max(e.id, self._last_id + 1)
+            out.append(FeedEvent(self._last_id, e.type, e.data))
+        return out
+
+    def attach(self, subscription: Subscription, since: int | None) -> None:
+        """Add an observer; replay buffered events after since, or ask it to resync."""
+        with self._lock:
+            self._subscribers.add(subscription)
+            if since is None or subscription is self._first:
+                return
+            oldest = self._buffer[0].id if len(self._buffer) == BUFFER_SIZE else self._floor
+            if oldest is None or since < oldest:
+                subscription.notify(FeedEvent(since, "resync", {}))
+                return
+            for e in self._buffer:
+                if e.id > since:
+                    subscription.notify(e)
+
+    def detach(self, subscription: Subscription) -> int:
+        with self._lock:
+            self._subscribers.discard(subscription)
+            if subscription is self._first:
+                self._first = None
+            return len(self._subscribers)
+
+
+_watches: dict[tuple[str, str], SessionWatch] = {}
+_watches_lock = threading.Lock()
+
+
+def subscribe(tenant_id: str, session_id: str, since: int | None = None) -> Subscription:
+    """Open a subscription to a session's changes; close() it when the stream ends."""
+    key = (tenant_id, session_id)
+
+    def on_close(sub: Subscription) -> None:
+        with _watches_lock:
+            watch = _watches.get(key)
+            if watch is not None and watch.detach(sub) == 0:
+                del _watches[key]
+                watch.stop()
+
+    subscription = Subscription(on_close)
+    with _watches_lock:
+        watch = _watches.get(key)
+        created = watch is None
+        if created:
+            watch = SessionWatch(tenant_id, session_id, since, first=subscription)
+            _watches[key] = watch
+        watch.attach(subscription, since)
+    if created:
+        try:
+            watch.start()
+        except Exception:
+            subscription.close()
+            raise
+    return subscription
+
+
+def active_watches() -> int:
+    with _watches_lock:
+        return len(_watches)
@@ -0,0 +1 @@
+# Image derivatives for photo evidence (thumbnails, previews)
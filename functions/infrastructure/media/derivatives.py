@@ -0,0 +1,116 @@
+"""
+Photo evidence derivatives: small WebP/JPEG renditions stored next to the original.
+
+A Storage finalize trigger (main.evidence_derivatives) calls process_uploaded_object for every
+new object. Originals under tenants/{t}/sessions/{s}/evidence/{e}/ get a derivatives/ folder
+with one file per DERIVATIVE_SPECS entry; EXIF (GPS, maker notes, embedded thumbnails) is
+dropped after applying the orientation tag. Derivative paths are recorded on the Evidence
+document, or on its pending upload when the client has not finalized yet.
+Pillow is imported on first use so the HTTP functions never load it.
+"""
+from __future__ import annotations
+
+import io
+import re
+from dataclasses import dataclass
+
+from infrastructure.config.logging import get_logger
+from infrastructure.config.observability import record_metric
+
+_log = get_logger(__name__)
+
+# (name, longest edge in px, Pillow format)
+DERIVATIVE_SPECS: tuple[tuple[str, int, str], ...] = (
+    ("thumb", 320, "WEBP"),
+    ("preview", 1280, "WEBP"),
+    ("preview_jpeg", 1280, "JPEG"),  # for clients without WebP
+)
+DERIVATIVES_DIR = "derivatives"
+_CONTENT_TYPES = {"WEBP": "image/webp", "JPEG": "image/jpeg"}
+_EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg"}
+_QUALITY = 80
+# Refuse to decode images beyond this many pixels (decompression bombs).
+MAX_PIXELS = 64_000_000
+
+_ORIGINAL_PATH = re.compile(
+    r"^tenants/(?P<tenant>[^/]+)/sessions/(?P<session>[^/]+)/evidence/(?P<evidence>[^/]+)/(?P<file>[^/]+)$"
+)
+
+
+@dataclass(frozen=True)
+class Derivative:
+    name: str
+    fmt: str
+    content_type: str
+    data: bytes
+    width: int
+    height: int
+
+
+def parse_original_path(path: str) -> tuple[str, str, str] | None:
+    """(tenant_id, session_id, evidence_id) for an original evidence object; None otherwise."""
+    m = _ORIGINAL_PATH.match(path or "")
+    return (m["tenant"], m["session"], m["evidence"]) if m else None
+
+
+def derivative_path(original_path: str, name: str, fmt: str) -> str:
+    return f"{original_path.rsplit('/', 1)[0]}/{DERIVATIVES_DIR}/{name}.{_EXTENSIONS[fmt]}"
+
+
+def render_derivatives(data: bytes, specs=DERIVATIVE_SPECS) -> list[Derivative]:
+    """Decode once, then downscale largest-first so each step resizes the previous result."""
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(io.BytesIO(data)) as src:
+            # Image.open only reads the header; refuse oversized images before any pixel is decoded.
+            width, height = src.size
+            if width * height > MAX_PIXELS:
+                raise ValueError(f"image is {width}x{height}, over the {MAX_PIXELS}-pixel limit")
+            largest = max(size for _, size, _ in specs)
+            # JPEG: let the decoder scale by 1/2..1/8 instead of decoding full resolution.
+            src.draft("RGB", (largest, largest))
+            image = ImageOps.exif_transpose(src).convert("RGB")
+    except Image.DecompressionBombError as e:
+        raise ValueError(str(e)) from e
+    rendered: dict[str, Derivative] = {}
+    for name, size, fmt in sorted(specs, key=lambda s: -s[1]):
+        image.thumbnail((size, size), Image.Resampling.LANCZOS)
+        buf = io.BytesIO()
+        # No exif= argument: metadata is not carried into the derivative.
+        image.save(buf, format=fmt, quality=_QUALITY, optimize=fmt == "JPEG")
+        rendered[name] = Derivative(name, fmt, _CONTENT_TYPES[fmt], buf.getvalue(), image.width, image.height)
+    return [rendered[name] for name, _, _ in specs]
+
+
+def process_uploaded_object(path: str, content_type: str | None, size: int | None) -> dict | None:
+    """
+    Render and store derivatives for a newly uploaded photo; returns the recorded map
+    {name: {path, contentType, width, height}}. Derivatives, non-images and oversized
+    objects are skipped, so the trigger does not fire on its own output.
+    """
+    ids = parse_original_path(path)
+    if ids is None or not (content_type or "").startswith("image/"):
+        return None
+    tenant_id, session_id, evidence_id = ids
+
+    from infrastructure.config.tenant_config import get_tenant_config
+    from infrastructure.persistence import evidence_repository, storage_client
+
+    if size is not None and size > get_tenant_config(tenant_id).evidence_max_size_bytes:
+        return None  # finalize rejects and deletes it
+    try:
+        rendered = render_derivatives(storage_client.download_object(path))
+    except (OSError, ValueError) as e:  # unreadable, unsupported or bomb-sized images
+        _log.warning("no derivatives for %s: %s", path, e)
+        record_metric("evidence.derivatives.failed")
+        return None
+
+    recorded = {}
+    for d in rendered:
+        target = derivative_path(path, d.name, d.fmt)
+        storage_client.upload_object(target, d.data, d.content_type, cache_control="private, max-age=31536000")
+        recorded[d.name] = {"path": target, "contentType": d.content_type, "width": d.width, "height": d.height}
+    evidence_repository.record_derivatives(tenant_id, session_id, evidence_id, recorded)
+    record_metric("evidence.derivatives.generated", float(len(recorded)))
+    return recorded
@@ -0,0 +1,77 @@
+"""
+Reads for the analytics export: collection-group scans and export checkpoints.
+Checkpoint path: analytics_exports/{collection} = { createdAt, path, exportedRows, updatedAt }.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from infrastructure.persistence import firestore_client
+
+# Fields read from each session to label exported rows (projection; no plan or progress).
+SESSION_LABEL_FIELDS = ("target.type", "target.identifier", "status")
+
+
+def _checkpoint_ref(collection: str):
+    return firestore_client.get_firestore_client().collection("analytics_exports").document(collection)
+
+
+def load_checkpoint(collection: str) -> tuple[datetime, str] | None:
+    """(createdAt, document path) of the last exported document, or None before the first run."""
+    doc = _checkpoint_ref(collection).get()
+    if not doc.exists:
+        return None
+    d = doc.to_dict() or {}
+    return d["createdAt"], d["path"]
+
+
+def save_checkpoint(collection: str, created_at: datetime, path: str, rows: int) -> None:
+    from google.cloud import firestore
+
+    _checkpoint_ref(collection).set(
+        {
+            "createdAt": created_at,
+            "path": path,
+            "exportedRows": firestore.Increment(rows),
+            "updatedAt": datetime.utcnow(),
+        },
+        merge=True,
+    )
+
+
+def scan_collection_group(
+    collection: str,
+    after: tuple[datetime, str] | None,
+    until: datetime,
+    limit: int,
+) -> list[tuple[str, dict[str, Any]]]:
+    """
+    Next page of (document path, data) from every `collection` subcollection in the database,
+    ordered by (createdAt, path) and created before until. Uses the single-field
+    collection-group index on createdAt (firestore.indexes.json fieldOverrides).
+    """
+    client = firestore_client.get_firestore_client()
+    q = (
+        client.collection_group(collection)
+        .where("createdAt", "<", until)
+        .order_by("createdAt")
+        .order_by("__name__")
+    )
+    if after is not None:
+        q = q.start_after({"createdAt": after[0], "__name__": client.document(after[1])})
+    return [(doc.reference.path, doc.to_dict() or {}) for doc in q.limit(limit).stream()]
+
+
+def load_session_labels(keys: set[tuple[str, str]]) -> dict[tuple[str, str], dict[str, Any]]:
+    """Projected session fields for (tenant_id, session_id) keys, fetched in one batched read."""
+    if not keys:
+        return {}
+    client = firestore_client.get_firestore_client()
+    refs = [firestore_client.firestore_session_collection(t).document(s) for t, s in sorted(keys)]
+    out: dict[tuple[str, str], dict[str, Any]] = {}
+    for snap in client.get_all(refs, field_paths=list(SESSION_LABEL_FIELDS)):
+        if snap.exists:
+            parts = snap.reference.path.split("/")
+            out[(parts[1], parts[3])] = snap.to_dict() or {}
+    return out
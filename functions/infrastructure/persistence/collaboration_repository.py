@@ -0,0 +1,149 @@
+"""
+Collaboration persistence (FR-010, FR-011): share links, collaborators and contributions.
+
+Paths:
+  tenants/{tenantId}/share_links/{sha256(token)}      { sessionId, createdBy, createdAt, expiresAt, revoked }
+  .../inspection_sessions/{sessionId}/collaborators/{userId}                  { via, grantedAt }
+  .../inspection_sessions/{sessionId}/collaborators/{userId}/contributions/{contributionId}
+
+Every collaborator appends to their own contributions subcollection with create() and ids that
+sort by time, so concurrent collaborators never write the same document (nor the session
+document) and a retried write cannot overwrite. Readers merge all collaborators with one
+collection-group query ordered by createdAt.
+"""
+from __future__ import annotations
+
+import hashlib
+import secrets
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from infrastructure.persistence import firestore_client
+from infrastructure.persistence.unit_of_work import UnitOfWork
+from model.entities.collaboration import Contribution, ContributionType
+
+
+def _contribution_to_dict(c: Contribution, tenant_id: str) -> dict[str, Any]:
+    return {
+        "id": c.id,
+        "tenantId": tenant_id,  # collection-group reads filter on tenant and session
+        "sessionId": c.session_id,
+        "type": c.type.value,
+        "content": c.content,
+        "createdAt": c.created_at,
+        "createdBy": c.created_by,
+        "linkedStepId": c.linked_step_id,
+        "resolvedAt": c.resolved_at,
+    }
+
+
+def _dict_to_contribution(d: dict[str, Any]) -> Contribution:
+    return Contribution(
+        id=d["id"],
+        session_id=d["sessionId"],
+        type=ContributionType(d.get("type", "comment")),
+        content=d.get("content"),
+        created_at=d.get("createdAt") or datetime.utcnow(),
+        created_by=d["createdBy"],
+        linked_step_id=d.get("linkedStepId"),
+        resolved_at=d.get("resolvedAt"),
+    )
+
+
+def new_contribution_id(created_at: datetime) -> str:
+    """Id that sorts by creation time within a collaborator's subcollection."""
+    millis = int(created_at.replace(tzinfo=UTC).timestamp() * 1000)
+    return f"{millis:013d}-{uuid.uuid4().hex[:8]}"
+
+
+def _collaborators(tenant_id: str, session_id: str):
+    return (
+        firestore_client.firestore_session_collection(tenant_id)
+        .document(session_id)
+        .collection("collaborators")
+    )
+
+
+def _share_links(tenant_id: str):
+    client = firestore_client.get_firestore_client()
+    return client.collection("tenants").document(tenant_id).collection("share_links")
+
+
+def _token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def create_share_link(tenant_id: str, session_id: str, created_by: str, ttl: timedelta) -> tuple[str, datetime]:
+    """Issue a link token; only its hash is stored. Returns (token, expiresAt)."""
+    token = secrets.token_urlsafe(24)
+    now = datetime.utcnow()
+    expires_at = now + ttl
+    _share_links(tenant_id).document(_token_hash(token)).create(
+        {"sessionId": session_id, "createdBy": created_by, "createdAt": now, "expiresAt": expires_at, "revoked": False}
+    )
+    return token, expires_at
+
+
+def revoke_share_links(tenant_id: str, session_id: str) -> int:
+    """Revoke every active link for the session; returns how many were revoked."""
+    docs = list(
+        _share_links(tenant_id).where("sessionId", "==", session_id).where("revoked", "==", False).stream()
+    )
+    if docs:
+        with UnitOfWork() as uow:
+            for doc in docs:
+                uow.update(doc.reference, {"revoked": True})
+    return len(docs)
+
+
+def resolve_share_link(tenant_id: str, token: str) -> str | None:
+    """Session id the token grants access to, or None if unknown, revoked or expired."""
+    doc = _share_links(tenant_id).document(_token_hash(token)).get()
+    if not doc.exists:
+        return None
+    d = doc.to_dict() or {}
+    expires_at = d.get("expiresAt")
+    if d.get("revoked") or expires_at is None:
+        return None
+    if expires_at.tzinfo is not None:
+        expires_at = expires_at.astimezone(UTC).replace(tzinfo=None)
+    return d.get("sessionId") if expires_at > datetime.utcnow() else None
+
+
+def add_collaborators(tenant_id: str, session_id: str, user_ids: list[str], via: str) -> None:
+    """Grant session access to user_ids (idempotent; via is "participant" or "link")."""
+    if not user_ids:
+        return
+    now = datetime.utcnow()
+    with UnitOfWork() as uow:
+        for user_id in user_ids:
+            uow.set(_collaborators(tenant_id, session_id).document(user_id), {"via": via, "grantedAt": now}, merge=True)
+
+
+def is_collaborator(tenant_id: str, session_id: str, user_id: str) -> bool:
+    return _collaborators(tenant_id, session_id).document(user_id).get().exists
+
+
+def append_contribution(tenant_id: str, contribution: Contribution) -> None:
+    """Create the contribution in the author's own subcollection (fails if the id exists)."""
+    ref = (
+        _collaborators(tenant_id, contribution.session_id)
+        .document(contribution.created_by)
+        .collection("contributions")
+        .document(contribution.id)
+    )
+    ref.create(_contribution_to_dict(contribution, tenant_id))
+
+
+def load_contributions_for_session(tenant_id: str, session_id: str) -> list[Contribution]:
+    """All collaborators' contributions in createdAt order (one collection-group query)."""
+    client = firestore_client.get_firestore_client()
+    docs = (
+        client.collection_group("contributions")
+        .where("tenantId", "==", tenant_id)
+        .where("sessionId", "==", session_id)
+        .order_by("createdAt")
+        .stream()
+    )
+    return [_dict_to_contribution(doc.to_dict() | {"id": doc.id}) for doc in docs]
@@ -1,8 +1,16 @@
 """
 Evidence persistence and Storage upload path (T024).
+
+Quotas (FR-007) are enforced with counter documents in evidence_counters, written in the same
+transaction as the evidence. The per-observation limit is split across
+OBSERVATION_COUNTER_SHARDS shards, each allowed its share of the limit: a writer reads one shard
+(random start, moving on when it is full) and increments it, so the shares can never sum past
+the limit and collaborators uploading at once usually touch different documents. Per-session
+totals (count, bytes) are blind increments on a random shard.
 """
 from __future__ import annotations
 
+import random
 from datetime import datetime
 from typing import Any
 
@@ -20,6 +28,9 @@ def _evidence_to_dict(e: Evidence) -> dict[str, Any]:
         "payload": e.payload,
         "createdAt": e.created_at,
         "createdBy": e.created_by,
+        "contentType": e.content_type,
+        "sizeBytes": e.size_bytes,
+        "derivatives": e.derivatives,
     }
 
 
@@ -33,17 +44,170 @@ def _dict_to_evidence(d: dict[str, Any]) -> Evidence:
         payload=d.get("payload"),
         created_at=d.get("createdAt") or datetime.utcnow(),
         created_by=d["createdBy"],
+        content_type=d.get("contentType"),
+        size_bytes=d.get("sizeBytes"),
+        derivatives=d.get("derivatives"),
+    )
+
+
+OBSERVATION_COUNTER_SHARDS = 4
+SESSION_COUNTER_SHARDS = 8
+
+
+class ObservationNotFoundError(LookupError):
+    """Evidence references an observation that does not exist in the session."""
+
+
+class EvidenceQuotaExceededError(Exception):
+    """The observation already holds its maximum number of evidence items."""
+
+
+def shard_capacity(limit: int, shard: int, shards: int = OBSERVATION_COUNTER_SHARDS) -> int:
+    """Share of limit owned by shard; the shares sum to exactly limit."""
+    return limit // shards + (1 if shard < limit % shards else 0)
+
+
+def _counters(tenant_id: str, session_id: str):
+    return (
+        firestore_client.firestore_session_collection(tenant_id)
+        .document(session_id)
+        .collection("evidence_counters")
+    )
+
+
+def _observation_shard_ref(tenant_id: str, session_id: str, observation_id: str, shard: int):
+    return _counters(tenant_id, session_id).document(f"obs_{observation_id}_{shard}")
+
+
+def _save_counted(tenant_id: str, session_id: str, evidence: Evidence, max_per_observation: int, extra=None) -> None:
+    from google.cloud import firestore
+
+    session_ref = firestore_client.firestore_session_collection(tenant_id).document(session_id)
+    evidence_ref = session_ref.collection("evidence").document(evidence.id)
+    obs_ref = session_ref.collection("observations").document(evidence.observation_id)
+    start = random.randrange(OBSERVATION_COUNTER_SHARDS)
+    session_shard = _counters(tenant_id, session_id).document(
+        f"session_{random.randrange(SESSION_COUNTER_SHARDS)}"
+    )
+
+    @firestore.transactional
+    def _save(transaction) -> None:
+        if evidence_ref.get(transaction=transaction).exists:
+            return  # retried finalize: already counted
+        if not obs_ref.get(transaction=transaction).exists:
+            raise ObservationNotFoundError(evidence.observation_id)
+        for i in range(OBSERVATION_COUNTER_SHARDS):
+            shard = (start + i) % OBSERVATION_COUNTER_SHARDS
+            ref = _observation_shard_ref(tenant_id, session_id, evidence.observation_id, shard)
+            snap = ref.get(transaction=transaction)
+            count = int((snap.to_dict() or {}).get("count", 0)) if snap.exists else 0
+            if count < shard_capacity(max_per_observation, shard):
+                break
+        else:
+            raise EvidenceQuotaExceededError(evidence.observation_id)
+        transaction.set(evidence_ref, _evidence_to_dict(evidence))
+        transaction.set(ref, {"observationId": evidence.observation_id, "count": count + 1})
+        transaction.set(
+            session_shard,
+            {"count": firestore.Increment(1), "bytes": firestore.Increment(evidence.size_bytes or 0)},
+            merge=True,
+        )
+        if extra is not None:
+            extra(transaction)
+
+    _save(firestore_client.get_firestore_client().transaction())
+
+
+def save_evidence(tenant_id: str, session_id: str, evidence: Evidence, max_per_observation: int) -> None:
+    """
+    Persist evidence metadata in session subcollection, counted against the observation's quota.
+    Raises ObservationNotFoundError or EvidenceQuotaExceededError; nothing is written then.
+    """
+    _save_counted(tenant_id, session_id, evidence, max_per_observation)
+
+
+def observation_evidence_count(tenant_id: str, session_id: str, observation_id: str) -> int:
+    """Evidence items counted for the observation (one batched read of its shards)."""
+    client = firestore_client.get_firestore_client()
+    refs = [
+        _observation_shard_ref(tenant_id, session_id, observation_id, i)
+        for i in range(OBSERVATION_COUNTER_SHARDS)
+    ]
+    return sum(int((s.to_dict() or {}).get("count", 0)) for s in client.get_all(refs) if s.exists)
+
+
+def session_evidence_usage(tenant_id: str, session_id: str) -> tuple[int, int]:
+    """(count, bytes) of evidence recorded in the session, summed over its counter shards."""
+    client = firestore_client.get_firestore_client()
+    refs = [_counters(tenant_id, session_id).document(f"session_{i}") for i in range(SESSION_COUNTER_SHARDS)]
+    count = size = 0
+    for snap in client.get_all(refs):
+        if snap.exists:
+            d = snap.to_dict() or {}
+            count += int(d.get("count", 0))
+            size += int(d.get("bytes", 0))
+    return count, size
+
+
+def _uploads(tenant_id: str, session_id: str):
+    return (
+        firestore_client.firestore_session_collection(tenant_id)
+        .document(session_id)
+        .collection("evidence_uploads")
     )
 
 
-def save_evidence(tenant_id: str, session_id: str, evidence: Evidence) -> None:
-    """Persist evidence metadata in session subcollection."""
+def save_pending_upload(tenant_id: str, session_id: str, evidence_id: str, upload: dict[str, Any]) -> None:
+    """Record an initiated upload until it is finalized; expiresAt drives Firestore TTL cleanup."""
+    _uploads(tenant_id, session_id).document(evidence_id).set(upload)
+
+
+def load_pending_upload(tenant_id: str, session_id: str, evidence_id: str) -> dict[str, Any] | None:
+    doc = _uploads(tenant_id, session_id).document(evidence_id).get()
+    return doc.to_dict() if doc.exists else None
+
+
+def finalize_upload(tenant_id: str, session_id: str, evidence: Evidence, max_per_observation: int) -> None:
+    """Write the evidence metadata (counted, as save_evidence) and drop the pending upload atomically."""
+    upload_ref = _uploads(tenant_id, session_id).document(evidence.id)
+    _save_counted(tenant_id, session_id, evidence, max_per_observation, extra=lambda t: t.delete(upload_ref))
+
+
+def record_derivatives(
+    tenant_id: str, session_id: str, evidence_id: str, derivatives: dict[str, Any]
+) -> None:
+    """
+    Attach derivative paths to the Evidence document, or to its pending upload when the client
+    has not finalized yet (finalize copies them over). Both documents are read in one
+    transaction, so a concurrent finalize cannot drop them.
+    """
+    from google.cloud import firestore
+
+    session_ref = firestore_client.firestore_session_collection(tenant_id).document(session_id)
+    evidence_ref = session_ref.collection("evidence").document(evidence_id)
+    upload_ref = _uploads(tenant_id, session_id).document(evidence_id)
+
+    @firestore.transactional
+    def _record(transaction) -> None:
+        evidence_exists = evidence_ref.get(transaction=transaction).exists
+        upload_exists = upload_ref.get(transaction=transaction).exists
+        if evidence_exists:
+            transaction.update(evidence_ref, {"derivatives": derivatives})
+        elif upload_exists:
+            transaction.update(upload_ref, {"derivatives": derivatives})
+
+    _record(firestore_client.get_firestore_client().transaction())
+
+
+def load_evidence_for_session(tenant_id: str, session_id: str) -> list[Evidence]:
+    """Load all evidence metadata for a session in one query (for bulk record assembly)."""
     coll = (
         firestore_client.firestore_session_collection(tenant_id)
         .document(session_id)
         .collection("evidence")
     )
-    coll.document(evidence.id).set(_evidence_to_dict(evidence))
+    docs = coll.order_by("createdAt").stream()
+    return [_dict_to_evidence(doc.to_dict() | {"id": doc.id}) for doc in docs]
 
 
 def get_evidence_storage_path(tenant_id: str, session_id: str, evidence_id: str, filename: str) -> str:
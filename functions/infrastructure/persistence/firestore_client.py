@@ -4,6 +4,7 @@ Path: tenants/{tenantId}/inspection_sessions/...
 """
 from __future__ import annotations
 
+import threading
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -11,15 +12,21 @@ if TYPE_CHECKING:
     from google.cloud.firestore_v1 import AsyncClient
 
 _firestore_client: "Client | None" = None
+_lock = threading.Lock()
 
 
 def get_firestore_client() -> "Client":
-    """Return singleton Firestore client (lazy init)."""
+    """Return singleton Firestore client (lazy init; SDK imported on first use)."""
     global _firestore_client
     if _firestore_client is None:
-        from firebase_admin import firestore
+        with _lock:
+            if _firestore_client is None:
+                from firebase_admin import firestore
 
-        _firestore_client = firestore.client()
+                from infrastructure.config.startup import ensure_firebase_app
+
+                ensure_firebase_app()
+                _firestore_client = firestore.client()
     return _firestore_client
 
 
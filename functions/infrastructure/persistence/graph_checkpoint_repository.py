@@ -0,0 +1,170 @@
+"""
+Versioned checkpoints of the inspection graph's plan view: a snapshot plus append-only deltas.
+Paths: tenants/{tenantId}/inspection_sessions/{sessionId}/graph_snapshots/{version}
+       tenants/{tenantId}/inspection_sessions/{sessionId}/graph_deltas/{version}
+The session document's `graph` field ({"version", "snapshotVersion"}) points at the latest
+state. Each turn writes one small delta (changed statuses, appended steps, current pointer);
+every COMPACTION_INTERVAL versions the state is folded into a new snapshot and the old
+deltas are deleted, so rehydration reads one snapshot and a bounded number of deltas.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from infrastructure.persistence import firestore_client
+from model.entities.step import Step
+
+# Deltas between snapshots; bounds rehydration to 1 + COMPACTION_INTERVAL document reads.
+COMPACTION_INTERVAL = 16
+
+_UNFINISHED = ("pending", "in_progress")
+
+
+def step_entry(step: Step) -> dict[str, Any]:
+    """The fields of a step the graph works on (its plan view)."""
+    return {
+        "id": step.id,
+        "order": step.order,
+        "type": step.type,
+        "prompt": step.prompt,
+        "status": step.status.value,
+        "source": step.source.value,
+    }
+
+
+@dataclass
+class GraphCheckpoint:
+    """Rehydrated graph state at `version`: plan view by step id and the current step."""
+
+    version: int
+    snapshot_version: int
+    steps: dict[str, dict[str, Any]]
+    current_step_id: str | None
+
+    @classmethod
+    def from_steps(cls, steps: list[Step]) -> GraphCheckpoint:
+        entries = {s.id: step_entry(s) for s in steps}
+        checkpoint = cls(version=0, snapshot_version=0, steps=entries, current_step_id=None)
+        window = checkpoint.pending(1)
+        checkpoint.current_step_id = window[0]["id"] if window else None
+        return checkpoint
+
+    def pending(self, limit: int) -> list[dict[str, Any]]:
+        """First `limit` unfinished steps by (order, id), the same order as the steps query."""
+        unfinished = [s for s in self.steps.values() if s.get("status") in _UNFINISHED]
+        return sorted(unfinished, key=lambda s: (s.get("order", 0), s["id"]))[:limit]
+
+    def apply(self, delta: dict[str, Any]) -> None:
+        for step_id, changes in (delta.get("steps") or {}).items():
+            self.steps[step_id] = {**self.steps.get(step_id, {"id": step_id}), **changes}
+        if "currentStepId" in delta:
+            self.current_step_id = delta["currentStepId"]
+        self.version = delta["version"]
+
+    def meta(self) -> dict[str, int]:
+        return {"version": self.version, "snapshotVersion": self.snapshot_version}
+
+
+def _doc_id(version: int) -> str:
+    # Zero-padded so document ids sort like versions.
+    return f"{version:010d}"
+
+
+def _session_ref(tenant_id: str, session_id: str):
+    return firestore_client.firestore_session_collection(tenant_id).document(session_id)
+
+
+def _snapshot_ref(tenant_id: str, session_id: str, version: int):
+    return _session_ref(tenant_id, session_id).collection("graph_snapshots").document(_doc_id(version))
+
+
+def _delta_ref(tenant_id: str, session_id: str, version: int):
+    return _session_ref(tenant_id, session_id).collection("graph_deltas").document(_doc_id(version))
+
+
+def _snapshot_dict(c: GraphCheckpoint) -> dict[str, Any]:
+    return {
+        "version": c.version,
+        "steps": c.steps,
+        "currentStepId": c.current_step_id,
+        "createdAt": datetime.utcnow(),
+    }
+
+
+def load_checkpoint(
+    tenant_id: str, session_id: str, meta: dict[str, Any] | None, transaction=None
+) -> GraphCheckpoint | None:
+    """
+    Rehydrate from the snapshot named in meta (the session's `graph` field) plus the deltas
+    after it. None for sessions without checkpoints. Pass transaction to read inside one.
+    """
+    if not meta:
+        return None
+    snapshot_version = int(meta.get("snapshotVersion", 0))
+    snap = _snapshot_ref(tenant_id, session_id, snapshot_version).get(transaction=transaction)
+    if not snap.exists:
+        return None
+    d = snap.to_dict() or {}
+    checkpoint = GraphCheckpoint(
+        version=snapshot_version,
+        snapshot_version=snapshot_version,
+        steps=d.get("steps") or {},
+        current_step_id=d.get("currentStepId"),
+    )
+    deltas = (
+        _session_ref(tenant_id, session_id)
+        .collection("graph_deltas")
+        .where("version", ">", snapshot_version)
+        .order_by("version")
+        .stream(transaction=transaction)
+    )
+    for doc in deltas:
+        checkpoint.apply(doc.to_dict())
+    return checkpoint
+
+
+def stage_snapshot(writer, tenant_id: str, session_id: str, checkpoint: GraphCheckpoint) -> dict[str, Any]:
+    """
+    Stage a snapshot of checkpoint (e.g. the initial plan) in writer (UnitOfWork or
+    transaction). Returns the session fields to write with it.
+    """
+    writer.set(_snapshot_ref(tenant_id, session_id, checkpoint.version), _snapshot_dict(checkpoint))
+    return {"graph": checkpoint.meta()}
+
+
+def stage_delta(
+    writer,
+    tenant_id: str,
+    session_id: str,
+    checkpoint: GraphCheckpoint,
+    changes: dict[str, dict[str, Any]],
+    current_step_id: str | None,
+) -> dict[str, Any]:
+    """
+    Stage the next version in writer (UnitOfWork or transaction) and apply it to checkpoint.
+    changes maps step id to changed fields (full entries for appended steps). The version's
+    document is created, never overwritten, so two writers racing from the same version
+    cannot both commit. Compacts when due. Returns the session fields to write with it.
+    """
+    version = checkpoint.version + 1
+    delta = {
+        "version": version,
+        "steps": changes,
+        "currentStepId": current_step_id,
+        "createdAt": datetime.utcnow(),
+    }
+    previous_snapshot = checkpoint.snapshot_version
+    checkpoint.apply(delta)
+    if version - previous_snapshot < COMPACTION_INTERVAL:
+        writer.create(_delta_ref(tenant_id, session_id, version), delta)
+        return {"graph": checkpoint.meta()}
+
+    # Compaction: this version is written as a snapshot instead of a delta.
+    checkpoint.snapshot_version = version
+    writer.create(_snapshot_ref(tenant_id, session_id, version), _snapshot_dict(checkpoint))
+    writer.delete(_snapshot_ref(tenant_id, session_id, previous_snapshot))
+    for v in range(previous_snapshot + 1, version):
+        writer.delete(_delta_ref(tenant_id, session_id, v))
+    return {"graph": checkpoint.meta()}
@@ -10,7 +10,8 @@ from infrastructure.persistence import firestore_client
 from model.entities.observation import Observation, ObservationPriority
 
 
-def _obs_to_dict(o: Observation) -> dict[str, Any]:
+def observation_to_dict(o: Observation) -> dict[str, Any]:
+    """Firestore document for an observation (also written by advance and offline sync)."""
     return {
         "id": o.id,
         "sessionId": o.session_id,
@@ -43,7 +44,7 @@ def save_observation(tenant_id: str, session_id: str, obs: Observation) -> None:
         .document(session_id)
         .collection("observations")
     )
-    coll.document(obs.id).set(_obs_to_dict(obs))
+    coll.document(obs.id).set(observation_to_dict(obs))
 
 
 def load_observations_for_step(tenant_id: str, session_id: str, step_id: str) -> list[Observation]:
@@ -55,3 +56,14 @@ def load_observations_for_step(tenant_id: str, session_id: str, step_id: str) ->
     )
     docs = coll.where("stepId", "==", step_id).stream()
     return [_dict_to_observation(doc.to_dict() | {"id": doc.id}) for doc in docs]
+
+
+def load_observations_for_session(tenant_id: str, session_id: str) -> list[Observation]:
+    """Load all observations for a session in one query (for bulk record assembly)."""
+    coll = (
+        firestore_client.firestore_session_collection(tenant_id)
+        .document(session_id)
+        .collection("observations")
+    )
+    docs = coll.order_by("createdAt").stream()
+    return [_dict_to_observation(doc.to_dict() | {"id": doc.id}) for doc in docs]
@@ -0,0 +1,47 @@
+"""
+Shared (cross-instance) tier of the initial plan cache.
+Path: tenants/{tenantId}/plan_cache/{key}; expiresAt is the field for a Firestore TTL policy.
+"""
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from infrastructure.persistence import firestore_client
+
+
+def _plan_cache_collection(tenant_id: str):
+    client = firestore_client.get_firestore_client()
+    return client.collection("tenants").document(tenant_id).collection("plan_cache")
+
+
+def load_plan(tenant_id: str, key: str) -> dict[str, Any] | None:
+    """Return {"steps": [...], "firstPrompt": str} or None if missing or expired."""
+    doc = _plan_cache_collection(tenant_id).document(key).get()
+    if not doc.exists:
+        return None
+    d = doc.to_dict() or {}
+    expires_at = d.get("expiresAt")
+    # TTL deletion is lazy (up to a day late); treat expired documents as misses.
+    if expires_at is not None:
+        if expires_at.tzinfo is not None:
+            expires_at = expires_at.astimezone(UTC).replace(tzinfo=None)
+        if expires_at <= datetime.utcnow():
+            return None
+    return {"steps": d.get("steps") or [], "firstPrompt": d.get("firstPrompt") or ""}
+
+
+def save_plan(
+    tenant_id: str,
+    key: str,
+    steps: list[dict[str, Any]],
+    first_prompt: str,
+    ttl_seconds: float,
+) -> None:
+    now = datetime.utcnow()
+    _plan_cache_collection(tenant_id).document(key).set({
+        "steps": steps,
+        "firstPrompt": first_prompt,
+        "createdAt": now,
+        "expiresAt": now + timedelta(seconds=ttl_seconds),
+    })
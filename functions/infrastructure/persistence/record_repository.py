@@ -0,0 +1,112 @@
+"""
+Inspection records: bulk-load record sources and persist materialized, versioned records.
+Path: tenants/{tenantId}/inspection_sessions/{sessionId}/records/{recordId}
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from infrastructure.persistence import (
+    collaboration_repository,
+    evidence_repository,
+    firestore_client,
+    observation_repository,
+    step_repository,
+)
+from infrastructure.persistence.unit_of_work import UnitOfWork
+from model.entities.collaboration import Contribution
+from model.entities.evidence import Evidence
+from model.entities.inspection_record import InspectionRecord
+from model.entities.observation import Observation
+from model.entities.step import Step
+
+# One worker per source query; shared by all requests on this instance.
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="record-sources")
+
+
+@dataclass
+class RecordSources:
+    """Everything needed to assemble an InspectionRecord, loaded in a fixed number of queries."""
+
+    steps: list[Step]
+    observations: list[Observation]
+    evidence: list[Evidence]
+    contributions: list[Contribution] = field(default_factory=list)  # createdAt order
+
+
+def load_record_sources(tenant_id: str, session_id: str) -> RecordSources:
+    """Load steps, observations, evidence and contributions for a session as four parallel queries."""
+    steps_f = _executor.submit(step_repository.load_steps, tenant_id, session_id)
+    obs_f = _executor.submit(
+        observation_repository.load_observations_for_session, tenant_id, session_id
+    )
+    evidence_f = _executor.submit(
+        evidence_repository.load_evidence_for_session, tenant_id, session_id
+    )
+    contributions_f = _executor.submit(
+        collaboration_repository.load_contributions_for_session, tenant_id, session_id
+    )
+    return RecordSources(
+        steps=steps_f.result(),
+        observations=obs_f.result(),
+        evidence=evidence_f.result(),
+        contributions=contributions_f.result(),
+    )
+
+
+def _record_to_dict(r: InspectionRecord) -> dict[str, Any]:
+    return {
+        "id": r.id,
+        "sessionId": r.session_id,
+        "tenantId": r.tenant_id,
+        "summary": r.summary,
+        "generatedAt": r.generated_at,
+        "version": r.version,
+    }
+
+
+def _dict_to_record(d: dict[str, Any]) -> InspectionRecord:
+    return InspectionRecord(
+        id=d["id"],
+        session_id=d["sessionId"],
+        tenant_id=d["tenantId"],
+        summary=d.get("summary") or {},
+        generated_at=d.get("generatedAt") or datetime.utcnow(),
+        version=d.get("version", 1),
+    )
+
+
+def _records_collection(tenant_id: str, session_id: str):
+    return (
+        firestore_client.firestore_session_collection(tenant_id)
+        .document(session_id)
+        .collection("records")
+    )
+
+
+def record_id_for(session_id: str, version: int) -> str:
+    """Document id of a materialized record version (records are immutable once written)."""
+    return f"record-{session_id}-v{version}"
+
+
+def save_record(tenant_id: str, record: InspectionRecord, uow: UnitOfWork | None = None) -> None:
+    """
+    Persist a materialized record version in the session's records subcollection
+    (staged in uow when given, so it commits together with the session's record_id link).
+    """
+    ref = _records_collection(tenant_id, record.session_id).document(record.id)
+    if uow is not None:
+        uow.set(ref, _record_to_dict(record))
+        return
+    ref.set(_record_to_dict(record))
+
+
+def load_record(tenant_id: str, session_id: str, record_id: str) -> InspectionRecord | None:
+    """Load a materialized record by id (single document read)."""
+    doc = _records_collection(tenant_id, session_id).document(record_id).get()
+    if not doc.exists:
+        return None
+    return _dict_to_record(doc.to_dict() | {"id": doc.id})
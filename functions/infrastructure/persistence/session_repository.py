@@ -3,17 +3,89 @@ Session repository: save/load by tenantId and sessionId using Firestore client.
 """
 from __future__ import annotations
 
+import copy
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
-from infrastructure.persistence import firestore_client
-from model.aggregates.inspection_session import InspectionSession, SessionStatus
+from infrastructure.cache.ttl_cache import CacheStats, TTLCache
+from infrastructure.persistence import (
+    firestore_client,
+    graph_checkpoint_repository,
+    observation_repository,
+    step_repository,
+)
+from infrastructure.persistence.graph_checkpoint_repository import GraphCheckpoint
+from infrastructure.persistence.unit_of_work import UnitOfWork
+from model.aggregates.inspection_session import InspectionSession, SessionProgress, SessionStatus
 from model.entities.intent import Intent
+from model.entities.observation import Observation
+from model.entities.step import Step, StepStatus
 from model.entities.target import Target
 
+# Read-through cache of session aggregates keyed by (tenantId, sessionId); see load/save.
+_cache: TTLCache[tuple[str, str], InspectionSession] | None = None
 
-def _session_to_dict(s: InspectionSession) -> dict[str, Any]:
+
+def _get_cache() -> TTLCache[tuple[str, str], InspectionSession]:
+    global _cache
+    if _cache is None:
+        from infrastructure.config.factories import build_config
+
+        config = build_config()
+        _cache = TTLCache(
+            max_entries=config.session_cache_max_entries,
+            ttl_seconds=config.session_cache_ttl_seconds,
+        )
+    return _cache
+
+
+def cache_stats() -> CacheStats:
+    """Hit/miss/eviction counters for the session cache on this instance."""
+    return _get_cache().stats()
+
+
+def clear_cache() -> None:
+    """Drop all cached sessions (for tests)."""
+    _get_cache().clear()
+
+
+def invalidate_cached(tenant_id: str, session_id: str) -> None:
+    """Drop one cached session (after writes that bypass save(), e.g. progress updates)."""
+    _get_cache().invalidate((tenant_id, session_id))
+
+
+def progress_to_dict(p: SessionProgress) -> dict[str, Any]:
     return {
+        "total": p.total,
+        "completed": p.completed,
+        "skipped": p.skipped,
+        "pending": p.pending,
+        "currentStepId": p.current_step_id,
+        "currentPrompt": p.current_prompt,
+        "currentStepType": p.current_step_type,
+        "currentOrder": p.current_order,
+    }
+
+
+def dict_to_progress(d: dict[str, Any] | None) -> SessionProgress | None:
+    if not d:
+        return None
+    return SessionProgress(
+        total=d.get("total", 0),
+        completed=d.get("completed", 0),
+        skipped=d.get("skipped", 0),
+        pending=d.get("pending", 0),
+        current_step_id=d.get("currentStepId"),
+        current_prompt=d.get("currentPrompt"),
+        current_step_type=d.get("currentStepType"),
+        current_order=d.get("currentOrder"),
+    )
+
+
+def _session_to_dict(s: InspectionSession, include_progress: bool = False) -> dict[str, Any]:
+    out: dict[str, Any] = {
         "id": s.id,
         "tenantId": s.tenant_id,
         "status": s.status.value,
@@ -33,6 +105,9 @@ def _session_to_dict(s: InspectionSession) -> dict[str, Any]:
         "completedAt": s.completed_at,
         "recordId": s.record_id,
     }
+    if include_progress and s.progress is not None:
+        out["progress"] = progress_to_dict(s.progress)
+    return out
 
 
 def _dict_to_session(d: dict[str, Any], session_id: str) -> InspectionSession:
@@ -59,22 +134,319 @@ def _dict_to_session(d: dict[str, Any], session_id: str) -> InspectionSession:
         created_by=d["createdBy"],
         completed_at=d.get("completedAt"),
         record_id=d.get("recordId"),
+        progress=dict_to_progress(d.get("progress")),
     )
 
 
-def save(session: InspectionSession) -> None:
-    """Persist session to Firestore."""
+def unit_of_work() -> UnitOfWork:
+    """
+    Start an atomic batch for a session and its subcollection documents, e.g.:
+
+        with session_repository.unit_of_work() as uow:
+            session_repository.save(session, uow=uow)
+            step_repository.save_step(tenant_id, session.id, step, uow=uow)
+    """
+    return UnitOfWork()
+
+
+def save(
+    session: InspectionSession,
+    uow: UnitOfWork | None = None,
+    include_progress: bool = False,
+    fields: dict[str, Any] | None = None,
+) -> None:
+    """
+    Persist session to Firestore (staged in uow when given). Invalidates the cached copy once
+    the write is durable (after uow commit), so a concurrent load cannot re-cache the old one.
+    Progress counters are maintained by step writes (step_repository.save_step, advance);
+    pass include_progress only when creating the session with its initial plan. Otherwise
+    the write is a merge that leaves the stored counters untouched. fields are extra document
+    fields written with the session (e.g. the graph checkpoint pointer).
+    """
     coll = firestore_client.firestore_session_collection(session.tenant_id)
     doc = coll.document(session.id)
-    doc.set(_session_to_dict(session))
+    data = _session_to_dict(session, include_progress=include_progress) | (fields or {})
+    if uow is not None:
+        uow.set(doc, data, merge=not include_progress)
+        uow.after_commit(lambda: invalidate_cached(session.tenant_id, session.id))
+        return
+    doc.set(data, merge=not include_progress)
+    invalidate_cached(session.tenant_id, session.id)
 
 
 def load(tenant_id: str, session_id: str) -> InspectionSession | None:
-    """Load session by tenant and session id."""
+    """
+    Load session by tenant and session id (read-through cache, bounded by TTL).
+    Returns a deep copy (progress included), so callers may mutate it before save().
+    """
+    cache = _get_cache()
+    key = (tenant_id, session_id)
+    cached = cache.get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
     coll = firestore_client.firestore_session_collection(tenant_id)
     doc = coll.document(session_id).get()
     if not doc.exists:
         return None
     data = doc.to_dict()
     data["id"] = doc.id
-    return _dict_to_session(data, doc.id)
+    session = _dict_to_session(data, doc.id)
+    cache.set(key, copy.deepcopy(session))
+    return session
+
+
+# Fields returned by list_sessions (server-side projection; no graph pointer, no constraints).
+SUMMARY_FIELDS = (
+    "status",
+    "intent.goal",
+    "target",
+    "createdAt",
+    "updatedAt",
+    "createdBy",
+    "completedAt",
+    "recordId",
+    "progress.total",
+    "progress.completed",
+    "progress.skipped",
+    "progress.pending",
+)
+
+
+@dataclass(frozen=True)
+class SessionQuery:
+    """
+    Filters for list_sessions. Each combination is served by the composite indexes in
+    firestore.indexes.json: equality fields first, then createdAt descending.
+    """
+
+    statuses: tuple[str, ...] = ()
+    created_by: str | None = None
+    target_type: str | None = None
+    target_identifier: str | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+
+
+def list_sessions(
+    tenant_id: str,
+    query: SessionQuery,
+    limit: int,
+    after: tuple[datetime, str] | None = None,
+) -> tuple[list[dict[str, Any]], bool]:
+    """
+    One page of session summaries, newest first (createdAt, then id, descending). after is the
+    (createdAt, id) of the last row of the previous page. Returns (rows, has_more); rows are
+    projected documents with "id" added.
+    """
+    q = firestore_client.firestore_session_collection(tenant_id).select(list(SUMMARY_FIELDS))
+    if len(query.statuses) == 1:
+        q = q.where("status", "==", query.statuses[0])
+    elif query.statuses:
+        q = q.where("status", "in", list(query.statuses))
+    if query.created_by:
+        q = q.where("createdBy", "==", query.created_by)
+    if query.target_type:
+        q = q.where("target.type", "==", query.target_type)
+    if query.target_identifier:
+        q = q.where("target.identifier", "==", query.target_identifier)
+    if query.created_after:
+        q = q.where("createdAt", ">=", query.created_after)
+    if query.created_before:
+        q = q.where("createdAt", "<", query.created_before)
+    q = q.order_by("createdAt", direction="DESCENDING").order_by("__name__", direction="DESCENDING")
+    if after is not None:
+        q = q.start_after({"createdAt": after[0], "__name__": after[1]})
+    docs = list(q.limit(limit + 1).stream())
+    rows = [(doc.to_dict() or {}) | {"id": doc.id} for doc in docs[:limit]]
+    return rows, len(docs) > limit
+
+
+@dataclass
+class AdvanceResult:
+    """
+    Outcome of advance(): the session, the step just completed, the step after it, and the
+    one after that (whose prompt can be prepared while next_step is answered). checkpoint is
+    the graph state after the turn (None for sessions created before checkpoints).
+    """
+
+    session: InspectionSession
+    completed_step: Step | None
+    next_step: Step | None
+    following_step: Step | None = None
+    checkpoint: GraphCheckpoint | None = None
+
+
+def advance(
+    tenant_id: str,
+    session_id: str,
+    make_observation: Callable[[Step], Observation],
+) -> AdvanceResult | None:
+    """
+    Record an answer for the current step and complete it in one transaction.
+    Reads the session and the first three unfinished steps (current, next, following), then
+    commits the observation, the step transition and a graph checkpoint delta together.
+    The window comes from the graph checkpoint (snapshot + bounded deltas) when the session
+    has one, else from the indexed steps query. make_observation builds the observation for
+    the current step (may be called again if the transaction retries).
+    Returns None if the session does not exist; completed_step is None if no step is pending.
+    """
+    from google.cloud import firestore
+
+    session_ref = firestore_client.firestore_session_collection(tenant_id).document(session_id)
+
+    @firestore.transactional
+    def _advance(transaction) -> AdvanceResult | None:
+        snap = session_ref.get(transaction=transaction)
+        if not snap.exists:
+            return None
+        data = snap.to_dict()
+        session = _dict_to_session(data | {"id": snap.id}, snap.id)
+        checkpoint = graph_checkpoint_repository.load_checkpoint(
+            tenant_id, session_id, data.get("graph"), transaction=transaction
+        )
+        if checkpoint is not None:
+            window = _checkpoint_window(session_ref, session_id, checkpoint, transaction)
+        else:
+            window = step_repository.load_pending_steps(
+                tenant_id, session_id, limit=3, transaction=transaction
+            )
+        if not window:
+            return AdvanceResult(session=session, completed_step=None, next_step=None, checkpoint=checkpoint)
+
+        current = window[0]
+        next_step = window[1] if len(window) > 1 else None
+        following_step = window[2] if len(window) > 2 else None
+        obs = make_observation(current)
+        previous_status = current.status
+        current.updated_at = datetime.utcnow()
+        object.__setattr__(current, "status", StepStatus.COMPLETED)
+        transaction.set(
+            session_ref.collection("observations").document(obs.id),
+            observation_repository.observation_to_dict(obs),
+        )
+        transaction.update(
+            session_ref.collection("steps").document(current.id),
+            {"status": current.status.value, "updatedAt": current.updated_at},
+        )
+        session_fields: dict[str, Any] = {}
+        if session.progress is not None:
+            session.progress.apply_status_change(previous_status, StepStatus.COMPLETED)
+            session.progress.point_to(next_step)
+            session_fields["progress"] = progress_to_dict(session.progress)
+        if checkpoint is not None:
+            session_fields |= graph_checkpoint_repository.stage_delta(
+                transaction,
+                tenant_id,
+                session_id,
+                checkpoint,
+                {current.id: {"status": current.status.value}},
+                next_step.id if next_step else None,
+            )
+        if session_fields:
+            transaction.update(session_ref, session_fields | {"updatedAt": current.updated_at})
+        return AdvanceResult(
+            session=session,
+            completed_step=current,
+            next_step=next_step,
+            following_step=following_step,
+            checkpoint=checkpoint,
+        )
+
+    result = _advance(firestore_client.get_firestore_client().transaction())
+    invalidate_cached(tenant_id, session_id)
+    return result
+
+
+def _checkpoint_window(session_ref, session_id: str, checkpoint: GraphCheckpoint, transaction) -> list[Step]:
+    """
+    The first three unfinished steps from the checkpoint. The next step's document is read
+    as well so its speculative prompt candidate (stored only on the step) comes along.
+    """
+    window = [
+        step_repository._dict_to_step(entry | {"sessionId": session_id})
+        for entry in checkpoint.pending(3)
+    ]
+    if len(window) > 1:
+        doc = session_ref.collection("steps").document(window[1].id).get(transaction=transaction)
+        if doc.exists:
+            window[1] = step_repository._dict_to_step(doc.to_dict() | {"id": doc.id})
+    return window
+
+
+def add_steps(
+    result: AdvanceResult,
+    tenant_id: str,
+    steps: list[Step],
+    renumber: tuple[int, int] | None = None,
+) -> None:
+    """
+    Persist steps the graph added after advance() in one transaction: the step documents,
+    the graph delta (appended steps and current pointer) and the session's progress.
+    The session and its checkpoint are re-read inside the transaction rather than taken from
+    result, so a /next or /sync that committed in between is built on, not overwritten (a
+    conflicting commit makes the transaction retry on fresh state). The current pointer is
+    the first unfinished step of that fresh state, added steps included.
+    renumber=(from_order, by) first moves every existing step at or after from_order up by
+    `by` (the graph ran out of room between two orders), in the same transaction.
+    """
+    from google.cloud import firestore
+
+    session_id = result.session.id
+    session_ref = firestore_client.firestore_session_collection(tenant_id).document(session_id)
+    steps_ref = session_ref.collection("steps")
+
+    @firestore.transactional
+    def _add(transaction) -> GraphCheckpoint | None:
+        snap = session_ref.get(transaction=transaction)
+        if not snap.exists:
+            return None
+        data = snap.to_dict()
+        session = _dict_to_session(data | {"id": snap.id}, snap.id)
+        checkpoint = graph_checkpoint_repository.load_checkpoint(
+            tenant_id, session_id, data.get("graph"), transaction=transaction
+        )
+        shifted: dict[str, dict[str, Any]] = {}
+        if renumber is not None:
+            from_order, by = renumber
+            if checkpoint is not None:
+                orders = {step_id: e.get("order", 0) for step_id, e in checkpoint.steps.items()}
+            else:
+                query = steps_ref.where("order", ">=", from_order).stream(transaction=transaction)
+                orders = {doc.id: doc.get("order") for doc in query}
+            shifted = {step_id: {"order": o + by} for step_id, o in orders.items() if o >= from_order}
+
+        for step_id, fields in shifted.items():
+            transaction.update(steps_ref.document(step_id), fields)
+        for step in steps:
+            step_repository.save_step(tenant_id, session_id, step, uow=transaction)
+        session_fields: dict[str, Any] = {}
+        current: Step | None = None
+        if checkpoint is not None:
+            changes = shifted | {s.id: graph_checkpoint_repository.step_entry(s) for s in steps}
+            merged = {step_id: {**checkpoint.steps.get(step_id, {}), **c} for step_id, c in changes.items()}
+            window = GraphCheckpoint(0, 0, checkpoint.steps | merged, None).pending(1)
+            current = step_repository._dict_to_step(window[0] | {"sessionId": session_id}) if window else None
+            session_fields = graph_checkpoint_repository.stage_delta(
+                transaction, tenant_id, session_id, checkpoint, changes, current.id if current else None
+            )
+        progress = session.progress
+        if progress is not None:
+            for step in steps:
+                progress.apply_status_change(None, step.status)
+            if checkpoint is not None:
+                progress.point_to(current)
+            else:
+                # Keep the re-read pointer (moved by the renumber) unless an added step precedes it.
+                if progress.current_step_id in shifted:
+                    progress.current_order = shifted[progress.current_step_id]["order"]
+                unfinished = [s for s in steps if s.status in (StepStatus.PENDING, StepStatus.IN_PROGRESS)]
+                first = min(unfinished, key=lambda s: s.order, default=None)
+                if first is not None and (progress.current_order is None or first.order < progress.current_order):
+                    progress.point_to(first)
+            session_fields["progress"] = progress_to_dict(progress)
+        transaction.update(session_ref, session_fields | {"updatedAt": datetime.utcnow()})
+        return checkpoint
+
+    result.checkpoint = _add(firestore_client.get_firestore_client().transaction())
+    invalidate_cached(tenant_id, session_id)
+
@@ -6,12 +6,33 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-from infrastructure.persistence import firestore_client
-from model.entities.step import Step, StepSource, StepStatus
+from infrastructure.persistence import firestore_client, graph_checkpoint_repository
+from infrastructure.persistence.unit_of_work import UnitOfWork
+from model.entities.step import PromptCandidate, Step, StepSource, StepStatus
 
 
-def _step_to_dict(s: Step) -> dict[str, Any]:
+def _candidate_to_dict(c: PromptCandidate) -> dict[str, Any]:
     return {
+        "text": c.text,
+        "afterStepId": c.after_step_id,
+        "basePrompt": c.base_prompt,
+        "createdAt": c.created_at,
+    }
+
+
+def _dict_to_candidate(d: dict[str, Any] | None) -> PromptCandidate | None:
+    if not d or not d.get("text"):
+        return None
+    return PromptCandidate(
+        text=d["text"],
+        after_step_id=d.get("afterStepId", ""),
+        base_prompt=d.get("basePrompt", ""),
+        created_at=d.get("createdAt") or datetime.utcnow(),
+    )
+
+
+def _step_to_dict(s: Step) -> dict[str, Any]:
+    d = {
         "id": s.id,
         "sessionId": s.session_id,
         "order": s.order,
@@ -23,6 +44,9 @@ def _step_to_dict(s: Step) -> dict[str, Any]:
         "updatedAt": s.updated_at,
         "source": s.source.value,
     }
+    if s.prompt_candidate is not None:
+        d["promptCandidate"] = _candidate_to_dict(s.prompt_candidate)
+    return d
 
 
 def _dict_to_step(d: dict[str, Any]) -> Step:
@@ -37,17 +61,102 @@ def _dict_to_step(d: dict[str, Any]) -> Step:
         created_at=d.get("createdAt") or datetime.utcnow(),
         updated_at=d.get("updatedAt") or datetime.utcnow(),
         source=StepSource(d.get("source", "initial")),
+        prompt_candidate=_dict_to_candidate(d.get("promptCandidate")),
     )
 
 
-def save_step(tenant_id: str, session_id: str, step: Step) -> None:
-    """Persist step in session subcollection."""
-    coll = (
+def save_step(tenant_id: str, session_id: str, step: Step, uow: UnitOfWork | None = None) -> None:
+    """
+    Persist step in session subcollection.
+    Standalone writes run in a transaction that also updates the session's progress counters
+    and current-step pointer, and records the step in a graph checkpoint delta when the
+    session has checkpoints (advance() reads its window from the checkpoint, so a status
+    change that bypassed it would be served as still pending). Writes staged in uow are plain
+    sets: the caller owns the counters and the checkpoint (e.g. create_session writes them
+    with the initial plan).
+    """
+    session_ref = firestore_client.firestore_session_collection(tenant_id).document(session_id)
+    step_ref = session_ref.collection("steps").document(step.id)
+    if uow is not None:
+        uow.set(step_ref, _step_to_dict(step))
+        return
+
+    from google.cloud import firestore
+
+    from infrastructure.persistence import session_repository
+
+    @firestore.transactional
+    def _save(transaction) -> None:
+        step_snap = step_ref.get(transaction=transaction)
+        session_snap = session_ref.get(transaction=transaction)
+        session_data = session_snap.to_dict() if session_snap.exists else {}
+        old_status = (
+            StepStatus(step_snap.to_dict().get("status", "pending")) if step_snap.exists else None
+        )
+        progress = (
+            session_repository.dict_to_progress(session_data.get("progress"))
+            if session_snap.exists
+            else None
+        )
+        checkpoint = graph_checkpoint_repository.load_checkpoint(
+            tenant_id, session_id, session_data.get("graph"), transaction=transaction
+        )
+        if progress is not None:
+            _update_progress(tenant_id, session_id, progress, step, old_status, transaction, checkpoint)
+        transaction.set(step_ref, _step_to_dict(step))
+        session_fields: dict[str, Any] = {}
+        if checkpoint is not None:
+            session_fields = graph_checkpoint_repository.stage_delta(
+                transaction,
+                tenant_id,
+                session_id,
+                checkpoint,
+                {step.id: graph_checkpoint_repository.step_entry(step)},
+                progress.current_step_id if progress is not None else checkpoint.current_step_id,
+            )
+        if progress is not None:
+            session_fields["progress"] = session_repository.progress_to_dict(progress)
+        if session_fields:
+            transaction.update(session_ref, session_fields | {"updatedAt": step.updated_at})
+
+    _save(firestore_client.get_firestore_client().transaction())
+    session_repository.invalidate_cached(tenant_id, session_id)
+
+
+def _update_progress(tenant_id, session_id, progress, step: Step, old_status, transaction, checkpoint=None) -> None:
+    """
+    Apply a step write to the session's counters and current-step pointer (in transaction).
+    The next unfinished step comes from the checkpoint when the session has one.
+    """
+    if old_status != step.status:
+        progress.apply_status_change(old_status, step.status)
+    unfinished = step.status in (StepStatus.PENDING, StepStatus.IN_PROGRESS)
+    if step.id == progress.current_step_id and not unfinished:
+        # Current step finished outside advance(): move the pointer to the next unfinished step.
+        if checkpoint is not None:
+            window = [_dict_to_step(e | {"sessionId": session_id}) for e in checkpoint.pending(2)]
+        else:
+            window = load_pending_steps(tenant_id, session_id, limit=2, transaction=transaction)
+        progress.point_to(next((s for s in window if s.id != step.id), None))
+    elif unfinished and (
+        progress.current_order is None
+        or step.id == progress.current_step_id
+        or step.order < progress.current_order
+    ):
+        progress.point_to(step)
+
+
+def save_prompt_candidate(
+    tenant_id: str, session_id: str, step_id: str, candidate: PromptCandidate
+) -> None:
+    """Attach a speculative prompt to a step (field update; no status or progress change)."""
+    step_ref = (
         firestore_client.firestore_session_collection(tenant_id)
         .document(session_id)
         .collection("steps")
+        .document(step_id)
     )
-    coll.document(step.id).set(_step_to_dict(step))
+    step_ref.update({"promptCandidate": _candidate_to_dict(candidate)})
 
 
 def load_steps(tenant_id: str, session_id: str) -> list[Step]:
@@ -59,3 +168,24 @@ def load_steps(tenant_id: str, session_id: str) -> list[Step]:
     )
     docs = coll.order_by("order").stream()
     return [_dict_to_step(doc.to_dict() | {"id": doc.id}) for doc in docs]
+
+
+def load_pending_steps(
+    tenant_id: str, session_id: str, limit: int = 1, transaction=None
+) -> list[Step]:
+    """
+    Load the first `limit` not-yet-finished steps by order (indexed query on status + order).
+    The first one is the current step. Pass transaction to read inside a Firestore transaction.
+    """
+    coll = (
+        firestore_client.firestore_session_collection(tenant_id)
+        .document(session_id)
+        .collection("steps")
+    )
+    query = (
+        coll.where("status", "in", [StepStatus.PENDING.value, StepStatus.IN_PROGRESS.value])
+        .order_by("order")
+        .limit(limit)
+    )
+    docs = query.stream(transaction=transaction)
+    return [_dict_to_step(doc.to_dict() | {"id": doc.id}) for doc in docs]
@@ -3,21 +3,31 @@ Cloud Storage client factory for evidence file paths (tenant- and session-scoped
 """
 from __future__ import annotations
 
+import contextlib
+import threading
+from datetime import timedelta
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from google.cloud.storage.bucket import Bucket
 
 _bucket: "Bucket | None" = None
+_signing_credentials = None
+_lock = threading.Lock()
 
 
 def get_storage_bucket() -> "Bucket":
-    """Return default Firebase Storage bucket (lazy init)."""
+    """Return default Firebase Storage bucket (lazy init; SDK imported on first use)."""
     global _bucket
     if _bucket is None:
-        from firebase_admin import storage
+        with _lock:
+            if _bucket is None:
+                from firebase_admin import storage
 
-        _bucket = storage.bucket()
+                from infrastructure.config.startup import ensure_firebase_app
+
+                ensure_firebase_app()
+                _bucket = storage.bucket()
     return _bucket
 
 
@@ -26,6 +36,71 @@ def evidence_storage_path(tenant_id: str, session_id: str, evidence_id: str, fil
     return f"tenants/{tenant_id}/sessions/{session_id}/evidence/{evidence_id}/{filename}"
 
 
+def signed_resumable_upload_url(path: str, content_type: str, expires_seconds: float) -> str:
+    """
+    V4 signed URL that starts a resumable upload of path: the client POSTs it with
+    `x-goog-resumable: start` and the same Content-Type, then PUTs the bytes to the returned
+    session URI. Bytes go straight to Cloud Storage, never through the function.
+    """
+    blob = get_storage_bucket().blob(path)
+    kwargs = {}
+    credentials = _get_signing_credentials()
+    if not hasattr(credentials, "sign_bytes"):
+        # Runtime (metadata server) credentials cannot sign locally; sign via IAM signBlob.
+        if not credentials.valid:
+            from google.auth.transport import requests as auth_requests
+
+            credentials.refresh(auth_requests.Request())
+        kwargs = {"service_account_email": credentials.service_account_email, "access_token": credentials.token}
+    else:
+        kwargs = {"credentials": credentials}
+    return blob.generate_signed_url(
+        version="v4",
+        expiration=timedelta(seconds=expires_seconds),
+        method="POST",
+        content_type=content_type,
+        headers={"x-goog-resumable": "start"},
+        **kwargs,
+    )
+
+
+def _get_signing_credentials():
+    """Application default credentials (lazy init; refreshed by the caller when expired)."""
+    global _signing_credentials
+    if _signing_credentials is None:
+        with _lock:
+            if _signing_credentials is None:
+                import google.auth
+
+                _signing_credentials, _ = google.auth.default(
+                    scopes=["https://www.googleapis.com/auth/cloud-platform"]
+                )
+    return _signing_credentials
+
+
+def get_object_metadata(path: str) -> tuple[int, str | None] | None:
+    """(size, contentType) of the object at path, or None if it does not exist (metadata only)."""
+    blob = get_storage_bucket().get_blob(path)
+    return (int(blob.size or 0), blob.content_type) if blob is not None else None
+
+
+def download_object(path: str) -> bytes:
+    return get_storage_bucket().blob(path).download_as_bytes()
+
+
+def upload_object(path: str, data: bytes, content_type: str, cache_control: str | None = None) -> None:
+    blob = get_storage_bucket().blob(path)
+    blob.cache_control = cache_control
+    blob.upload_from_string(data, content_type=content_type)
+
+
+def delete_object(path: str) -> None:
+    from google.api_core.exceptions import NotFound
+
+    with contextlib.suppress(NotFound):
+        get_storage_bucket().blob(path).delete()
+
+
 def set_storage_bucket(bucket: "Bucket | None") -> None:
     """Inject bucket (for tests)."""
     global _bucket
@@ -0,0 +1,275 @@
+"""
+Offline sync (FR-014): replay a client's queued answers and evidence idempotently.
+
+Path: tenants/{tenantId}/inspection_sessions/{sessionId}/sync_actions/{actionId}
+      { type, result, createdBy, appliedAt, expiresAt }
+
+Actions are applied in order, CHUNK_SIZE per transaction: one batched read (receipts, the
+referenced steps, observations, evidence and quota shards, the session and its plan view) and
+one commit of every write for the chunk. A receipt is written with each applied action, so a
+replayed action (retry after a lost response, or two devices syncing the same queue) returns
+its original result instead of writing again. Rejected actions get no receipt.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from infrastructure.persistence import (
+    evidence_repository,
+    firestore_client,
+    graph_checkpoint_repository,
+    observation_repository,
+    session_repository,
+    step_repository,
+)
+from model.entities.step import Step, StepStatus
+from model.entities.sync_action import SyncAction, SyncResult, SyncStatus
+
+# Actions per transaction; an evidence action stages at most four writes (evidence, quota
+# shard, session shard, receipt), which keeps a chunk plus its graph delta under 500 writes.
+CHUNK_SIZE = 100
+RECEIPT_TTL = timedelta(days=30)
+
+_UNFINISHED = (StepStatus.PENDING, StepStatus.IN_PROGRESS)
+
+
+@dataclass
+class ChunkState:
+    """What a chunk's actions reference, as read at the start of its transaction."""
+
+    receipts: dict[str, dict[str, Any]] = field(default_factory=dict)  # actionId -> stored result
+    steps: dict[str, Step] = field(default_factory=dict)
+    observations: set[str] = field(default_factory=set)
+    evidence: set[str] = field(default_factory=set)
+    shard_counts: dict[str, list[int]] = field(default_factory=dict)  # observationId -> per shard
+
+
+@dataclass
+class ChunkPlan:
+    results: list[SyncResult] = field(default_factory=list)
+    applied: list[tuple[SyncAction, SyncResult]] = field(default_factory=list)
+    completed: dict[str, StepStatus] = field(default_factory=dict)  # stepId -> previous status
+    shard_writes: dict[tuple[str, int], int] = field(default_factory=dict)  # (obs, shard) -> count
+    evidence_bytes: int = 0
+
+
+def plan_chunk(actions: list[SyncAction], state: ChunkState, max_per_observation: int) -> ChunkPlan:
+    """Decide each action's outcome in order; later actions see earlier ones' effects."""
+    plan = ChunkPlan()
+    seen: dict[str, SyncResult] = {}
+    for action in actions:
+        stored = state.receipts.get(action.action_id)
+        if stored is not None or action.action_id in seen:
+            original = seen.get(action.action_id) or _result_from_dict(action.action_id, stored)
+            plan.results.append(
+                SyncResult(action.action_id, SyncStatus.DUPLICATE, original.entity_id, original.step_completed)
+            )
+            continue
+        result = _plan_answer(action, state, plan) if action.observation else _plan_evidence(
+            action, state, plan, max_per_observation
+        )
+        if result.status == SyncStatus.APPLIED:
+            seen[action.action_id] = result
+            plan.applied.append((action, result))
+        plan.results.append(result)
+    return plan
+
+
+def _plan_answer(action: SyncAction, state: ChunkState, plan: ChunkPlan) -> SyncResult:
+    obs = action.observation
+    if obs.id in state.observations:
+        return SyncResult(action.action_id, SyncStatus.REJECTED, error="observation id already exists")
+    step = state.steps.get(obs.step_id)
+    if step is None:
+        return SyncResult(action.action_id, SyncStatus.REJECTED, error="step not found")
+    state.observations.add(obs.id)
+    # Answers for a step finished meanwhile (e.g. by a collaborator) are kept as observations.
+    completes = step.status in _UNFINISHED
+    if completes:
+        plan.completed[step.id] = step.status
+        object.__setattr__(step, "status", StepStatus.COMPLETED)
+    return SyncResult(action.action_id, SyncStatus.APPLIED, obs.id, step_completed=completes)
+
+
+def _plan_evidence(action: SyncAction, state: ChunkState, plan: ChunkPlan, max_per_observation: int) -> SyncResult:
+    evidence = action.evidence
+    if evidence.id in state.evidence:
+        return SyncResult(action.action_id, SyncStatus.REJECTED, error="evidence id already exists")
+    if evidence.observation_id not in state.observations:
+        return SyncResult(action.action_id, SyncStatus.REJECTED, error="observation not found")
+    counts = state.shard_counts.setdefault(
+        evidence.observation_id, [0] * evidence_repository.OBSERVATION_COUNTER_SHARDS
+    )
+    start = random.randrange(len(counts))
+    for i in range(len(counts)):
+        shard = (start + i) % len(counts)
+        if counts[shard] < evidence_repository.shard_capacity(max_per_observation, shard, len(counts)):
+            break
+    else:
+        return SyncResult(action.action_id, SyncStatus.REJECTED, error="evidence quota exceeded for observation")
+    counts[shard] += 1
+    state.evidence.add(evidence.id)
+    plan.shard_writes[(evidence.observation_id, shard)] = counts[shard]
+    plan.evidence_bytes += evidence.size_bytes or 0
+    return SyncResult(action.action_id, SyncStatus.APPLIED, evidence.id)
+
+
+def _result_to_dict(r: SyncResult) -> dict[str, Any]:
+    return {"id": r.entity_id, "stepCompleted": r.step_completed}
+
+
+def _result_from_dict(action_id: str, d: dict[str, Any]) -> SyncResult:
+    return SyncResult(action_id, SyncStatus.APPLIED, d.get("id"), d.get("stepCompleted"))
+
+
+def apply_actions(
+    tenant_id: str, session_id: str, user_id: str, actions: list[SyncAction], max_per_observation: int
+) -> list[SyncResult] | None:
+    """Apply actions in order, one transaction per chunk. None if the session does not exist."""
+    results: list[SyncResult] = []
+    for start in range(0, len(actions), CHUNK_SIZE):
+        chunk = _apply_chunk(tenant_id, session_id, user_id, actions[start : start + CHUNK_SIZE], max_per_observation)
+        if chunk is None:
+            return None
+        results.extend(chunk)
+    session_repository.invalidate_cached(tenant_id, session_id)
+    return results
+
+
+def _apply_chunk(
+    tenant_id: str, session_id: str, user_id: str, actions: list[SyncAction], max_per_observation: int
+) -> list[SyncResult] | None:
+    from google.cloud import firestore
+
+    client = firestore_client.get_firestore_client()
+    session_ref = firestore_client.firestore_session_collection(tenant_id).document(session_id)
+    receipts = session_ref.collection("sync_actions")
+    answers = [a.observation for a in actions if a.observation]
+    evidence = [a.evidence for a in actions if a.evidence]
+    observation_ids = {o.id for o in answers} | {e.observation_id for e in evidence}
+    refs = (
+        [receipts.document(a.action_id) for a in actions]
+        + [session_ref.collection("steps").document(o.step_id) for o in answers]
+        + [session_ref.collection("observations").document(i) for i in observation_ids]
+        + [session_ref.collection("evidence").document(e.id) for e in evidence]
+        + [
+            evidence_repository._observation_shard_ref(tenant_id, session_id, observation_id, shard)
+            for observation_id in {e.observation_id for e in evidence}
+            for shard in range(evidence_repository.OBSERVATION_COUNTER_SHARDS)
+        ]
+    )
+    refs = list({ref.path: ref for ref in refs}.values())  # one read per document
+
+    @firestore.transactional
+    def _apply(transaction) -> list[SyncResult] | None:
+        snap = session_ref.get(transaction=transaction)
+        if not snap.exists:
+            return None
+        data = snap.to_dict()
+        session = session_repository._dict_to_session(data | {"id": snap.id}, snap.id)
+        checkpoint = graph_checkpoint_repository.load_checkpoint(
+            tenant_id, session_id, data.get("graph"), transaction=transaction
+        )
+        state = _read_state(client.get_all(refs, transaction=transaction))
+        window = []
+        if checkpoint is None and answers:
+            window = step_repository.load_pending_steps(
+                tenant_id, session_id, limit=len(answers) + 1, transaction=transaction
+            )
+
+        plan = plan_chunk(actions, state, max_per_observation)
+        now = datetime.utcnow()
+        for action, result in plan.applied:
+            if action.observation:
+                ref = session_ref.collection("observations").document(action.observation.id)
+                transaction.create(ref, observation_repository.observation_to_dict(action.observation))
+            else:
+                ref = session_ref.collection("evidence").document(action.evidence.id)
+                transaction.create(ref, evidence_repository._evidence_to_dict(action.evidence))
+            transaction.create(receipts.document(action.action_id), {
+                "type": action.type,
+                "result": _result_to_dict(result),
+                "createdBy": user_id,
+                "appliedAt": now,
+                "expiresAt": now + RECEIPT_TTL,
+            })
+        for (observation_id, shard), count in plan.shard_writes.items():
+            transaction.set(
+                evidence_repository._observation_shard_ref(tenant_id, session_id, observation_id, shard),
+                {"observationId": observation_id, "count": count},
+            )
+        if plan.shard_writes:
+            transaction.set(
+                evidence_repository._counters(tenant_id, session_id).document(
+                    f"session_{random.randrange(evidence_repository.SESSION_COUNTER_SHARDS)}"
+                ),
+                {
+                    "count": firestore.Increment(sum(1 for a, _ in plan.applied if a.evidence)),
+                    "bytes": firestore.Increment(plan.evidence_bytes),
+                },
+                merge=True,
+            )
+        if plan.completed:
+            _stage_step_completions(transaction, tenant_id, session_ref, session, checkpoint, window, plan, now)
+        return plan.results
+
+    return _apply(client.transaction())
+
+
+def _read_state(snaps) -> ChunkState:
+    state = ChunkState()
+    for snap in snaps:
+        if not snap.exists:
+            continue
+        kind = snap.reference.parent.id
+        d = snap.to_dict() or {}
+        if kind == "sync_actions":
+            state.receipts[snap.id] = d.get("result") or {}
+        elif kind == "steps":
+            state.steps[snap.id] = step_repository._dict_to_step(d | {"id": snap.id})
+        elif kind == "observations":
+            state.observations.add(snap.id)
+        elif kind == "evidence":
+            state.evidence.add(snap.id)
+        elif kind == "evidence_counters":
+            observation_id, shard = d.get("observationId"), int(snap.id.rsplit("_", 1)[1])
+            counts = state.shard_counts.setdefault(
+                observation_id, [0] * evidence_repository.OBSERVATION_COUNTER_SHARDS
+            )
+            counts[shard] = int(d.get("count", 0))
+    return state
+
+
+def _stage_step_completions(transaction, tenant_id, session_ref, session, checkpoint, window, plan, now) -> None:
+    """Step transitions, progress counters, current pointer and plan-view delta for the chunk."""
+    for step_id in plan.completed:
+        transaction.update(
+            session_ref.collection("steps").document(step_id),
+            {"status": StepStatus.COMPLETED.value, "updatedAt": now},
+        )
+    if checkpoint is not None:
+        remaining = [e for e in checkpoint.pending(len(plan.completed) + 1) if e["id"] not in plan.completed]
+        upcoming = (
+            step_repository._dict_to_step(remaining[0] | {"sessionId": session.id}) if remaining else None
+        )
+    else:
+        upcoming = next((s for s in window if s.id not in plan.completed), None)
+    session_fields: dict[str, Any] = {}
+    if session.progress is not None:
+        for previous in plan.completed.values():
+            session.progress.apply_status_change(previous, StepStatus.COMPLETED)
+        session.progress.point_to(upcoming)
+        session_fields["progress"] = session_repository.progress_to_dict(session.progress)
+    if checkpoint is not None:
+        session_fields |= graph_checkpoint_repository.stage_delta(
+            transaction,
+            tenant_id,
+            session.id,
+            checkpoint,
+            {step_id: {"status": StepStatus.COMPLETED.value} for step_id in plan.completed},
+            upcoming.id if upcoming else None,
+        )
+    transaction.update(session_ref, session_fields | {"updatedAt": now})
@@ -0,0 +1,21 @@
+"""
+Per-tenant configuration overrides (FR-007).
+Path: tenants/{tenantId}/config/inspection (read-only here; edited by tenant admins).
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from infrastructure.persistence import firestore_client
+
+
+def _config_ref(tenant_id: str):
+    client = firestore_client.get_firestore_client()
+    return client.collection("tenants").document(tenant_id).collection("config").document("inspection")
+
+
+def load_overrides(tenant_id: str) -> dict[str, Any] | None:
+    """Return the override document (including `version`) or None if the tenant has none."""
+    doc = _config_ref(tenant_id).get()
+    return (doc.to_dict() or {}) if doc.exists else None
+
@@ -0,0 +1,75 @@
+"""
+Unit of work: collect repository writes and commit them atomically in one Firestore batch.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from infrastructure.persistence import firestore_client
+
+# Firestore rejects batches with more than 500 writes.
+MAX_BATCH_WRITES = 500
+
+
+class UnitOfWork:
+    """
+    Atomic batched write. Repositories accept `uow=` and stage writes here instead of
+    writing directly; nothing is persisted until commit(). Use as a context manager to
+    commit on success and discard on exception.
+    """
+
+    def __init__(self, client=None) -> None:
+        self._batch = (client or firestore_client.get_firestore_client()).batch()
+        self._writes = 0
+        self._committed = False
+        self._after_commit: list[Callable[[], None]] = []
+
+    def create(self, ref, data: dict[str, Any]) -> None:
+        """Stage a write that fails the whole commit if the document already exists."""
+        self._stage()
+        self._batch.create(ref, data)
+
+    def set(self, ref, data: dict[str, Any], merge: bool = False) -> None:
+        self._stage()
+        self._batch.set(ref, data, merge=merge)
+
+    def update(self, ref, data: dict[str, Any]) -> None:
+        self._stage()
+        self._batch.update(ref, data)
+
+    def delete(self, ref) -> None:
+        self._stage()
+        self._batch.delete(ref)
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run callback once the writes are committed (e.g. cache invalidation); not on discard."""
+        self._after_commit.append(callback)
+
+    @property
+    def write_count(self) -> int:
+        return self._writes
+
+    def commit(self) -> None:
+        """Commit all staged writes in one round trip (all or nothing)."""
+        if self._committed:
+            raise RuntimeError("unit of work already committed")
+        self._committed = True
+        if self._writes:
+            self._batch.commit()
+        for callback in self._after_commit:
+            callback()
+
+    def _stage(self) -> None:
+        if self._committed:
+            raise RuntimeError("unit of work already committed")
+        if self._writes >= MAX_BATCH_WRITES:
+            raise ValueError(f"unit of work exceeds {MAX_BATCH_WRITES} writes")
+        self._writes += 1
+
+    def __enter__(self) -> UnitOfWork:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None and not self._committed:
+            self.commit()
@@ -1,58 +1,122 @@
 # Cloud Functions for Firebase – Inspection API (multiple endpoints)
 # Deploy with `firebase deploy`
 # Clients call each function URL directly with path as in OpenAPI (e.g. /api/v1/tenants/{id}/inspection_sessions).
+# Set INSPECTION_SINGLE_ENTRYPOINT=true to also deploy inspection_api, which serves every endpoint
+# from one warm instance pool (shared caches and clients).
 
 import json
-from firebase_admin import initialize_app
-from firebase_functions import https_fn
-from firebase_functions.options import set_global_options
+import os
+
+from firebase_functions import https_fn, scheduler_fn, storage_fn
+from firebase_functions.options import MemoryOption, set_global_options
+
+from infrastructure.config.startup import start_prewarm
 
 set_global_options(max_instances=10)
-initialize_app()
 
+# firebase_admin is initialized lazily on first client use (infrastructure.config.startup);
+# shared clients are warmed in the background while the first request is handled.
+start_prewarm()
+
+
+def _response(body, status: int, headers: dict[str, str] | None = None) -> https_fn.Response:
+    """Build JSON (or streamed SSE) response from (body, status) or (body, status, headers) tuple."""
+    from api.routes.streaming import SSE_HEADERS, EventStream
 
-def _response(body, status: int) -> https_fn.Response:
-    """Build JSON response from (body, status) tuple."""
+    if isinstance(body, EventStream):
+        return https_fn.Response(
+            iter(body),
+            status=status,
+            mimetype="text/event-stream",
+            headers={**SSE_HEADERS, **(headers or {})},
+        )
+    if status == 304:
+        return https_fn.Response(status=304, headers=headers or {})
     return https_fn.Response(
         json.dumps(body) if body is not None else "{}",
         status=status,
-        headers={"Content-Type": "application/json"},
+        headers={"Content-Type": "application/json", **(headers or {})},
     )
 
 
 @https_fn.on_request()
 def inspection_sessions(req: https_fn.Request) -> https_fn.Response:
-    """Session lifecycle: POST create, GET session, POST complete."""
-    from api.routes.inspection_sessions import handle_sessions_request
+    """Session lifecycle: POST create, GET list, GET session, POST complete."""
+    from api.routes.router import API_ROUTES
 
-    body, status = handle_sessions_request(req)
-    if body is None and status == 404:
-        return https_fn.Response("Not found", status=404)
-    return _response(body, status)
+    return _response(*API_ROUTES.dispatch(req, module="api.routes.inspection_sessions"))
 
 
 @https_fn.on_request()
 def inspection_next(req: https_fn.Request) -> https_fn.Response:
     """Submit answer and get next prompt (POST .../next)."""
-    from api.routes.inspection_next import handle_next_request
+    from api.routes.router import API_ROUTES
 
-    body, status = handle_next_request(req)
-    return _response(body, status)
+    return _response(*API_ROUTES.dispatch(req, module="api.routes.inspection_next"))
 
 
 @https_fn.on_request()
 def inspection_evidence(req: https_fn.Request) -> https_fn.Response:
-    """Add evidence (POST .../evidence)."""
-    from api.routes.inspection_evidence import handle_evidence_request
+    """Evidence: POST add, POST .../evidence/uploads (signed upload URL), POST .../finalize."""
+    from api.routes.router import API_ROUTES
 
-    body, status = handle_evidence_request(req)
-    return _response(body, status)
+    return _response(*API_ROUTES.dispatch(req, module="api.routes.inspection_evidence"))
 
 
 @https_fn.on_request()
 def inspection_record(req: https_fn.Request) -> https_fn.Response:
     """Get inspection record (GET .../record)."""
-    from api.routes.inspection_record import handle_record_request
+    from api.routes.router import API_ROUTES
+
+    return _response(*API_ROUTES.dispatch(req, module="api.routes.inspection_record"))
+
+
+@https_fn.on_request()
+def inspection_collaboration(req: https_fn.Request) -> https_fn.Response:
+    """Sharing and contributions: POST .../share, POST .../collaboration."""
+    from api.routes.router import API_ROUTES
+
+    return _response(*API_ROUTES.dispatch(req, module="api.routes.inspection_collaboration"))
+
+
+@https_fn.on_request()
+def inspection_sync(req: https_fn.Request) -> https_fn.Response:
+    """Offline sync: POST .../sync applies a batch of queued answers and evidence idempotently."""
+    from api.routes.router import API_ROUTES
+
+    return _response(*API_ROUTES.dispatch(req, module="api.routes.inspection_sync"))
+
+
+@https_fn.on_request(timeout_sec=540, concurrency=80, cpu=1)
+def inspection_events(req: https_fn.Request) -> https_fn.Response:
+    """Session change feed (GET .../events): SSE deltas with Last-Event-ID resume."""
+    from api.routes.router import API_ROUTES
+
+    return _response(*API_ROUTES.dispatch(req, module="api.routes.inspection_events"))
+
+
+@storage_fn.on_object_finalized(memory=MemoryOption.GB_1)
+def evidence_derivatives(event: storage_fn.CloudEvent[storage_fn.StorageObjectData]) -> None:
+    """Render thumbnail/preview derivatives for uploaded photo evidence (skips its own output)."""
+    from infrastructure.media.derivatives import process_uploaded_object
+
+    obj = event.data
+    process_uploaded_object(obj.name, obj.content_type, int(obj.size) if obj.size is not None else None)
+
+
+@scheduler_fn.on_schedule(schedule="every 60 minutes", memory=MemoryOption.GB_1, timeout_sec=540)
+def analytics_export(event: scheduler_fn.ScheduledEvent) -> None:
+    """Export new observations and evidence to Parquet in Storage (incremental, checkpointed)."""
+    from infrastructure.analytics.parquet_export import run_export
+
+    run_export()
+
+
+if os.environ.get("INSPECTION_SINGLE_ENTRYPOINT", "").lower() in ("1", "true"):
+
+    @https_fn.on_request()
+    def inspection_api(req: https_fn.Request) -> https_fn.Response:
+        """Single entry point: every endpoint through the compiled route table (api.routes.router)."""
+        from api.routes.router import API_ROUTES
 
-    body, status = handle_record_request(req)
-    return _response(body, status)
+        return _response(*API_ROUTES.dispatch(req))
@@ -8,6 +8,7 @@ from datetime import datetime
 from enum import Enum
 
 from model.entities.intent import Intent
+from model.entities.step import Step, StepStatus
 from model.entities.target import Target
 
 
@@ -17,6 +18,59 @@ class SessionStatus(str, Enum):
     COMPLETED = "completed"
 
 
+_UNFINISHED = (StepStatus.PENDING, StepStatus.IN_PROGRESS)
+
+
+@dataclass
+class SessionProgress:
+    """
+    Denormalized step counters and current-step pointer kept on the session document,
+    so session state can be served from one read. pending counts pending + in_progress.
+    """
+
+    total: int = 0
+    completed: int = 0
+    skipped: int = 0
+    pending: int = 0
+    current_step_id: str | None = None
+    current_prompt: str | None = None
+    current_step_type: str | None = None
+    current_order: int | None = None
+
+    @classmethod
+    def from_steps(cls, steps: list[Step]) -> SessionProgress:
+        """Compute counters and pointer from a full step list."""
+        progress = cls()
+        for step in steps:
+            progress.apply_status_change(None, step.status)
+        unfinished = sorted((s for s in steps if s.status in _UNFINISHED), key=lambda s: s.order)
+        progress.point_to(unfinished[0] if unfinished else None)
+        return progress
+
+    def apply_status_change(self, old: StepStatus | None, new: StepStatus) -> None:
+        """Adjust counters for a step moving from old (None = new step) to new status."""
+        if old is None:
+            self.total += 1
+        else:
+            self._count(old, -1)
+        self._count(new, 1)
+
+    def point_to(self, step: Step | None) -> None:
+        """Set the current-step pointer (None when no step is left)."""
+        self.current_step_id = step.id if step else None
+        self.current_prompt = step.prompt if step else None
+        self.current_step_type = step.type if step else None
+        self.current_order = step.order if step else None
+
+    def _count(self, status: StepStatus, delta: int) -> None:
+        if status == StepStatus.COMPLETED:
+            self.completed += delta
+        elif status == StepStatus.SKIPPED:
+            self.skipped += delta
+        else:
+            self.pending += delta
+
+
 @dataclass
 class InspectionSession:
     """Root aggregate for an inspection session."""
@@ -31,6 +85,7 @@ class InspectionSession:
     created_by: str
     completed_at: datetime | None
     record_id: str | None
+    progress: SessionProgress | None = None
 
     def __post_init__(self) -> None:
         if not self.tenant_id or not self.created_by:
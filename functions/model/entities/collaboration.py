@@ -0,0 +1,35 @@
+"""
+Collaboration entity (data-model.md): comments, follow-up tasks and evidence refs from participants.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+
+class ContributionType(str, Enum):
+    COMMENT = "comment"
+    FOLLOW_UP_TASK = "follow_up_task"
+    EVIDENCE = "evidence"
+
+
+@dataclass
+class Contribution:
+    """Append-only collaborator contribution; never updated once written."""
+
+    id: str
+    session_id: str
+    type: ContributionType
+    content: str | dict[str, Any]
+    created_at: datetime
+    created_by: str
+    linked_step_id: str | None = None
+    resolved_at: datetime | None = None
+
+    def __post_init__(self) -> None:
+        if not self.created_by:
+            raise ValueError("createdBy is required")
+        if self.content in (None, "", {}):
+            raise ValueError("content is required")
@@ -28,6 +28,10 @@ class Evidence:
     payload: dict[str, Any] | None
     created_at: datetime
     created_by: str
+    content_type: str | None = None
+    size_bytes: int | None = None  # verified object size for uploaded files
+    # Photo renditions by name (thumb, preview, ...): {path, contentType, width, height}
+    derivatives: dict[str, dict[str, Any]] | None = None
 
     def __post_init__(self) -> None:
         if not self.created_by:
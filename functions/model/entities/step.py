@@ -21,6 +21,22 @@ class StepSource(str, Enum):
     BRANCHED = "branched"
 
 
+@dataclass(frozen=True)
+class PromptCandidate:
+    """
+    Speculatively generated prompt for a step, phrased before the previous step was answered.
+    Valid only while the step follows after_step_id and its planned prompt is unchanged.
+    """
+
+    text: str
+    after_step_id: str
+    base_prompt: str
+    created_at: datetime
+
+    def matches(self, after_step_id: str, base_prompt: str) -> bool:
+        return self.after_step_id == after_step_id and self.base_prompt == base_prompt
+
+
 @dataclass
 class Step:
     """Single step in inspection flow."""
@@ -35,6 +51,7 @@ class Step:
     created_at: datetime
     updated_at: datetime
     source: StepSource
+    prompt_candidate: PromptCandidate | None = None
 
     def __post_init__(self) -> None:
         if not self.session_id:
@@ -0,0 +1,56 @@
+"""
+Offline sync entities (FR-014): queued client actions replayed in one request, and their outcomes.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+
+from model.entities.evidence import Evidence
+from model.entities.observation import Observation
+
+
+class SyncStatus(str, Enum):
+    APPLIED = "applied"
+    DUPLICATE = "duplicate"  # applied by an earlier request; result is the original one
+    REJECTED = "rejected"
+
+
+@dataclass
+class SyncAction:
+    """One queued action with its client-generated id: an answer (observation) or evidence."""
+
+    action_id: str
+    observation: Observation | None = None
+    evidence: Evidence | None = None
+
+    def __post_init__(self) -> None:
+        if (self.observation is None) == (self.evidence is None):
+            raise ValueError("exactly one of observation or evidence is required")
+
+    @property
+    def type(self) -> str:
+        return "answer" if self.observation is not None else "evidence"
+
+    @property
+    def entity_id(self) -> str:
+        return self.observation.id if self.observation is not None else self.evidence.id
+
+
+@dataclass
+class SyncResult:
+    action_id: str
+    status: SyncStatus
+    entity_id: str | None = None
+    step_completed: bool | None = None  # answers: whether the answer completed its step
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        out = {"actionId": self.action_id, "status": self.status.value}
+        if self.entity_id is not None:
+            out["id"] = self.entity_id
+        if self.step_completed is not None:
+            out["stepCompleted"] = self.step_completed
+        if self.error is not None:
+            out["error"] = self.error
+        return out
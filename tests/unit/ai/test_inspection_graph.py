@@ -0,0 +1,79 @@
+"""Unit tests for the compiled inspection graph."""
+import pytest
+
+from ai.graph.engine import END, GraphCompileError, StateGraph
+from ai.graph.inspection_graph import INSPECTION_GRAPH, stream_next_prompt
+from infrastructure.config.factories import set_llm_client
+
+
+@pytest.fixture(autouse=True)
+def _template_prompts():
+    set_llm_client(None)
+    yield
+    set_llm_client()
+
+
+def _window():
+    return [
+        {"id": "step-1", "order": 0, "type": "check", "prompt": "Check the roof.", "status": "completed", "source": "initial"},
+        {"id": "step-2", "order": 1024, "type": "check", "prompt": "Check the gutters.", "status": "pending", "source": "initial"},
+    ]
+
+
+def _events(answer, steps=None):
+    return list(stream_next_prompt("step-1", answer, steps or _window()))
+
+
+def test_compile_rejects_unknown_target_and_dangling_node():
+    graph = StateGraph()
+    graph.add_node("a", lambda s: None)
+    graph.add_edge("a", "b")
+    with pytest.raises(GraphCompileError):
+        graph.compile()
+    graph = StateGraph()
+    graph.add_node("a", lambda s: None)
+    graph.add_node("b", lambda s: None)
+    graph.add_edge("a", END)
+    with pytest.raises(GraphCompileError):
+        graph.compile()
+    assert INSPECTION_GRAPH.node_names == {"plan", "ask", "evaluate", "adapt", "finish"}
+
+
+def test_routine_answer_follows_plan():
+    events = _events("ok")
+    assert [k for k, _ in events if k != "token"] == ["completed", "ask", "done"]
+    assert dict(events)["ask"]["id"] == "step-2"
+    assert "".join(p for k, p in events if k == "token") == "Check the gutters."
+
+
+def test_issue_branches_before_next_planned_step():
+    events = _events("Cracked tile near the chimney")
+    added = dict(events)["added"]
+    assert added["source"] == "branched" and added["type"] == "document"
+    assert 0 < added["order"] < 1024
+    assert dict(events)["ask"]["id"] == added["id"]
+    assert dict(events)["done"] is True
+
+
+def test_exhausted_order_gap_shifts_following_steps():
+    steps = _window()
+    steps[1]["order"] = 1
+    steps.append({"id": "step-3", "order": 2, "type": "check", "prompt": "Check the flashing.", "status": "pending", "source": "initial"})
+    events = _events("Cracked tile near the chimney", steps)
+    assert dict(events)["renumbered"] == {"fromOrder": 1, "by": 1024}
+    added = dict(events)["added"]
+    assert 0 < added["order"] < 1 + 1024
+    assert [k for k, _ in events if k != "token"] == ["completed", "renumbered", "added", "ask", "done"]
+
+
+def test_negated_issue_and_added_check():
+    assert "added" not in dict(_events("No leaks, no rust"))
+    added = dict(_events("Fine, but also check the skylight."))["added"]
+    assert added["source"] == "added" and added["prompt"] == "Check skylight."
+
+
+def test_branched_step_does_not_branch_again_and_plan_end_finishes():
+    steps = [{"id": "step-1", "order": 0, "type": "document", "prompt": "Document it.", "status": "completed", "source": "branched"}]
+    events = _events("Photo of the crack attached", steps)
+    assert "added" not in dict(events)
+    assert events[-1] == ("done", False)
@@ -0,0 +1,134 @@
+"""Unit tests for the pooled LLM client against a local fake OpenAI-compatible server."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ai.clients.llm_client import LLMClient, LLMClientConfig, LLMError, LLMTimeoutError
+
+
+class _FakeLLM(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    failures_left = 0
+    delay = 0.0
+    peers: set = set()
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        type(self).peers.add(self.client_address)
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if type(self).failures_left > 0:
+            type(self).failures_left -= 1
+            self._send(503, b"{}", "application/json")
+            return
+        if type(self).delay:
+            threading.Event().wait(type(self).delay)
+        if body.get("stream"):
+            chunks = [{"choices": [{"delta": {"content": t}}]} for t in ("Check ", "the ", "roof?")]
+            payload = "".join(f"data: {json.dumps(c)}\n\n" for c in chunks) + "data: [DONE]\n\n"
+            self._send(200, payload.encode(), "text/event-stream")
+        else:
+            reply = {"choices": [{"message": {"content": "Check the roof?"}}]}
+            self._send(200, json.dumps(reply).encode(), "application/json")
+
+    def _send(self, status, data, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def server():
+    _FakeLLM.failures_left = 0
+    _FakeLLM.delay = 0.0
+    _FakeLLM.peers = set()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _FakeLLM)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/v1"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _client(endpoint, **overrides):
+    config = LLMClientConfig(endpoint=endpoint, api_key="test", model="fake", **overrides)
+    return LLMClient(config, sleep=lambda s: None)
+
+
+MESSAGES = [{"role": "user", "content": "Inspect roof"}]
+
+
+def test_complete_reuses_pooled_connection(server):
+    client = _client(server)
+    assert client.complete(MESSAGES) == "Check the roof?"
+    assert client.complete(MESSAGES) == "Check the roof?"
+    assert len(_FakeLLM.peers) == 1  # second call rode the same keep-alive connection
+    client.close()
+
+
+def test_stream_yields_chunks(server):
+    client = _client(server)
+    assert list(client.stream(MESSAGES)) == ["Check ", "the ", "roof?"]
+    assert client.complete(MESSAGES) == "Check the roof?"
+    assert len(_FakeLLM.peers) == 1
+
+
+def test_retries_transient_errors(server):
+    _FakeLLM.failures_left = 2
+    assert _client(server, max_retries=2).complete(MESSAGES) == "Check the roof?"
+    _FakeLLM.failures_left = 2
+    with pytest.raises(LLMError):
+        _client(server, max_retries=1).complete(MESSAGES)
+
+
+def test_deadline(server):
+    _FakeLLM.delay = 0.5
+    with pytest.raises(LLMTimeoutError):
+        _client(server).complete(MESSAGES, timeout=0.1)
+
+
+def test_prompts_use_llm_and_fall_back_to_template(server):
+    from ai.prompts.inspection_prompts import first_prompt_for_intent, stream_first_prompt
+
+    client = _client(server, max_retries=0)
+    assert "".join(stream_first_prompt("Inspect roof", llm=client)) == "Check the roof?"
+    _FakeLLM.failures_left = 1
+    fallback = "".join(stream_first_prompt("Inspect roof", llm=client))
+    assert fallback == first_prompt_for_intent("Inspect roof")
+
+
+def test_factory_builds_one_client_and_caches_invalid_endpoint(monkeypatch):
+    import dataclasses
+    from concurrent.futures import ThreadPoolExecutor
+
+    from ai.clients import llm_client
+    from infrastructure.config import factories
+    from infrastructure.config.loader import EnvConfig
+
+    built = []
+
+    class _Counting(LLMClient):
+        def __init__(self, config):
+            built.append(config.endpoint)
+            threading.Event().wait(0.01)  # widen the race window
+            super().__init__(config)
+
+    monkeypatch.setattr(llm_client, "LLMClient", _Counting)
+    env = EnvConfig("test", "demo", None, "http://127.0.0.1:9/v1", None, ["note"], 1000, 5, ["default"])
+    try:
+        for endpoint, expect_client in (("http://127.0.0.1:9/v1", True), ("not a url", False)):
+            factories.set_config(dataclasses.replace(env, llm_endpoint=endpoint))
+            factories.set_llm_client()
+            built.clear()
+            with ThreadPoolExecutor(8) as pool:
+                clients = list(pool.map(lambda _: factories.get_llm_client(), range(8)))
+            assert len(built) == 1 and len({id(c) for c in clients}) == 1
+            assert (clients[0] is not None) == expect_client
+    finally:
+        factories.set_config(None)
+        factories.set_llm_client()
@@ -0,0 +1,60 @@
+"""Unit tests for the initial plan cache."""
+from datetime import UTC, datetime, timedelta
+
+from ai.graph import plan_cache
+from ai.graph.inspection_graph import run_initial_graph
+from ai.graph.plan_cache import normalize_goal, plan_cache_key
+from infrastructure.config.factories import set_llm_client
+from infrastructure.persistence import firestore_client, plan_cache_repository
+from tests.unit.fake_firestore import FakeFirestore
+
+
+class _CountingLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def stream(self, messages, timeout=None, **params):
+        self.calls += 1
+        yield "Is the roof membrane intact?"
+
+
+def test_key_normalizes_goal_constraints_and_libraries():
+    assert normalize_goal("  Roof inspection of Unit 12B! ") == "roof inspection of unit 12b"
+    a = plan_cache_key("t1", "Roof inspection of unit 12B", {"b": 1, "a": 2}, ["default", "roofs"])
+    b = plan_cache_key("t1", "roof  inspection of UNIT 12b.", {"a": 2, "b": 1}, ["roofs", "default"])
+    assert a == b
+    assert a != plan_cache_key("t2", "Roof inspection of unit 12B", {"b": 1, "a": 2}, ["default", "roofs"])
+    assert a != plan_cache_key("t1", "Roof inspection of unit 14A", {"b": 1, "a": 2}, ["default", "roofs"])
+
+
+def test_initial_graph_serves_repeat_intents_from_cache():
+    llm = _CountingLLM()
+    set_llm_client(llm)
+    plan_cache.clear_cache()
+    try:
+        first = run_initial_graph("Roof inspection of unit 12B", tenant_id="t1", libraries=[])
+        again = run_initial_graph("roof inspection of unit 12b", tenant_id="t1", libraries=[])
+        assert llm.calls == 1
+        assert again == first
+        assert first[1] == "Is the roof membrane intact?"
+        run_initial_graph("Roof inspection of unit 12B", tenant_id="t2", libraries=[])
+        assert llm.calls == 2
+    finally:
+        set_llm_client()
+        plan_cache.clear_cache()
+
+
+def test_expired_plans_are_misses_for_naive_and_aware_timestamps():
+    db = FakeFirestore()
+    firestore_client.set_firestore_client(db)
+    try:
+        plan_cache_repository.save_plan("t1", "k", [{"prompt": "Roof"}], "Is the roof intact?", ttl_seconds=60)
+        assert plan_cache_repository.load_plan("t1", "k")["firstPrompt"] == "Is the roof intact?"
+        # Firestore reads back timezone-aware timestamps.
+        past = datetime.now(UTC) - timedelta(seconds=1)
+        db.docs["tenants/t1/plan_cache/k"]["expiresAt"] = past
+        assert plan_cache_repository.load_plan("t1", "k") is None
+        db.docs["tenants/t1/plan_cache/k"]["expiresAt"] = past.replace(tzinfo=None)
+        assert plan_cache_repository.load_plan("t1", "k") is None
+    finally:
+        firestore_client.set_firestore_client(None)
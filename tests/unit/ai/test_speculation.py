@@ -0,0 +1,105 @@
+"""Unit tests for speculative next-prompt candidates."""
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from ai.graph import speculation
+from ai.graph.inspection_graph import run_next_prompt
+from ai.graph.speculation import valid_candidate
+from ai.prompts.inspection_prompts import is_routine_answer
+from infrastructure.config.factories import set_llm_client
+from infrastructure.persistence import step_repository
+from model.entities.step import PromptCandidate, Step, StepSource, StepStatus
+
+
+class _LLM:
+    def __init__(self):
+        self.calls = 0
+
+    def stream(self, messages, timeout=None, **params):
+        self.calls += 1
+        yield "Inline prompt?"
+
+
+def _step(step_id, order, prompt, candidate=None):
+    now = datetime.utcnow()
+    return Step(
+        id=step_id, session_id="s1", order=order, type="check", prompt=prompt, target_id=None,
+        status=StepStatus.PENDING, created_at=now, updated_at=now, source=StepSource.INITIAL,
+        prompt_candidate=candidate,
+    )
+
+
+def test_routine_answers():
+    assert is_routine_answer("OK.")
+    assert is_routine_answer("  no issues ")
+    assert not is_routine_answer("Crack near the chimney flashing")
+    # "Yes" to "are there leaks...?" reports a defect; polarity depends on the question.
+    assert not is_routine_answer("Yes")
+    assert not is_routine_answer("y")
+    assert not is_routine_answer("none")
+
+
+def test_candidate_valid_only_for_same_plan():
+    candidate = PromptCandidate("Check the gutters?", "step-1", "Gutters", datetime.utcnow())
+    served = _step("step-1", 0, "Roof")
+    assert valid_candidate(served, _step("step-2", 1, "Gutters", candidate)) == "Check the gutters?"
+    assert valid_candidate(served, _step("step-2", 1, "Downpipes", candidate)) is None
+    assert valid_candidate(_step("step-0", 0, "Roof"), _step("step-2", 1, "Gutters", candidate)) is None
+
+
+def test_next_prompt_uses_candidate_for_routine_answer_only():
+    llm = _LLM()
+    set_llm_client(llm)
+    steps = [
+        {"id": "step-1", "order": 0, "type": "check", "prompt": "Roof", "status": "completed"},
+        {"id": "step-2", "order": 1, "type": "check", "prompt": "Gutters", "status": "pending"},
+    ]
+    try:
+        _, text, has_next = run_next_prompt("step-1", "done", steps, candidate="Check the gutters?")
+        assert (text, has_next, llm.calls) == ("Check the gutters?", True, 0)
+        _, text, _ = run_next_prompt("step-1", "Loose tiles on the north side", steps, candidate="Check the gutters?")
+        assert (text, llm.calls) == ("Inline prompt?", 1)
+    finally:
+        set_llm_client()
+
+
+class _SlowLLM:
+    def __init__(self, delay):
+        self.delay = delay
+        self.timeouts = []
+
+    def complete(self, messages, timeout=None, **params):
+        self.timeouts.append(timeout)
+        time.sleep(self.delay)
+        return "Check the gutters?"
+
+
+def _speculate(monkeypatch, delay, deadline):
+    saved = []
+    monkeypatch.setattr(speculation, "get_config", lambda: SimpleNamespace(speculation_deadline_seconds=deadline))
+    monkeypatch.setattr(step_repository, "save_prompt_candidate", lambda t, s, step_id, c: saved.append((step_id, c.text)))
+    llm = _SlowLLM(delay)
+    set_llm_client(llm)
+    try:
+        scheduled = speculation.schedule("t1", "s1", _step("step-1", 0, "Roof"), _step("step-2", 1, "Gutters"))
+        settled = speculation.settle(scheduled)
+        scheduled.future.result()  # let a late generation finish while the fakes are installed
+    finally:
+        set_llm_client()
+    return settled, saved, llm
+
+
+def test_settle_waits_for_speculation_within_deadline(monkeypatch):
+    settled, saved, llm = _speculate(monkeypatch, delay=0.01, deadline=2.0)
+    assert settled and saved == [("step-2", "Check the gutters?")]
+    assert llm.timeouts == [2.0]
+
+
+def test_candidate_finished_after_deadline_is_not_written(monkeypatch):
+    settled, saved, _ = _speculate(monkeypatch, delay=0.3, deadline=0.05)
+    assert not settled and saved == []  # not even once the generation completes
+
+
+def test_settle_without_speculation():
+    assert speculation.settle(None) is False
@@ -0,0 +1,58 @@
+"""Unit tests for step libraries."""
+import json
+import os
+
+from ai.graph.inspection_graph import run_initial_graph
+from ai.library.step_library import StepLibraryRegistry, compile_libraries
+from infrastructure.config.factories import set_llm_client
+
+
+def _write(path, library_id, template_id, keywords, prompt, target_types=()):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "id": library_id,
+        "templates": [{
+            "id": template_id,
+            "targetTypes": list(target_types),
+            "keywords": keywords,
+            "steps": [{"type": "check", "prompt": prompt}],
+        }],
+    }))
+
+
+def test_match_by_keyword_target_and_tenant(tmp_path):
+    _write(tmp_path / "default.json", "default", "roof", ["roof"], "Global roof?", ["property"])
+    _write(tmp_path / "boats.json", "boats", "hull", ["hull", "boat"], "Hull?", ["vessel"])
+    _write(tmp_path / "tenants" / "t1" / "roofs.json", "default", "t1-roof", ["roof"], "Tenant roof?")
+    compiled = compile_libraries(tmp_path)
+
+    assert compiled.match("Roof check", tenant_id="t2", libraries=["default"]).template.id == "roof"
+    assert compiled.match("Roof check", tenant_id="t1", libraries=["default"]).template.id == "t1-roof"
+    assert compiled.match("Boat hull survey", libraries=["default"]) is None  # library not enabled
+    assert compiled.match("Boat hull survey", "vessel", libraries=["boats"]).score == 4
+    assert compiled.match("Inspect the kitchen", libraries=["default", "boats"]) is None
+
+
+def test_registry_reloads_when_stamp_changes(tmp_path):
+    now = [0.0]
+    library = tmp_path / "default.json"
+    _write(library, "default", "roof", ["roof"], "Old prompt?")
+    registry = StepLibraryRegistry(tmp_path, reload_seconds=60, clock=lambda: now[0])
+    first = registry.get()
+
+    _write(library, "default", "roof", ["roof"], "New prompt, longer?")
+    os.utime(library, ns=(1, 1))
+    assert registry.get() is first  # not re-checked before reload_seconds
+    now[0] = 61.0
+    assert registry.get().templates[0].steps == (("check", "New prompt, longer?"),)
+
+
+def test_shipped_library_plans_without_llm():
+    set_llm_client(None)
+    try:
+        steps, prompt = run_initial_graph("Pre-purchase check of a used car", libraries=["default"])
+    finally:
+        set_llm_client()
+    assert len(steps) > 1
+    assert prompt == steps[0]["prompt"]
+    assert [s["order"] for s in steps] == sorted(s["order"] for s in steps)
@@ -0,0 +1,84 @@
+"""Unit tests for ID-token verification caching and signing-key prefetch."""
+import time
+
+import pytest
+from firebase_admin import auth as firebase_auth
+
+from api.middleware import auth
+from infrastructure.cache.ttl_cache import TTLCache
+from infrastructure.config import startup
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def verifier(monkeypatch):
+    """Fake verify_id_token: returns claims per token, or raises the queued error; counts calls."""
+    clock = _Clock()
+    monkeypatch.setattr(auth, "_token_cache", TTLCache(max_entries=8, ttl_seconds=3600, clock=clock))
+    monkeypatch.setattr(startup, "ensure_firebase_app", lambda: None)
+    state = {"calls": 0, "error": None, "exp_in": 3600, "clock": clock}
+
+    def verify_id_token(token):
+        state["calls"] += 1
+        if state["error"] is not None:
+            raise state["error"]
+        return {"uid": f"uid-{token}", "exp": time.time() + state["exp_in"]}
+
+    monkeypatch.setattr(firebase_auth, "verify_id_token", verify_id_token)
+    return state
+
+
+def test_verified_claims_are_served_from_cache(verifier):
+    assert auth.verify_token("tok")["uid"] == "uid-tok"
+    assert auth.verify_token("tok")["uid"] == "uid-tok"
+    assert verifier["calls"] == 1
+    assert auth.token_cache_stats().hits == 1
+
+
+def test_cached_claims_expire_before_the_token(verifier):
+    verifier["exp_in"] = 130  # cached for exp minus the 30s margin
+    auth.verify_token("tok")
+    verifier["clock"].now = 99
+    auth.verify_token("tok")
+    assert verifier["calls"] == 1
+    verifier["clock"].now = 101
+    auth.verify_token("tok")
+    assert verifier["calls"] == 2
+
+
+def test_token_inside_expiry_margin_is_not_cached(verifier):
+    verifier["exp_in"] = 10
+    auth.verify_token("tok")
+    auth.verify_token("tok")
+    assert verifier["calls"] == 2
+
+
+def test_revoked_and_invalid_tokens_are_rejected_and_not_cached(verifier):
+    verifier["error"] = firebase_auth.RevokedIdTokenError("revoked")
+    assert auth.verify_token("tok") is None
+    verifier["error"] = firebase_auth.InvalidIdTokenError("bad signature")
+    assert auth.verify_token("tok") is None
+    assert verifier["calls"] == 2
+    verifier["error"] = None
+    assert auth.verify_token("tok")["uid"] == "uid-tok"
+
+
+def test_prefetch_uses_verifier_request(monkeypatch):
+    fetched = []
+    monkeypatch.setattr(startup, "ensure_firebase_app", lambda: None)
+    monkeypatch.setattr(auth, "_signing_key_fetch", lambda: lambda: fetched.append(True))
+    assert auth.prefetch_signing_keys() is True and fetched == [True]
+
+
+def test_prefetch_skipped_when_sdk_internals_are_missing(monkeypatch):
+    monkeypatch.setattr(startup, "ensure_firebase_app", lambda: None)
+    monkeypatch.delattr(firebase_auth, "_get_client")
+    assert auth._signing_key_fetch() is None
+    assert auth.prefetch_signing_keys() is False
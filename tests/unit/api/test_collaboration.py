@@ -0,0 +1,101 @@
+"""Unit tests for sharing and collaborator contributions."""
+from datetime import datetime
+
+import pytest
+
+from api.routes import inspection_record
+from api.routes.router import API_ROUTES
+from infrastructure.persistence import collaboration_repository, record_repository, session_repository
+from infrastructure.persistence.record_repository import RecordSources
+from model.entities.collaboration import Contribution, ContributionType
+
+_SESSION = "/api/v1/tenants/t1/inspection_sessions/s1"
+
+
+class _Status:
+    def __init__(self, value):
+        self.value = value
+
+
+class _Session:
+    id = "s1"
+    created_by = "owner"
+    status = _Status("active")
+
+
+class _Request:
+    def __init__(self, path, user, body=None, headers=None):
+        self.method = "POST"
+        self.path = path
+        self.headers = {"X-User-Id": user, **(headers or {})}
+        self._body = body
+
+    def get_json(self, silent=False):
+        return self._body
+
+
+def test_share_link_grants_contribution_access(monkeypatch):
+    links, granted, appended = {}, set(), []
+
+    def create_link(tenant_id, session_id, user_id, ttl):
+        links["tok"] = session_id
+        return "tok", datetime(2026, 6, 1)
+
+    monkeypatch.setattr(session_repository, "load", lambda t, s: _Session())
+    monkeypatch.setattr(collaboration_repository, "create_share_link", create_link)
+    monkeypatch.setattr(collaboration_repository, "resolve_share_link", lambda t, token: links.get(token))
+    monkeypatch.setattr(collaboration_repository, "is_collaborator", lambda t, s, u: u in granted)
+    monkeypatch.setattr(collaboration_repository, "add_collaborators", lambda t, s, users, via: granted.update(users))
+    monkeypatch.setattr(collaboration_repository, "append_contribution", lambda t, c: appended.append(c))
+
+    comment = {"type": "comment", "content": "Gutter is loose"}
+    assert API_ROUTES.dispatch(_Request(_SESSION + "/collaboration", "guest", comment))[1] == 403
+    assert API_ROUTES.dispatch(_Request(_SESSION + "/share", "guest", {"linkEnabled": True}))[1] == 403
+
+    body, status = API_ROUTES.dispatch(_Request(_SESSION + "/share", "owner", {"linkEnabled": True}))
+    assert status == 200 and body["shareToken"] == "tok"
+    headers = {"X-Share-Token": body["shareToken"]}
+    body, status = API_ROUTES.dispatch(_Request(_SESSION + "/collaboration", "guest", comment, headers))
+    assert status == 201 and "guest" in granted
+    assert appended[0].created_by == "guest" and appended[0].id == body["contributionId"]
+
+    bad = {"type": "evidence", "content": {"note": "no id"}}
+    assert API_ROUTES.dispatch(_Request(_SESSION + "/collaboration", "guest", bad))[1] == 400
+
+
+@pytest.mark.parametrize("body", [
+    {"participantIds": ["u2"], "linkEnabled": True, "expiresInHours": "soon"},
+    {"participantIds": ["u2"], "linkEnabled": True, "expiresInHours": 24 * 365},
+    {"participantIds": ["u2"], "linkEnabled": "yes"},
+    {"participantIds": "u2"},
+])
+def test_invalid_share_request_is_rejected_before_any_write(monkeypatch, body):
+    monkeypatch.setattr(session_repository, "load", lambda t, s: _Session())
+    monkeypatch.setattr(collaboration_repository, "add_collaborators", lambda *a, **k: pytest.fail("granted"))
+    monkeypatch.setattr(collaboration_repository, "create_share_link", lambda *a: pytest.fail("linked"))
+    assert API_ROUTES.dispatch(_Request(_SESSION + "/share", "owner", body))[1] == 400
+
+
+def test_contributions_rejected_after_completion(monkeypatch):
+    done = _Session()
+    done.status = _Status("completed")
+    monkeypatch.setattr(session_repository, "load", lambda t, s: done)
+    monkeypatch.setattr(collaboration_repository, "append_contribution", lambda t, c: pytest.fail("appended"))
+    comment = {"type": "comment", "content": "Late note"}
+    assert API_ROUTES.dispatch(_Request(_SESSION + "/collaboration", "owner", comment))[1] == 409
+
+
+def test_record_merges_contributions_in_time_order(monkeypatch):
+    def contribution(cid, kind, minute, user):
+        return Contribution(cid, "s1", kind, f"{kind.value} {cid}", datetime(2026, 5, 1, 9, minute), user)
+
+    sources = RecordSources(steps=[], observations=[], evidence=[], contributions=[
+        contribution("a", ContributionType.COMMENT, 1, "u2"),
+        contribution("b", ContributionType.FOLLOW_UP_TASK, 2, "u3"),
+        contribution("c", ContributionType.COMMENT, 3, "u3"),
+    ])
+    monkeypatch.setattr(record_repository, "load_record_sources", lambda t, s: sources)
+    summary = inspection_record._build_record("t1", "s1").summary
+    assert [c["contributionId"] for c in summary["contributions"]] == ["a", "c"]
+    assert summary["followUps"][0]["contributionId"] == "b"
+    assert summary["contributions"][0]["createdAt"] == "2026-05-01T09:01:00Z"
@@ -0,0 +1,92 @@
+"""Unit tests for direct-to-Storage evidence uploads."""
+from api.routes import inspection_evidence
+from api.routes.router import API_ROUTES
+from infrastructure.config.tenant_config import resolve
+from infrastructure.persistence import evidence_repository, session_repository, storage_client
+
+_BASE = "/api/v1/tenants/t1/inspection_sessions/s1/evidence"
+
+
+class _Request:
+    def __init__(self, path, body=None):
+        self.method = "POST"
+        self.path = path
+        self.headers = {"X-User-Id": "u1"}
+        self._body = body
+
+    def get_json(self, silent=False):
+        return self._body
+
+
+def _fakes(monkeypatch, stored_size):
+    pending, finalized, deleted = {}, [], []
+    monkeypatch.setattr(session_repository, "load", lambda t, s: object())
+    monkeypatch.setattr(inspection_evidence, "get_tenant_config", lambda t: resolve(t, {"evidenceMaxSizeBytes": 100}))
+    monkeypatch.setattr(evidence_repository, "observation_evidence_count", lambda t, s, o: 0)
+    monkeypatch.setattr(evidence_repository, "save_pending_upload", lambda t, s, e, u: pending.update({e: u}))
+    monkeypatch.setattr(evidence_repository, "load_pending_upload", lambda t, s, e: pending.get(e))
+    monkeypatch.setattr(evidence_repository, "finalize_upload", lambda t, s, e, limit: finalized.append(e))
+    monkeypatch.setattr(storage_client, "signed_resumable_upload_url", lambda p, ct, ttl: "https://signed/" + p)
+    monkeypatch.setattr(storage_client, "get_object_metadata", lambda p: (stored_size, "image/jpeg"))
+    monkeypatch.setattr(storage_client, "delete_object", deleted.append)
+    return finalized, deleted
+
+
+def _start():
+    body = {"observationId": "o1", "type": "photo", "filename": "../roof 1.jpg", "contentType": "image/jpeg"}
+    return API_ROUTES.dispatch(_Request(_BASE + "/uploads", body))
+
+
+def test_upload_then_finalize_records_verified_size(monkeypatch):
+    finalized, deleted = _fakes(monkeypatch, stored_size=80)
+    body, status = _start()
+    assert status == 201
+    assert body["storagePath"] == f"tenants/t1/sessions/s1/evidence/{body['evidenceId']}/roof_1.jpg"
+    assert body["uploadHeaders"]["x-goog-resumable"] == "start"
+
+    body, status = API_ROUTES.dispatch(_Request(f"{_BASE}/{body['evidenceId']}/finalize"))
+    assert status == 201 and body["sizeBytes"] == 80
+    assert finalized[0].size_bytes == 80 and finalized[0].content_type == "image/jpeg"
+    assert not deleted
+
+
+def test_start_upload_rejects_non_numeric_size(monkeypatch):
+    _fakes(monkeypatch, stored_size=0)
+    body = {"observationId": "o1", "type": "photo", "filename": "a.jpg", "sizeBytes": "big"}
+    assert API_ROUTES.dispatch(_Request(_BASE + "/uploads", body))[1] == 400
+    body["sizeBytes"] = 101
+    assert API_ROUTES.dispatch(_Request(_BASE + "/uploads", body))[1] == 400
+
+
+def test_finalize_rejects_and_deletes_oversized_object(monkeypatch):
+    finalized, deleted = _fakes(monkeypatch, stored_size=500)
+    body, _ = _start()
+    _, status = API_ROUTES.dispatch(_Request(f"{_BASE}/{body['evidenceId']}/finalize"))
+    assert status == 400
+    assert deleted == [body["storagePath"]] and not finalized
+
+
+def test_finalize_over_quota_deletes_object(monkeypatch):
+    _, deleted = _fakes(monkeypatch, stored_size=80)
+
+    def full(t, s, e, limit):
+        raise evidence_repository.EvidenceQuotaExceededError(e.observation_id)
+
+    monkeypatch.setattr(evidence_repository, "finalize_upload", full)
+    body, _ = _start()
+    _, status = API_ROUTES.dispatch(_Request(f"{_BASE}/{body['evidenceId']}/finalize"))
+    assert status == 400 and deleted == [body["storagePath"]]
+
+
+def test_observation_quota_shares_sum_to_limit():
+    for limit in (0, 1, 3, 20, 21):
+        shares = [evidence_repository.shard_capacity(limit, i) for i in range(evidence_repository.OBSERVATION_COUNTER_SHARDS)]
+        assert sum(shares) == limit and max(shares) - min(shares) <= 1
+
+
+def test_add_evidence_errors_are_flat_body_status_pairs(monkeypatch):
+    monkeypatch.setattr(session_repository, "load", lambda t, s: None)
+    assert API_ROUTES.dispatch(_Request(_BASE, {"observationId": "o1"})) == ({"error": "Session not found"}, 404)
+    _fakes(monkeypatch, stored_size=10)
+    body, status = API_ROUTES.dispatch(_Request(_BASE, {"type": "photo"}))
+    assert (body, status) == ({"error": "observationId is required"}, 400)
@@ -0,0 +1,128 @@
+"""Unit tests for inspection record assembly and GET record."""
+import threading
+from datetime import datetime
+
+import pytest
+
+from api.routes import inspection_record
+from api.routes.router import API_ROUTES
+from infrastructure.persistence import (
+    collaboration_repository,
+    evidence_repository,
+    firestore_client,
+    observation_repository,
+    record_repository,
+    session_repository,
+    step_repository,
+)
+from infrastructure.persistence.record_repository import RecordSources
+from model.entities.collaboration import Contribution, ContributionType
+from model.entities.evidence import Evidence, EvidenceType
+from model.entities.observation import Observation, ObservationPriority
+from model.entities.step import Step, StepSource, StepStatus
+from tests.unit.fake_firestore import FakeFirestore
+
+NOW = datetime(2026, 5, 1, 9, 0)
+_DOC = "tenants/t1/inspection_sessions/s1"
+_PATH = "/api/v1/tenants/t1/inspection_sessions/s1"
+
+
+class _Request:
+    def __init__(self, method, path, headers=None):
+        self.method = method
+        self.path = path
+        self.headers = {"X-User-Id": "u1", **(headers or {})}
+
+    def get_json(self, silent=False):
+        return {}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeFirestore()
+    db.docs[_DOC] = {
+        "tenantId": "t1", "status": "completed", "intent": {"goal": "Roof"}, "createdBy": "u1",
+        "createdAt": NOW, "progress": {"total": 1, "completed": 1},
+    }
+    firestore_client.set_firestore_client(db)
+    session_repository.clear_cache()
+    monkeypatch.setattr(record_repository, "load_record_sources", lambda t, s: RecordSources([], [], []))
+    yield db
+    firestore_client.set_firestore_client(None)
+    session_repository.clear_cache()
+
+
+def _step(step_id, order, status):
+    return Step(step_id, "s1", order, "check", f"Check {step_id}", None, status, NOW, NOW, StepSource.INITIAL)
+
+
+def _fake_sources(monkeypatch):
+    """Four source loaders that only return once all four are running at the same time."""
+    barrier = threading.Barrier(4, timeout=5)
+
+    def parallel(value):
+        def load(tenant_id, session_id):
+            assert (tenant_id, session_id) == ("t1", "s1")
+            barrier.wait()  # times out (BrokenBarrierError) if the loads run one after another
+            return value
+
+        return load
+
+    monkeypatch.setattr(step_repository, "load_steps", parallel([
+        _step("a", 0, StepStatus.COMPLETED), _step("b", 1024, StepStatus.PENDING),
+    ]))
+    monkeypatch.setattr(observation_repository, "load_observations_for_session", parallel([
+        Observation("o1", "s1", "a", "Gutter loose", ObservationPriority.CRITICAL, NOW, "u1", ["e1"]),
+    ]))
+    monkeypatch.setattr(evidence_repository, "load_evidence_for_session", parallel([
+        Evidence("e1", "s1", "o1", EvidenceType.PHOTO, "tenants/t1/x.jpg", None, NOW, "u1"),
+    ]))
+    monkeypatch.setattr(collaboration_repository, "load_contributions_for_session", parallel([
+        Contribution("c1", "s1", ContributionType.COMMENT, "Looks fine", NOW, "u2"),
+        Contribution("c2", "s1", ContributionType.FOLLOW_UP_TASK, "Call roofer", NOW, "u2", linked_step_id="a"),
+    ]))
+
+
+def test_record_assembled_from_parallel_source_loads(monkeypatch):
+    _fake_sources(monkeypatch)
+    record = inspection_record._build_record("t1", "s1", version=2)
+    assert record.id.endswith("-v2") and record.version == 2
+    summary = record.summary
+    assert summary["findings"] == [{
+        "stepId": "a", "content": "Gutter loose", "priority": "critical", "createdBy": "u1", "evidenceIds": ["e1"],
+    }]
+    assert summary["incomplete"] == [{"stepId": "b", "prompt": "Check b"}]
+    assert summary["evidenceSummary"] == [{
+        "evidenceId": "e1", "observationId": "o1", "stepId": "a", "type": "photo",
+        "storagePath": "tenants/t1/x.jpg", "derivatives": None, "createdBy": "u1",
+    }]
+    assert [c["contributionId"] for c in summary["contributions"]] == ["c1"]
+    assert [(f["contributionId"], f["stepId"], f["resolvedAt"]) for f in summary["followUps"]] == [("c2", "a", None)]
+
+
+def test_legacy_session_record_is_materialized_and_linked_in_one_commit(db):
+    body, status, headers = API_ROUTES.dispatch(_Request("GET", _PATH + "/record"))
+    assert status == 200 and body["version"] == 1
+    record_id = record_repository.record_id_for("s1", 1)
+    assert headers["ETag"] == f'"{record_id}"'
+    assert f"{_DOC}/records/{record_id}" in db.docs and db.docs[_DOC]["recordId"] == record_id
+    assert db.commits == 1
+
+
+def test_if_none_match_returns_304_without_reading_record(db):
+    db.docs[_DOC]["recordId"] = "record-s1-v3"
+    reads = db.reads
+    body, status, headers = API_ROUTES.dispatch(
+        _Request("GET", _PATH + "/record", {"If-None-Match": 'W/"other", "record-s1-v3"'})
+    )
+    assert (body, status, headers) == (None, 304, {"ETag": '"record-s1-v3"'})
+    assert db.reads == reads + 1  # the session document only
+
+
+def test_complete_writes_record_and_session_link_together(db):
+    db.docs[_DOC]["status"] = "in_progress"
+    body, status = API_ROUTES.dispatch(_Request("POST", _PATH + "/complete"))
+    assert (body["status"], status) == ("completed", 200)
+    record_id = record_repository.record_id_for("s1", 1)
+    assert f"{_DOC}/records/{record_id}" in db.docs and db.docs[_DOC]["recordId"] == record_id
+    assert db.commits == 1
@@ -0,0 +1,49 @@
+"""Unit tests for the compiled route table."""
+from api.routes.router import API_ROUTES, RouteTable
+
+
+class _Request:
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.headers = {}
+
+
+def test_matches_templates_with_params():
+    match = API_ROUTES.match("POST", "/api/v1/tenants/t1/inspection_sessions/s1/complete")
+    assert match.route.handler.endswith(":complete_session")
+    assert match.params == {"tenant_id": "t1", "session_id": "s1"}
+    match = API_ROUTES.match("post", "/api/v1/tenants/t1/inspection_sessions/")
+    assert match.route.handler.endswith(":create_session")
+
+
+def test_complete_is_matched_exactly():
+    # A session id containing "complete" is a GET session, not a completion.
+    match = API_ROUTES.match("GET", "/api/v1/tenants/t1/inspection_sessions/completed-roof")
+    assert match.route.handler.endswith(":get_session")
+    assert match.params["session_id"] == "completed-roof"
+    assert API_ROUTES.match("POST", "/api/v1/tenants/t1/inspection_sessions/s1/completeX") is None
+
+
+def test_typed_params_and_dispatch_errors():
+    table = RouteTable([("GET", "/items/{n:int}", "builtins:dict")])
+    assert table.match("GET", "/items/42").params == {"n": 42}
+    assert table.match("GET", "/items/abc") is None
+    assert table.dispatch(_Request("DELETE", "/items/42"))[1] == 405
+    assert table.dispatch(_Request("GET", "/nothing"))[1] == 404
+
+
+def echo_params(request, **params):
+    return params, 200
+
+
+def test_dispatch_passes_params_and_restricts_to_module():
+    table = RouteTable([
+        ("GET", "/items/{n:int}", f"{__name__}:echo_params"),
+        ("POST", "/items/{n:int}/tags/{tag}", f"{__name__}:echo_params"),
+        ("GET", "/other", "builtins:dict"),
+    ])
+    assert table.dispatch(_Request("GET", "/items/7")) == ({"n": 7}, 200)
+    assert table.dispatch(_Request("POST", "/items/7/tags/red")) == ({"n": 7, "tag": "red"}, 200)
+    assert table.dispatch(_Request("GET", "/other"), module=__name__)[1] == 404
+    assert table.dispatch(_Request("DELETE", "/items/7"), module=__name__)[1] == 405
@@ -0,0 +1,53 @@
+"""Unit tests for the session listing endpoint."""
+from datetime import datetime
+
+from api.routes.router import API_ROUTES
+from infrastructure.persistence import session_repository
+
+_PATH = "/api/v1/tenants/t1/inspection_sessions"
+
+
+class _Args(dict):
+    def getlist(self, key):
+        return self.get(key, [])
+
+
+class _Request:
+    def __init__(self, **args):
+        self.method = "GET"
+        self.path = _PATH
+        self.headers = {"X-User-Id": "u1"}
+        self.args = _Args({k: v if isinstance(v, list) else [v] for k, v in args.items()})
+
+
+def test_pages_with_opaque_cursor_bound_to_filters(monkeypatch):
+    calls = []
+
+    def fake_list(tenant_id, query, limit, after):
+        calls.append((query, limit, after))
+        row = {"id": "s9", "status": "in_progress", "createdAt": datetime(2026, 5, 1, 8, 30), "intent": {"goal": "Roof"}}
+        return [row], after is None
+
+    monkeypatch.setattr(session_repository, "list_sessions", fake_list)
+    body, status = API_ROUTES.dispatch(_Request(status="in_progress,created", limit="1"))
+    assert status == 200
+    assert body["sessions"][0] == {
+        "sessionId": "s9", "status": "in_progress", "goal": "Roof", "target": None, "createdBy": None,
+        "createdAt": "2026-05-01T08:30:00", "updatedAt": None, "completedAt": None, "recordId": None,
+        "progress": {"totalSteps": 0, "completedSteps": 0, "skippedSteps": 0, "pendingSteps": 0},
+    }
+    assert calls[0][0].statuses == ("created", "in_progress")
+
+    cursor = body["nextCursor"]
+    body, status = API_ROUTES.dispatch(_Request(status="in_progress,created", limit="1", cursor=cursor))
+    assert status == 200 and body["nextCursor"] is None
+    assert calls[1][2] == (datetime(2026, 5, 1, 8, 30), "s9")
+
+    # A cursor is only valid with the filters it was issued for.
+    assert API_ROUTES.dispatch(_Request(status="completed", cursor=cursor))[1] == 400
+
+
+def test_rejects_bad_filters():
+    assert API_ROUTES.dispatch(_Request(status="archived"))[1] == 400
+    assert API_ROUTES.dispatch(_Request(limit="500"))[1] == 400
+    assert API_ROUTES.dispatch(_Request(createdAfter="yesterday"))[1] == 400
@@ -0,0 +1,34 @@
+"""Unit tests for SSE helpers and the streaming graph."""
+import json
+
+from ai.graph.inspection_graph import run_initial_graph, stream_initial_graph
+from api.routes.streaming import sse_event, wants_stream
+
+
+class _Request:
+    def __init__(self, headers=None, args=None):
+        self.headers = headers or {}
+        self.args = args or {}
+
+
+def test_sse_event_frame():
+    frame = sse_event("prompt_token", {"text": "Check "})
+    assert frame.startswith("event: prompt_token\ndata: ")
+    assert frame.endswith("\n\n")
+    assert json.loads(frame.split("data: ", 1)[1]) == {"text": "Check "}
+
+
+def test_wants_stream():
+    assert wants_stream(_Request(headers={"Accept": "text/event-stream"}))
+    assert wants_stream(_Request(args={"stream": "true"}))
+    assert not wants_stream(_Request(headers={"Accept": "application/json"}))
+
+
+def test_stream_initial_graph_orders_steps_before_tokens():
+    events = list(stream_initial_graph("Inspect roof"))
+    kinds = [k for k, _ in events]
+    assert kinds[0] == "step"
+    assert kinds.index("token") > kinds.index("step")
+    steps, prompt = run_initial_graph("Inspect roof")
+    assert "".join(p for k, p in events if k == "token") == prompt
+    assert steps[0]["prompt"] == prompt
@@ -0,0 +1,121 @@
+"""Unit tests for the streamed create-session and /next responses."""
+import json
+
+import pytest
+
+from ai.graph import speculation
+from api.routes import inspection_sessions
+from api.routes.router import API_ROUTES
+from infrastructure.persistence import firestore_client, session_repository
+from tests.unit.fake_firestore import FakeFirestore, run_transactions_inline
+
+_SESSIONS = "/api/v1/tenants/t1/inspection_sessions"
+
+
+class _Request:
+    def __init__(self, path, body, stream=True):
+        self.method = "POST"
+        self.path = path
+        self.headers = {"X-User-Id": "u1", "Accept": "text/event-stream" if stream else "application/json"}
+        self.args = {}
+        self._body = body
+
+    def get_json(self, silent=False):
+        return self._body
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeFirestore()
+    firestore_client.set_firestore_client(db)
+    session_repository.clear_cache()
+    run_transactions_inline(monkeypatch, db)
+    yield db
+    firestore_client.set_firestore_client(None)
+    session_repository.clear_cache()
+
+
+def _frames(stream):
+    """(event, data) per SSE frame, yielded lazily so tests can inspect state between frames."""
+    for frame in stream:
+        lines = dict(line.split(": ", 1) for line in frame.strip().splitlines())
+        yield lines["event"], json.loads(lines["data"])
+
+
+def _session_paths(db):
+    return [p for p in db.docs if p.count("/") == 3 and "/inspection_sessions/" in p]
+
+
+def test_create_stream_announces_session_only_after_it_is_persisted(db):
+    stream, status = API_ROUTES.dispatch(_Request(_SESSIONS, {"intent": {"goal": "Inspect roof"}}))
+    assert status == 200
+    events = []
+    for event, data in _frames(stream):
+        if event == "session_created":
+            assert _session_paths(db) == [f"tenants/t1/inspection_sessions/{data['sessionId']}"]
+        events.append((event, data))
+    kinds = [e for e, _ in events]
+    assert kinds[0] == "step" and kinds[-2:] == ["session_created", "done"]
+    assert "prompt_token" in kinds and kinds.index("prompt_token") < kinds.index("session_created")
+    assert events[-1][1]["sessionId"] == events[-2][1]["sessionId"]
+
+
+def test_create_stream_failure_never_announces_a_session(db, monkeypatch):
+    def fail(*args):
+        raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(inspection_sessions, "_persist_new_session", fail)
+    stream, _ = API_ROUTES.dispatch(_Request(_SESSIONS, {"intent": {"goal": "Inspect roof"}}))
+    events = list(_frames(stream))
+    assert [e for e, _ in events if e not in ("step", "prompt_token")] == ["error"]
+    assert "not created" in json.dumps(events[-1][1])
+    assert _session_paths(db) == []
+
+
+def test_next_stream_completes_step_and_streams_following_prompt(db):
+    created, _ = API_ROUTES.dispatch(_Request(_SESSIONS, {"intent": {"goal": "Inspect roof"}}))
+    session_id = [d for e, d in _frames(created) if e == "done"][0]["sessionId"]
+
+    stream, status = API_ROUTES.dispatch(_Request(f"{_SESSIONS}/{session_id}/next", {"answer": "Dry"}))
+    assert status == 200
+    events = list(_frames(stream))
+    kinds = [e for e, _ in events]
+    assert kinds[0] == "step_completed" and kinds[-1] == "done"
+    done = events[-1][1]
+    assert done["stepCompleted"]["stepId"] == events[0][1]["stepId"]
+    assert done["prompt"]["text"] == "".join(d["text"] for e, d in events if e == "prompt_token")
+    assert db.docs[f"tenants/t1/inspection_sessions/{session_id}"]["progress"]["completed"] == 1
+
+
+@pytest.fixture
+def settles(monkeypatch):
+    """Every schedule returns a marker; settle records when (after which frame) it was called."""
+    calls = []
+    monkeypatch.setattr(speculation, "schedule", lambda *args: "scheduled")
+    monkeypatch.setattr(speculation, "settle", lambda scheduled: calls.append(scheduled))
+    return calls
+
+
+def test_json_responses_do_not_wait_for_speculation(db, settles):
+    body, status = API_ROUTES.dispatch(_Request(_SESSIONS, {"intent": {"goal": "Inspect roof"}}, stream=False))
+    assert status == 201
+    _, status = API_ROUTES.dispatch(_Request(f"{_SESSIONS}/{body['sessionId']}/next", {"answer": "ok"}, stream=False))
+    assert status == 200 and settles == []
+
+
+def test_streams_settle_speculation_only_after_done(db, settles):
+    stream, _ = API_ROUTES.dispatch(_Request(_SESSIONS, {"intent": {"goal": "Inspect roof"}}))
+    frames = _frames(stream)
+    for event, data in frames:
+        assert settles == []
+        if event == "done":
+            session_id = data["sessionId"]
+            break
+    assert list(frames) == [] and settles == ["scheduled"]  # settled once the stream resumes after done
+
+    stream, _ = API_ROUTES.dispatch(_Request(f"{_SESSIONS}/{session_id}/next", {"answer": "ok"}))
+    events = []
+    for event, _ in _frames(stream):
+        events.append(event)
+        assert settles == ["scheduled"]  # not yet settled while frames are still being sent
+    assert events[-1] == "done" and settles == ["scheduled", "scheduled"]
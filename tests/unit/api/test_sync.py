@@ -0,0 +1,112 @@
+"""Unit tests for offline sync: per-action outcomes and idempotent replay."""
+from datetime import datetime
+
+from api.routes import inspection_sync
+from api.routes.router import API_ROUTES
+from infrastructure.persistence import session_repository, sync_repository
+from infrastructure.persistence.sync_repository import ChunkState, plan_chunk
+from model.entities.evidence import Evidence, EvidenceType
+from model.entities.observation import Observation, ObservationPriority
+from model.entities.step import Step, StepSource, StepStatus
+from model.entities.sync_action import SyncAction, SyncStatus
+
+_SYNC = "/api/v1/tenants/t1/inspection_sessions/s1/sync"
+NOW = datetime(2026, 5, 1, 9, 0)
+
+
+def _step(step_id, status=StepStatus.PENDING):
+    return Step(step_id, "s1", 1, "check", "Roof", None, status, NOW, NOW, StepSource.INITIAL)
+
+
+def _answer(action_id, step_id, obs_id=None):
+    obs = Observation(obs_id or action_id, "s1", step_id, "ok", ObservationPriority.NORMAL, NOW, "u1", [])
+    return SyncAction(action_id, observation=obs)
+
+
+def _evidence(action_id, obs_id):
+    e = Evidence(action_id, "s1", obs_id, EvidenceType.NOTE, None, {"n": 1}, NOW, "u1", size_bytes=7)
+    return SyncAction(action_id, evidence=e)
+
+
+def test_plan_applies_in_order_and_skips_replayed_actions():
+    state = ChunkState(
+        receipts={"act-0001": {"id": "act-0001", "stepCompleted": True}},
+        steps={"step-1": _step("step-1"), "step-2": _step("step-2", StepStatus.COMPLETED)},
+    )
+    plan = plan_chunk([
+        _answer("act-0001", "step-1"),       # applied by an earlier sync
+        _answer("act-0002", "step-1"),       # completes step-1
+        _answer("act-0003", "step-2"),       # step already done: observation kept
+        _evidence("act-0004", "act-0002"),   # evidence for an observation from this batch
+        _evidence("act-0005", "missing-obs"),
+        _answer("act-0002", "step-1"),       # repeated within the batch
+        _answer("act-0006", "step-9"),
+    ], state, max_per_observation=5)
+    assert [(r.action_id, r.status) for r in plan.results] == [
+        ("act-0001", SyncStatus.DUPLICATE),
+        ("act-0002", SyncStatus.APPLIED),
+        ("act-0003", SyncStatus.APPLIED),
+        ("act-0004", SyncStatus.APPLIED),
+        ("act-0005", SyncStatus.REJECTED),
+        ("act-0002", SyncStatus.DUPLICATE),
+        ("act-0006", SyncStatus.REJECTED),
+    ]
+    assert [r.step_completed for r in plan.results[1:3]] == [True, False]
+    assert plan.completed == {"step-1": StepStatus.PENDING}
+    assert plan.evidence_bytes == 7 and len(plan.applied) == 3
+
+
+def test_plan_enforces_evidence_quota():
+    state = ChunkState(observations={"obs-0001"})
+    plan = plan_chunk([_evidence(f"ev-000{i}", "obs-0001") for i in range(3)], state, max_per_observation=2)
+    assert [r.status for r in plan.results] == [SyncStatus.APPLIED, SyncStatus.APPLIED, SyncStatus.REJECTED]
+
+
+class _Session:
+    class status:
+        value = "active"
+
+
+class _Request:
+    method = "POST"
+    path = _SYNC
+    headers = {"X-User-Id": "u1"}
+
+    def __init__(self, body):
+        self._body = body
+
+    def get_json(self, silent=False):
+        return self._body
+
+
+def test_sync_handler_keeps_request_order_for_malformed_actions(monkeypatch):
+    monkeypatch.setattr(session_repository, "load", lambda t, s: _Session())
+    calls = []
+
+    def apply(tenant_id, session_id, user_id, actions, max_per_observation):
+        calls.append([a.action_id for a in actions])
+        return [sync_repository.SyncResult(a.action_id, SyncStatus.APPLIED, a.entity_id) for a in actions]
+
+    monkeypatch.setattr(sync_repository, "apply_actions", apply)
+    body, status = API_ROUTES.dispatch(_Request({"actions": [
+        {"actionId": "bad/id", "type": "answer"},
+        {"actionId": "act-0001", "type": "answer", "stepId": "step-1", "answer": "Dry"},
+        {"actionId": "act-0002", "type": "answer", "stepId": "step-1"},
+        {"actionId": "act-0003", "type": "evidence", "observationId": "act-0001", "payload": {"mm": 3}},
+    ]}))
+    assert status == 200 and calls == [["act-0001", "act-0003"]]
+    assert [r["status"] for r in body["results"]] == ["rejected", "applied", "rejected", "applied"]
+    assert body["applied"] == 2 and body["rejected"] == 2
+    assert "required" in body["results"][2]["error"]  # missing answer, not the planned step id
+
+
+def test_answer_for_planned_step_id_is_accepted():
+    parsed = inspection_sync._parse_action(
+        {"actionId": "act-0001", "type": "answer", "stepId": "step-1", "answer": "Dry"},
+        "s1", "u1", None,
+    )
+    assert isinstance(parsed, SyncAction) and parsed.observation.step_id == "step-1"
+    bad = inspection_sync._parse_action(
+        {"actionId": "act-0002", "type": "answer", "stepId": "a/b", "answer": "Dry"}, "s1", "u1", None
+    )
+    assert bad.status == SyncStatus.REJECTED
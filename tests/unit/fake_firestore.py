@@ -0,0 +1,212 @@
+"""
+In-memory stand-in for the Firestore client surface the repositories use (documents,
+subcollections, simple queries, batches and transactions), for repository unit tests.
+Install with firestore_client.set_firestore_client(FakeFirestore()); use the `transactions`
+fixture helper below so @firestore.transactional runs the function once on a FakeTransaction.
+"""
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+from google.cloud.firestore_v1.transforms import Increment
+
+
+class AlreadyExists(Exception):
+    pass
+
+
+class Snapshot:
+    def __init__(self, ref: DocRef, data: dict[str, Any] | None) -> None:
+        self.reference = ref
+        self.id = ref.id
+        self.exists = data is not None
+        self._data = copy.deepcopy(data)
+
+    def to_dict(self) -> dict[str, Any] | None:
+        return copy.deepcopy(self._data)
+
+    def get(self, field: str):
+        return (self._data or {}).get(field)
+
+
+class DocRef:
+    def __init__(self, db: FakeFirestore, path: str) -> None:
+        self._db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    @property
+    def parent(self) -> CollectionRef:
+        return CollectionRef(self._db, self.path.rsplit("/", 1)[0])
+
+    def collection(self, name: str) -> CollectionRef:
+        return CollectionRef(self._db, f"{self.path}/{name}")
+
+    def get(self, transaction=None, field_paths=None) -> Snapshot:
+        self._db.reads += 1
+        return Snapshot(self, self._db.docs.get(self.path))
+
+    def set(self, data, merge=False):
+        self._db.write("set", self, data, merge)
+
+    def create(self, data):
+        self._db.write("create", self, data)
+
+    def update(self, data):
+        self._db.write("update", self, data)
+
+    def delete(self):
+        self._db.write("delete", self, None)
+
+
+class Query:
+    def __init__(self, db: FakeFirestore, prefix: str, group: str | None = None) -> None:
+        self._db = db
+        self._prefix = prefix
+        self._group = group
+        self._filters: list[tuple[str, str, Any]] = []
+        self._order: list[tuple[str, bool]] = []
+        self._limit: int | None = None
+
+    def _copy(self) -> Query:
+        q = copy.copy(self)
+        q._filters, q._order = list(self._filters), list(self._order)
+        return q
+
+    def where(self, field: str, op: str, value):
+        q = self._copy()
+        q._filters.append((field, op, value))
+        return q
+
+    def order_by(self, field: str, direction: str = "ASCENDING"):
+        q = self._copy()
+        q._order.append((field, direction == "DESCENDING"))
+        return q
+
+    def limit(self, n: int):
+        q = self._copy()
+        q._limit = n
+        return q
+
+    def _matches(self, path: str, data: dict[str, Any]) -> bool:
+        parent, _ = path.rsplit("/", 1)
+        if self._group is not None:
+            if parent.rsplit("/", 1)[-1] != self._group:
+                return False
+        elif parent != self._prefix:
+            return False
+        for field, op, value in self._filters:
+            actual = data.get(field)
+            if op == "==" and actual != value:
+                return False
+            if op == "in" and actual not in value:
+                return False
+            if op == ">" and not (actual is not None and actual > value):
+                return False
+            if op == ">=" and not (actual is not None and actual >= value):
+                return False
+        return True
+
+    def stream(self, transaction=None):
+        rows = [(p, d) for p, d in self._db.docs.items() if self._matches(p, d)]
+        for field, descending in reversed(self._order):
+            rows.sort(key=lambda r: r[1].get(field), reverse=descending)
+        if self._limit is not None:
+            rows = rows[: self._limit]
+        self._db.reads += len(rows)
+        return [Snapshot(DocRef(self._db, p), d) for p, d in rows]
+
+
+class CollectionRef(Query):
+    def __init__(self, db: FakeFirestore, path: str) -> None:
+        super().__init__(db, path)
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def document(self, doc_id: str) -> DocRef:
+        return DocRef(self._db, f"{self.path}/{doc_id}")
+
+
+class FakeBatch:
+    """WriteBatch / Transaction: writes are buffered and applied on commit."""
+
+    def __init__(self, db: FakeFirestore) -> None:
+        self._db = db
+        self.writes: list[tuple[str, DocRef, Any, bool]] = []
+
+    def set(self, ref, data, merge=False):
+        self.writes.append(("set", ref, data, merge))
+
+    def create(self, ref, data):
+        self.writes.append(("create", ref, data, False))
+
+    def update(self, ref, data):
+        self.writes.append(("update", ref, data, False))
+
+    def delete(self, ref):
+        self.writes.append(("delete", ref, None, False))
+
+    def commit(self):
+        for kind, ref, _data, _merge in self.writes:
+            if kind == "create" and ref.path in self._db.docs:
+                raise AlreadyExists(ref.path)
+        for kind, ref, data, merge in self.writes:
+            self._db.write(kind, ref, data, merge)
+        self._db.commits += 1
+
+
+class FakeTransaction(FakeBatch):
+    pass
+
+
+class FakeFirestore:
+    def __init__(self) -> None:
+        self.docs: dict[str, dict[str, Any]] = {}
+        self.reads = 0
+        self.commits = 0
+
+    def collection(self, name: str) -> CollectionRef:
+        return CollectionRef(self, name)
+
+    def collection_group(self, name: str) -> Query:
+        return Query(self, "", group=name)
+
+    def batch(self) -> FakeBatch:
+        return FakeBatch(self)
+
+    def transaction(self) -> FakeTransaction:
+        return FakeTransaction(self)
+
+    def get_all(self, refs, field_paths=None, transaction=None):
+        return [ref.get() for ref in refs]
+
+    def write(self, kind: str, ref: DocRef, data, merge: bool = False) -> None:
+        if kind == "delete":
+            self.docs.pop(ref.path, None)
+            return
+        if kind == "create" and ref.path in self.docs:
+            raise AlreadyExists(ref.path)
+        if kind == "update" and ref.path not in self.docs:
+            raise KeyError(ref.path)
+        base = dict(self.docs.get(ref.path, {})) if kind == "update" or merge else {}
+        for key, value in copy.deepcopy(data).items():
+            if isinstance(value, Increment):
+                value = (base.get(key) or 0) + value.value
+            base[key] = value
+        self.docs[ref.path] = base
+
+
+def run_transactions_inline(monkeypatch, db: FakeFirestore) -> None:
+    """Make @firestore.transactional call the function once and commit its FakeTransaction."""
+    from google.cloud import firestore
+
+    def transactional(fn):
+        def run(transaction):
+            result = fn(transaction)
+            transaction.commit()
+            return result
+
+        return run
+
+    monkeypatch.setattr(firestore, "transactional", transactional)
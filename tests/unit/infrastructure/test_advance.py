@@ -0,0 +1,145 @@
+"""Unit tests for the transactional advance (answer + step transition + progress)."""
+from datetime import datetime
+
+import pytest
+
+from infrastructure.persistence import firestore_client, session_repository, step_repository
+from model.entities.observation import Observation, ObservationPriority
+from model.entities.step import Step, StepSource, StepStatus
+from tests.unit.fake_firestore import FakeFirestore, run_transactions_inline
+
+_SESSION = "tenants/t1/inspection_sessions/s1"
+
+
+def _step(step_id, order, status="pending"):
+    return {"id": step_id, "sessionId": "s1", "order": order, "type": "check", "prompt": f"Check {step_id}",
+            "status": status, "source": "initial"}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeFirestore()
+    db.docs[_SESSION] = {
+        "tenantId": "t1", "status": "in_progress", "intent": {"goal": "Roof"}, "createdBy": "u1",
+        "progress": {"total": 4, "completed": 1, "skipped": 0, "pending": 3, "currentStepId": "b"},
+    }
+    for step_id, order, status in (("a", 0, "completed"), ("b", 1024, "pending"), ("c", 2048, "pending"),
+                                   ("d", 3072, "in_progress")):
+        db.docs[f"{_SESSION}/steps/{step_id}"] = _step(step_id, order, status)
+    firestore_client.set_firestore_client(db)
+    session_repository.clear_cache()
+    run_transactions_inline(monkeypatch, db)
+    yield db
+    firestore_client.set_firestore_client(None)
+    session_repository.clear_cache()
+
+
+def _answer(step):
+    return Observation("obs-1", "s1", step.id, "Dry", ObservationPriority.NORMAL, datetime(2026, 5, 1), "u1", [])
+
+
+def test_completes_first_pending_step_and_moves_pointer(db):
+    result = session_repository.advance("t1", "s1", _answer)
+    assert [s.id for s in (result.completed_step, result.next_step, result.following_step)] == ["b", "c", "d"]
+    assert db.docs[f"{_SESSION}/steps/b"]["status"] == "completed"
+    assert db.docs[f"{_SESSION}/observations/obs-1"]["stepId"] == "b"
+    progress = db.docs[_SESSION]["progress"]
+    assert (progress["completed"], progress["pending"], progress["currentStepId"]) == (2, 2, "c")
+    assert db.commits == 1
+
+
+def test_window_comes_from_checkpoint_when_present(db):
+    steps = {s: _step(s, o, st) for s, o, st in (("a", 0, "completed"), ("b", 1024, "pending"), ("c", 2048, "pending"))}
+    db.docs[_SESSION]["graph"] = {"version": 0, "snapshotVersion": 0}
+    db.docs[f"{_SESSION}/graph_snapshots/0000000000"] = {"version": 0, "steps": steps, "currentStepId": "b"}
+    # The steps collection disagrees (d in progress); the checkpoint is the source of the window.
+    result = session_repository.advance("t1", "s1", _answer)
+    assert (result.completed_step.id, result.next_step.id, result.following_step) == ("b", "c", None)
+    delta = db.docs[f"{_SESSION}/graph_deltas/0000000001"]
+    assert delta["steps"] == {"b": {"status": "completed"}} and delta["currentStepId"] == "c"
+    assert db.docs[_SESSION]["graph"] == {"version": 1, "snapshotVersion": 0}
+
+
+def test_no_pending_step_writes_nothing(db):
+    for step_id in "bcd":
+        db.docs[f"{_SESSION}/steps/{step_id}"]["status"] = "completed"
+    result = session_repository.advance("t1", "s1", lambda step: pytest.fail("no observation expected"))
+    assert result.completed_step is None and result.next_step is None
+    assert db.commits == 1 and not any("/observations/" in p for p in db.docs)
+
+
+def test_missing_session_returns_none(db):
+    assert session_repository.advance("t1", "missing", _answer) is None
+
+
+def test_added_step_with_renumber_shifts_plan_and_checkpoint(db):
+    steps = {s: _step(s, o, st) for s, o, st in (("a", 0, "completed"), ("b", 1, "pending"), ("c", 2, "pending"),
+                                                  ("e", 3, "pending"))}
+    for step_id, entry in steps.items():
+        db.docs[f"{_SESSION}/steps/{step_id}"] = dict(entry)
+    db.docs[_SESSION]["graph"] = {"version": 0, "snapshotVersion": 0}
+    db.docs[f"{_SESSION}/graph_snapshots/0000000000"] = {"version": 0, "steps": steps, "currentStepId": "b"}
+    result = session_repository.advance("t1", "s1", _answer)  # completes b (order 1); window c, e
+    now = datetime(2026, 5, 1)
+    added = Step("x", "s1", 514, "document", "Document it", None, StepStatus.PENDING, now, now, StepSource.BRANCHED)
+    session_repository.add_steps(result, "t1", [added], renumber=(2, 1024))
+    orders = {s: db.docs[f"{_SESSION}/steps/{s}"]["order"] for s in "abcex"}
+    assert orders == {"a": 0, "b": 1, "c": 1026, "e": 1027, "x": 514}
+    delta = db.docs[f"{_SESSION}/graph_deltas/0000000002"]
+    assert delta["steps"]["c"] == {"order": 1026} and delta["steps"]["x"]["order"] == 514
+    assert [s["id"] for s in result.checkpoint.pending(3)] == ["x", "c", "e"]
+
+
+def _with_checkpoint(db):
+    steps = {s: _step(s, o, st) for s, o, st in (("a", 0, "completed"), ("b", 1024, "pending"), ("c", 2048, "pending"),
+                                                  ("d", 3072, "pending"))}
+    for step_id, entry in steps.items():
+        db.docs[f"{_SESSION}/steps/{step_id}"] = dict(entry)
+    db.docs[_SESSION]["graph"] = {"version": 0, "snapshotVersion": 0}
+    db.docs[f"{_SESSION}/graph_snapshots/0000000000"] = {"version": 0, "steps": steps, "currentStepId": "b"}
+
+
+def test_added_steps_build_on_a_concurrent_turn(db):
+    _with_checkpoint(db)
+    first = session_repository.advance("t1", "s1", _answer)  # completes b at version 1
+    session_repository.advance("t1", "s1", _answer)  # a concurrent turn completes c at version 2
+    now = datetime(2026, 5, 1)
+    added = Step("x", "s1", 1536, "document", "Document it", None, StepStatus.PENDING, now, now, StepSource.BRANCHED)
+    session_repository.add_steps(first, "t1", [added])  # from the stale version-1 result
+    assert db.docs[f"{_SESSION}/graph_deltas/0000000003"]["steps"]["x"]["order"] == 1536
+    assert db.docs[_SESSION]["graph"]["version"] == 3
+    assert db.docs[_SESSION]["progress"]["completed"] == 3  # c's completion was not overwritten
+    assert [s["id"] for s in first.checkpoint.pending(3)] == ["x", "d"]
+
+
+def test_added_step_pointer_comes_from_fresh_state(db):
+    _with_checkpoint(db)
+    first = session_repository.advance("t1", "s1", _answer)  # completes b; the caller would ask c next
+    session_repository.advance("t1", "s1", _answer)  # a concurrent turn completes c
+    now = datetime(2026, 5, 1)
+    added = Step("x", "s1", 4096, "check", "Check x", None, StepStatus.PENDING, now, now, StepSource.ADDED)
+    session_repository.add_steps(first, "t1", [added])
+    assert db.docs[f"{_SESSION}/graph_deltas/0000000003"]["currentStepId"] == "d"
+    assert db.docs[_SESSION]["progress"]["currentStepId"] == "d"
+
+
+def test_added_step_without_checkpoint_points_only_when_first(db):
+    now = datetime(2026, 5, 1)
+    result = session_repository.advance("t1", "s1", _answer)
+    pointer = db.docs[_SESSION]["progress"]["currentStepId"]
+    late = Step("y", "s1", 10**6, "check", "Check y", None, StepStatus.PENDING, now, now, StepSource.ADDED)
+    session_repository.add_steps(result, "t1", [late])
+    assert db.docs[_SESSION]["progress"]["currentStepId"] == pointer
+    early = Step("z", "s1", -1, "check", "Check z", None, StepStatus.PENDING, now, now, StepSource.ADDED)
+    session_repository.add_steps(result, "t1", [early])
+    assert db.docs[_SESSION]["progress"]["currentStepId"] == "z"
+
+
+def test_step_finished_outside_advance_is_not_served_from_checkpoint(db):
+    _with_checkpoint(db)
+    now = datetime(2026, 5, 1)
+    skipped = Step("b", "s1", 1024, "check", "Check b", None, StepStatus.SKIPPED, now, now, StepSource.INITIAL)
+    step_repository.save_step("t1", "s1", skipped)
+    assert db.docs[_SESSION]["progress"]["currentStepId"] == "c"
+    result = session_repository.advance("t1", "s1", _answer)
+    assert (result.completed_step.id, result.next_step.id) == ("c", "d")
@@ -0,0 +1,48 @@
+"""Unit tests for photo evidence derivatives."""
+import io
+
+import pytest
+
+from infrastructure.media import derivatives
+from infrastructure.media.derivatives import (
+    derivative_path,
+    parse_original_path,
+    process_uploaded_object,
+)
+
+_ORIGINAL = "tenants/t1/sessions/s1/evidence/e1/roof.jpg"
+
+
+def test_only_original_images_are_processed():
+    assert parse_original_path(_ORIGINAL) == ("t1", "s1", "e1")
+    thumb = derivative_path(_ORIGINAL, "thumb", "WEBP")
+    assert thumb == "tenants/t1/sessions/s1/evidence/e1/derivatives/thumb.webp"
+    assert parse_original_path(thumb) is None  # the trigger ignores its own output
+    assert process_uploaded_object(thumb, "image/webp", 100) is None
+    assert process_uploaded_object(_ORIGINAL.replace("roof.jpg", "report.pdf"), "application/pdf", 100) is None
+
+
+def test_render_downscales_and_strips_exif():
+    pil_image = pytest.importorskip("PIL.Image")
+    src = pil_image.new("RGB", (4000, 3000), "red")
+    exif = pil_image.Exif()
+    exif[0x010F] = "CameraMaker"
+    buf = io.BytesIO()
+    src.save(buf, format="JPEG", exif=exif)
+
+    rendered = {d.name: d for d in derivatives.render_derivatives(buf.getvalue())}
+    assert (rendered["thumb"].width, rendered["thumb"].height) == (320, 240)
+    assert rendered["preview"].width == 1280 and rendered["preview"].content_type == "image/webp"
+    with pil_image.open(io.BytesIO(rendered["preview_jpeg"].data)) as out:
+        assert not out.getexif()
+
+
+def test_oversized_image_is_refused_without_changing_pillow_limit(monkeypatch):
+    pil_image = pytest.importorskip("PIL.Image")
+    buf = io.BytesIO()
+    pil_image.new("RGB", (400, 300), "red").save(buf, format="PNG")
+    limit = pil_image.MAX_IMAGE_PIXELS
+    monkeypatch.setattr(derivatives, "MAX_PIXELS", 400 * 300 - 1)
+    with pytest.raises(ValueError, match="400x300"):
+        derivatives.render_derivatives(buf.getvalue())
+    assert limit == pil_image.MAX_IMAGE_PIXELS
@@ -0,0 +1,56 @@
+"""Unit tests for the counted evidence write (sharded per-observation quota)."""
+from datetime import datetime
+
+import pytest
+
+from infrastructure.persistence import evidence_repository, firestore_client
+from model.entities.evidence import Evidence, EvidenceType
+from tests.unit.fake_firestore import FakeFirestore, run_transactions_inline
+
+_SESSION = "tenants/t1/inspection_sessions/s1"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeFirestore()
+    db.docs[f"{_SESSION}/observations/o1"] = {"id": "o1"}
+    firestore_client.set_firestore_client(db)
+    run_transactions_inline(monkeypatch, db)
+    yield db
+    firestore_client.set_firestore_client(None)
+
+
+def _evidence(evidence_id, observation_id="o1", size=10):
+    return Evidence(evidence_id, "s1", observation_id, EvidenceType.NOTE, None, {}, datetime(2026, 5, 1), "u1",
+                    size_bytes=size)
+
+
+def _shard_counts(db):
+    prefix = f"{_SESSION}/evidence_counters/obs_o1_"
+    return sorted(d["count"] for p, d in db.docs.items() if p.startswith(prefix))
+
+
+def test_quota_fills_every_shard_then_refuses(db):
+    for i in range(5):
+        evidence_repository.save_evidence("t1", "s1", _evidence(f"e{i}"), max_per_observation=5)
+    with pytest.raises(evidence_repository.EvidenceQuotaExceededError):
+        evidence_repository.save_evidence("t1", "s1", _evidence("e5"), max_per_observation=5)
+    assert _shard_counts(db) == [1, 1, 1, 2]  # each shard at exactly its share of 5
+    assert evidence_repository.observation_evidence_count("t1", "s1", "o1") == 5
+    assert f"{_SESSION}/evidence/e5" not in db.docs
+    assert evidence_repository.session_evidence_usage("t1", "s1") == (5, 50)
+
+
+def test_missing_observation_writes_nothing(db):
+    with pytest.raises(evidence_repository.ObservationNotFoundError):
+        evidence_repository.save_evidence("t1", "s1", _evidence("e1", observation_id="gone"), max_per_observation=5)
+    assert not any("/evidence" in p for p in db.docs)
+
+
+def test_retried_finalize_is_not_counted_twice(db):
+    db.docs[f"{_SESSION}/evidence_uploads/e1"] = {"observationId": "o1"}
+    evidence_repository.finalize_upload("t1", "s1", _evidence("e1"), max_per_observation=5)
+    assert f"{_SESSION}/evidence_uploads/e1" not in db.docs  # dropped in the same transaction
+    evidence_repository.finalize_upload("t1", "s1", _evidence("e1"), max_per_observation=5)
+    assert evidence_repository.observation_evidence_count("t1", "s1", "o1") == 1
+    assert evidence_repository.session_evidence_usage("t1", "s1") == (1, 10)
@@ -0,0 +1,73 @@
+"""Unit tests for graph checkpoint deltas and compaction."""
+import pytest
+
+from infrastructure.persistence import firestore_client
+from infrastructure.persistence.graph_checkpoint_repository import (
+    COMPACTION_INTERVAL,
+    GraphCheckpoint,
+    stage_delta,
+)
+
+
+class _Ref:
+    def __init__(self, path):
+        self.path = path
+
+    def collection(self, name):
+        return _Ref(f"{self.path}/{name}")
+
+    def document(self, doc_id):
+        return _Ref(f"{self.path}/{doc_id}")
+
+
+class _Writer:
+    def __init__(self):
+        self.writes = []
+
+    def create(self, ref, data):
+        self.writes.append(("create", ref.path))
+
+    def set(self, ref, data, merge=False):
+        self.writes.append(("set", ref.path))
+
+    def delete(self, ref):
+        self.writes.append(("delete", ref.path))
+
+
+@pytest.fixture(autouse=True)
+def _fake_client():
+    firestore_client.set_firestore_client(_Ref(""))
+    yield
+    firestore_client.set_firestore_client(None)
+
+
+def _checkpoint():
+    steps = {
+        "a": {"id": "a", "order": 0, "status": "pending"},
+        "b": {"id": "b", "order": 1024, "status": "pending"},
+    }
+    return GraphCheckpoint(version=0, snapshot_version=0, steps=steps, current_step_id="a")
+
+
+def test_delta_applies_status_append_and_pointer():
+    c = _checkpoint()
+    writer = _Writer()
+    fields = stage_delta(writer, "t1", "s1", c, {"a": {"status": "completed"}}, "b")
+    stage_delta(writer, "t1", "s1", c, {"x": {"id": "x", "order": 512, "status": "pending"}}, "x")
+    assert fields == {"graph": {"version": 1, "snapshotVersion": 0}}
+    assert [w for w, _ in writer.writes] == ["create", "create"]
+    assert writer.writes[1][1].endswith("/graph_deltas/0000000002")
+    assert [s["id"] for s in c.pending(3)] == ["x", "b"]
+    assert (c.version, c.current_step_id) == (2, "x")
+
+
+def test_compaction_replaces_deltas_with_snapshot():
+    c = _checkpoint()
+    writer = _Writer()
+    for _ in range(COMPACTION_INTERVAL):
+        fields = stage_delta(writer, "t1", "s1", c, {}, "a")
+    assert fields == {"graph": {"version": COMPACTION_INTERVAL, "snapshotVersion": COMPACTION_INTERVAL}}
+    last = writer.writes[COMPACTION_INTERVAL - 1 :]
+    assert last[0] == ("create", f"/tenants/t1/inspection_sessions/s1/graph_snapshots/{COMPACTION_INTERVAL:010d}")
+    deleted = [p for w, p in last if w == "delete"]
+    assert len(deleted) == COMPACTION_INTERVAL  # old snapshot + every delta since it
@@ -0,0 +1,38 @@
+"""Unit tests for the startup import profiler."""
+import ast
+import importlib.util
+from pathlib import Path
+
+from infrastructure.config.import_profile import (
+    FUNCTION_ENTRY_MODULES,
+    FunctionProfile,
+    parse_importtime,
+)
+
+MAIN = Path(__file__).resolve().parents[3] / "functions" / "main.py"
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        900 |     json.decoder
+import time:       500 |       1400 |   json
+import time:      2000 |       5000 | main
+"""
+
+
+def test_parse_importtime_depth_and_totals():
+    timings = parse_importtime(SAMPLE)
+    assert [t.module for t in timings] == ["_io", "json.decoder", "json", "main"]
+    assert [t.depth for t in timings] == [1, 2, 1, 0]
+    profile = FunctionProfile(function="inspection_sessions", timings=timings)
+    assert profile.total_ms == 5.0
+    assert profile.top(1)[0].module == "main"
+
+
+def test_every_deployed_function_is_profiled():
+    deployed = {
+        node.name for node in ast.walk(ast.parse(MAIN.read_text()))
+        if isinstance(node, ast.FunctionDef) and node.decorator_list
+    }
+    assert set(FUNCTION_ENTRY_MODULES) == deployed
+    assert all(importlib.util.find_spec(m) is not None for m in FUNCTION_ENTRY_MODULES.values())
@@ -0,0 +1,54 @@
+"""Unit tests for the incremental analytics export."""
+import dataclasses
+from datetime import datetime
+
+from infrastructure.analytics import parquet_export
+from infrastructure.config.factories import get_config, set_config
+from infrastructure.persistence import analytics_export_repository, storage_client
+
+
+def _obs(tenant, session, obs_id, created_at, priority="critical"):
+    path = f"tenants/{tenant}/inspection_sessions/{session}/observations/{obs_id}"
+    return path, {"stepId": "st1", "priority": priority, "createdAt": created_at, "createdBy": "u1", "evidenceIds": ["e1"]}
+
+
+def test_exports_pages_into_partitions_and_advances_checkpoint(monkeypatch):
+    docs = [
+        _obs("t1", "s1", "o1", datetime(2026, 5, 1, 9)),
+        _obs("t2", "s2", "o2", datetime(2026, 5, 1, 10)),
+        _obs("t1", "s1", "o3", datetime(2026, 5, 2, 8)),
+    ]
+    checkpoints, uploads = [], {}
+
+    def scan(collection, after, until, limit):
+        start = 0 if after is None else next(i for i, (p, _) in enumerate(docs) if p == after[1]) + 1
+        return [d for d in docs[start:] if d[1]["createdAt"] < until][:limit]
+
+    monkeypatch.setattr(analytics_export_repository, "load_checkpoint", lambda c: None)
+    monkeypatch.setattr(analytics_export_repository, "scan_collection_group", scan)
+    monkeypatch.setattr(analytics_export_repository, "save_checkpoint", lambda c, t, p, n: checkpoints.append((p, n)))
+    monkeypatch.setattr(
+        analytics_export_repository, "load_session_labels",
+        lambda keys: {("t1", "s1"): {"target": {"type": "property", "identifier": "12B"}}},
+    )
+    monkeypatch.setattr(parquet_export, "to_parquet", lambda c, rows: rows)
+    monkeypatch.setattr(storage_client, "upload_object", lambda path, data, ct: uploads.setdefault(path, data))
+    set_config(dataclasses.replace(get_config(), analytics_export_chunk_size=2))
+    try:
+        result = parquet_export.export_collection("observations", now=datetime(2026, 5, 3))
+    finally:
+        set_config(None)
+    assert result.rows == 3 and result.complete
+    assert [n for _, n in checkpoints] == [2, 1]
+    assert result.checkpoint[1] == docs[-1][0]
+    by_partition = {p.split("/part-")[0]: rows for p, rows in uploads.items()}
+    t1_day1 = by_partition["analytics/observations/tenant_id=t1/dt=2026-05-01"]
+    assert t1_day1[0]["target_type"] == "property" and t1_day1[0]["evidence_count"] == 1
+    assert by_partition["analytics/observations/tenant_id=t2/dt=2026-05-01"][0]["target_type"] is None
+    assert "analytics/observations/tenant_id=t1/dt=2026-05-02" in by_partition
+
+
+def test_part_names_are_stable_per_page():
+    start = (datetime(2026, 5, 1), "tenants/t1/inspection_sessions/s1/observations/o1")
+    assert parquet_export.part_name("observations", start) == parquet_export.part_name("observations", start)
+    assert parquet_export.part_name("observations", start) != parquet_export.part_name("evidence", start)
@@ -0,0 +1,47 @@
+"""Unit tests for the session read-through cache (invalidation order, copy isolation)."""
+from datetime import datetime
+
+import pytest
+
+from infrastructure.persistence import firestore_client, session_repository
+from tests.unit.fake_firestore import FakeFirestore
+
+_PATH = "tenants/t1/inspection_sessions/s1"
+
+
+@pytest.fixture
+def db():
+    db = FakeFirestore()
+    db.docs[_PATH] = {
+        "tenantId": "t1", "status": "in_progress", "intent": {"goal": "Roof"}, "createdBy": "u1",
+        "createdAt": datetime(2026, 5, 1), "progress": {"total": 2, "pending": 2},
+    }
+    firestore_client.set_firestore_client(db)
+    session_repository.clear_cache()
+    yield db
+    firestore_client.set_firestore_client(None)
+    session_repository.clear_cache()
+
+
+def test_loaded_copies_do_not_share_progress_with_cache(db):
+    first = session_repository.load("t1", "s1")
+    first.progress.completed = 99
+    assert session_repository.load("t1", "s1").progress.completed == 0
+
+
+def test_uow_save_invalidates_only_after_commit(db):
+    session = session_repository.load("t1", "s1")
+    object.__setattr__(session, "record_id", "r2")
+    with session_repository.unit_of_work() as uow:
+        session_repository.save(session, uow=uow)
+        # A load racing the staged write must not be able to re-cache the old document...
+        assert session_repository.load("t1", "s1").record_id is None
+    # ...because the entry is dropped once the write is committed.
+    assert session_repository.load("t1", "s1").record_id == "r2"
+
+
+def test_direct_save_invalidates_after_write(db):
+    session = session_repository.load("t1", "s1")
+    object.__setattr__(session, "record_id", "r3")
+    session_repository.save(session)
+    assert session_repository.load("t1", "s1").record_id == "r3"
@@ -0,0 +1,88 @@
+"""Unit tests for the session change feed (delta conversion, replay and resync)."""
+from datetime import UTC, datetime, timedelta
+
+from infrastructure.events import session_feed
+from infrastructure.events.session_feed import SessionWatch, Subscription, change_events, event_id
+
+T0 = datetime(2026, 5, 1, 9, 0, tzinfo=UTC)
+
+
+def _drain(sub):
+    out = []
+    while not sub.events.empty():
+        out.append(sub.events.get_nowait())
+    return out
+
+
+def test_step_events_only_on_status_transitions():
+    known = {}
+    change_events("steps", [("ADDED", "st1", {"status": "pending"}, T0)], T0, known, True, None)
+    events = change_events("steps", [
+        ("MODIFIED", "st1", {"status": "pending", "prompt": "edited"}, T0),
+        ("ADDED", "st2", {"status": "pending", "order": 2, "prompt": "Roof"}, T0),
+    ], T0 + timedelta(seconds=1), known, False, None)
+    assert [e.type for e in events] == ["step_added"]
+    events = change_events("steps", [("MODIFIED", "st1", {"status": "completed"}, T0)], T0, known, False, None)
+    assert events[0].data == {"stepId": "st1", "status": "completed", "previousStatus": "pending"}
+
+
+def test_initial_snapshot_emits_only_changes_after_since():
+    rows = [
+        ("ADDED", "o1", {"stepId": "st1"}, T0),
+        ("ADDED", "o2", {"stepId": "st2"}, T0 + timedelta(minutes=5)),
+    ]
+    since = event_id(T0 + timedelta(minutes=1))
+    events = change_events("observations", rows, T0 + timedelta(minutes=6), {}, True, since)
+    assert [e.data["observationId"] for e in events] == ["o2"]
+    assert events[0].id == event_id(T0 + timedelta(minutes=5))
+    assert change_events("observations", rows, T0, {}, True, None) == []
+
+
+def test_late_subscriber_replays_buffer_or_resyncs():
+    first = Subscription(lambda s: None)
+    watch = SessionWatch("t1", "s1", None, first=first)
+    watch.attach(first, None)
+    watch.receive("evidence", [], T0)
+    watch.receive("evidence", [("ADDED", "e1", {"type": "photo"}, T0)], T0 + timedelta(seconds=1))
+    watch.receive("evidence", [("ADDED", "e2", {"type": "photo"}, T0)], T0 + timedelta(seconds=2))
+    assert [e.data["evidenceId"] for e in _drain(first)] == ["e1", "e2"]
+
+    resumed = Subscription(lambda s: None)
+    watch.attach(resumed, event_id(T0 + timedelta(seconds=1)))
+    assert [e.data["evidenceId"] for e in _drain(resumed)] == ["e2"]
+
+    stale = Subscription(lambda s: None)
+    watch.attach(stale, event_id(T0 - timedelta(hours=1)))
+    assert [e.type for e in _drain(stale)] == ["resync"]
+
+
+def test_last_subscriber_stops_listeners(monkeypatch):
+    stopped = []
+    monkeypatch.setattr(SessionWatch, "start", lambda self: None)
+    monkeypatch.setattr(SessionWatch, "stop", lambda self: stopped.append(self.key))
+    a = session_feed.subscribe("t1", "s9")
+    b = session_feed.subscribe("t1", "s9")
+    assert session_feed.active_watches() == 1
+    a.close()
+    assert stopped == []
+    b.close()
+    assert stopped == [("t1", "s9")] and session_feed.active_watches() == 0
+
+
+def test_events_from_one_snapshot_get_distinct_ids():
+    first = Subscription(lambda s: None)
+    watch = SessionWatch("t1", "s1", None, first=first)
+    watch.attach(first, None)
+    watch.receive("observations", [], T0)
+    batch = [("ADDED", f"o{i}", {"stepId": "st1"}, T0) for i in range(3)]
+    watch.receive("observations", batch, T0 + timedelta(seconds=1))
+    watch.receive("collaborators", [], T0)
+    watch.receive("collaborators", [("ADDED", "u2", {"via": "link"}, T0)], T0 + timedelta(seconds=1))
+    delivered = _drain(first)
+    ids = [e.id for e in delivered]
+    assert len(set(ids)) == 4 and ids == sorted(ids)
+
+    # Disconnected after the first of the three observations: the other two are replayed.
+    resumed = Subscription(lambda s: None)
+    watch.attach(resumed, ids[0])
+    assert [e.data.get("observationId") or e.data.get("userId") for e in _drain(resumed)] == ["o1", "o2", "u2"]
@@ -0,0 +1,64 @@
+"""Unit tests for per-tenant config resolution."""
+from infrastructure.config import tenant_config
+from infrastructure.config.factories import set_config
+from infrastructure.config.loader import EnvConfig
+from infrastructure.persistence import tenant_config_repository
+
+
+def _env():
+    return EnvConfig(
+        name="test",
+        google_cloud_project="demo",
+        firestore_emulator_host=None,
+        llm_endpoint=None,
+        llm_api_key=None,
+        evidence_types=["note", "photo", "file"],
+        evidence_max_size_bytes=1000,
+        evidence_max_count_per_observation=5,
+        step_libraries_enabled=["default"],
+    )
+
+
+def test_overrides_narrow_env_defaults_and_are_cached(monkeypatch):
+    reads = []
+    docs = {"t1": {"version": 2, "evidenceTypes": ["photo", "video"], "evidenceMaxSizeBytes": 5000,
+                   "evidenceMaxCountPerObservation": 3}}
+
+    def load(tenant_id):
+        reads.append(tenant_id)
+        return docs.get(tenant_id)
+
+    monkeypatch.setattr(tenant_config_repository, "load_overrides", load)
+    set_config(_env())
+    tenant_config.clear_cache()
+    try:
+        c = tenant_config.get_tenant_config("t1")
+        assert c.evidence_types == frozenset({"photo"})
+        assert (c.evidence_max_size_bytes, c.evidence_max_count_per_observation) == (1000, 3)
+        assert c.step_libraries_enabled == ("default",)
+        assert tenant_config.get_tenant_config("t1") is c
+        assert reads == ["t1"]
+
+        defaults = tenant_config.get_tenant_config("t2")
+        assert defaults.version == 0 and defaults.allows_evidence_type("note")
+
+        docs["t1"] = {**docs["t1"], "version": 3, "evidenceMaxCountPerObservation": 4}
+        assert tenant_config.get_tenant_config("t1") is c  # served from cache until the TTL expires
+    finally:
+        set_config(None)
+        tenant_config.clear_cache()
+
+
+def test_malformed_overrides_fall_back_per_field_and_empty_list_disables_libraries():
+    set_config(_env())
+    try:
+        c = tenant_config.resolve("t1", {
+            "version": "x", "evidenceMaxSizeBytes": "lots", "evidenceMaxCountPerObservation": 2,
+            "evidenceTypes": "photo", "stepLibrariesEnabled": [],
+        })
+        assert c.version == 0 and c.evidence_max_size_bytes == 1000
+        assert c.evidence_max_count_per_observation == 2
+        assert c.evidence_types == frozenset({"note", "photo", "file"})
+        assert c.step_libraries_enabled == ()
+    finally:
+        set_config(None)
@@ -0,0 +1,36 @@
+"""Unit tests for the per-instance TTL/LRU cache."""
+from infrastructure.cache.ttl_cache import TTLCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_miss_and_expiry():
+    clock = _Clock()
+    cache = TTLCache(max_entries=4, ttl_seconds=10, clock=clock)
+    assert cache.get(("t1", "s1")) is None
+    cache.set(("t1", "s1"), "session")
+    assert cache.get(("t1", "s1")) == "session"
+    clock.now = 11
+    assert cache.get(("t1", "s1")) is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.expirations) == (1, 2, 1)
+
+
+def test_lru_eviction_and_invalidate():
+    cache = TTLCache(max_entries=2, ttl_seconds=60, clock=_Clock())
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # a is now most recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats().evictions == 1
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert len(cache) == 1
@@ -0,0 +1,58 @@
+"""Unit tests for the batched unit of work."""
+import pytest
+
+from infrastructure.persistence.unit_of_work import MAX_BATCH_WRITES, UnitOfWork
+
+
+class _RecordingBatch:
+    def __init__(self):
+        self.writes = []
+        self.commits = 0
+
+    def set(self, ref, data, merge=False):
+        self.writes.append(("set", ref, data))
+
+    def update(self, ref, data):
+        self.writes.append(("update", ref, data))
+
+    def delete(self, ref):
+        self.writes.append(("delete", ref, None))
+
+    def commit(self):
+        self.commits += 1
+
+
+class _Client:
+    def __init__(self):
+        self.last_batch = None
+
+    def batch(self):
+        self.last_batch = _RecordingBatch()
+        return self.last_batch
+
+
+def test_commits_once_on_exit():
+    client = _Client()
+    with UnitOfWork(client) as uow:
+        uow.set("sessions/s1", {"id": "s1"})
+        uow.set("sessions/s1/steps/a", {"id": "a"})
+        assert client.last_batch.commits == 0
+    assert client.last_batch.commits == 1
+    assert len(client.last_batch.writes) == 2
+
+
+def test_discards_on_exception():
+    client = _Client()
+    with pytest.raises(RuntimeError):
+        with UnitOfWork(client) as uow:
+            uow.set("sessions/s1", {"id": "s1"})
+            raise RuntimeError("boom")
+    assert client.last_batch.commits == 0
+
+
+def test_rejects_batches_over_firestore_limit():
+    uow = UnitOfWork(_Client())
+    for i in range(MAX_BATCH_WRITES):
+        uow.set(f"doc/{i}", {})
+    with pytest.raises(ValueError):
+        uow.set("doc/overflow", {})
@@ -37,3 +37,27 @@ def test_session_status_transitions():
     session.complete(record_id="r1")
     assert session.status == SessionStatus.COMPLETED
     assert session.record_id == "r1"
+
+
+def test_session_progress_counters_and_pointer():
+    from model.aggregates.inspection_session import SessionProgress
+    from model.entities.step import Step, StepSource, StepStatus
+
+    now = datetime.utcnow()
+
+    def step(step_id, order, status):
+        return Step(
+            id=step_id, session_id="s1", order=order, type="check", prompt=f"Check {step_id}",
+            target_id=None, status=status, created_at=now, updated_at=now, source=StepSource.INITIAL,
+        )
+
+    progress = SessionProgress.from_steps([
+        step("b", 1, StepStatus.PENDING),
+        step("a", 0, StepStatus.COMPLETED),
+        step("c", 2, StepStatus.PENDING),
+    ])
+    assert (progress.total, progress.completed, progress.pending) == (3, 1, 2)
+    assert progress.current_step_id == "b"
+    progress.apply_status_change(StepStatus.PENDING, StepStatus.SKIPPED)
+    progress.apply_status_change(None, StepStatus.PENDING)
+    assert (progress.total, progress.skipped, progress.pending) == (4, 1, 2)